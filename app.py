@@ -5,11 +5,12 @@ apavelchak@gmail.com
 """
 
 import os
+import sys
 
 from waitress import serve
 import yaml
 
-from my_project import create_app
+from my_project import create_app, migrate_database, write_openapi_spec
 
 DEVELOPMENT_PORT = 8080
 PRODUCTION_PORT = 8080
@@ -18,8 +19,16 @@ DEVELOPMENT = "development"
 PRODUCTION = "production"
 FLASK_ENV = "FLASK_ENV"
 ADDITIONAL_CONFIG = "ADDITIONAL_CONFIG"
+OPENAPI_COMMAND = "openapi"
+MIGRATE_COMMAND = "migrate"
+DEFAULT_OPENAPI_SPEC_PATH = os.path.join("config", "openapi.json")
 
 if __name__ == '__main__':
+    if sys.argv[1:2] == [OPENAPI_COMMAND]:
+        # python app.py openapi [file]: pre-builds the OpenAPI document, no database needed
+        write_openapi_spec(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_OPENAPI_SPEC_PATH)
+        sys.exit(0)
+
     flask_env = os.environ.get(FLASK_ENV, DEVELOPMENT).lower()
     config_yaml_path = os.path.join(os.getcwd(), 'config', 'app.yml')
 
@@ -27,7 +36,15 @@ if __name__ == '__main__':
         config_data_dict = yaml.load(yaml_file, Loader=yaml.FullLoader)
         additional_config = config_data_dict[ADDITIONAL_CONFIG]
 
-        if flask_env == DEVELOPMENT:
+        if sys.argv[1:2] == [MIGRATE_COMMAND]:
+            # python app.py migrate: schema changes and starting data, run once before starting workers
+            if flask_env not in (DEVELOPMENT, PRODUCTION):
+                raise ValueError(f"Check OS environment variable '{FLASK_ENV}'")
+            for change in migrate_database(config_data_dict[flask_env], additional_config):
+                print(change)
+            print("Database is up to date")
+
+        elif flask_env == DEVELOPMENT:
             config_data = config_data_dict[DEVELOPMENT]
             create_app(config_data, additional_config).run(port=DEVELOPMENT_PORT, debug=True)
 
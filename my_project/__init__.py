@@ -6,72 +6,75 @@ apavelchak@gmail.com
 
 import os
 import re
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from http import HTTPStatus
+from decimal import Decimal, InvalidOperation
 import secrets
 import jwt
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List, Optional
 from functools import wraps
 from urllib.parse import quote_plus
 #test ci/cd
-from dotenv import load_dotenv
-from flasgger import Swagger
 from flask import Flask, jsonify, request, g
-from flask_restx import Api, Resource, fields
+from flask_restx import Resource, fields
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy import text
-from sqlalchemy_utils import database_exists, create_database
-from apispec import APISpec
-from apispec_webframeworks.flask import FlaskPlugin
-from flask_swagger_ui import get_swaggerui_blueprint
+from sqlalchemy.exc import IntegrityError
 from flask_cors import CORS
-from werkzeug.security import generate_password_hash, check_password_hash
 from my_project.auth.route import register_routes
+from my_project.auth.route.openapi import SpecApi
+from my_project.json_provider import FastJSONProvider
 
 SECRET_KEY = "SECRET_KEY"
 SQLALCHEMY_DATABASE_URI = "SQLALCHEMY_DATABASE_URI"
 MYSQL_ROOT_USER = "MYSQL_ROOT_USER"
 MYSQL_ROOT_PASSWORD = "MYSQL_ROOT_PASSWORD"
+# Swagger UI at /api/docs/ is served only when enabled in the environment config
+SWAGGER_UI = "SWAGGER_UI"
+SWAGGER_UI_PATH = "/api/docs/"
+# Pre-built OpenAPI document (python app.py openapi <file>), served instead of generating it
+OPENAPI_SPEC_FILE = "OPENAPI_SPEC_FILE"
+STARTUP_TIMINGS = "startup_timings"
+# Lets a worker migrate an outdated database itself instead of refusing to start (development)
+AUTO_MIGRATE = "AUTO_MIGRATE"
 
 # Database
 db = SQLAlchemy()
 
-todos = {}
+# Connection pool defaults, overridden by SQLALCHEMY_ENGINE_OPTIONS of the environment in config/app.yml
+DEFAULT_ENGINE_OPTIONS = {
+    "pool_size": 10,
+    "max_overflow": 5,
+    "pool_timeout": 10,
+    "pool_recycle": 1800,
+    "pool_pre_ping": True,
+}
+DEFAULT_PAYMENT_STATUS = 'Pending'
 
+ACTIVE_USERS_LIMIT = 100
+MAX_ACTIVE_USERS_LIMIT = 1000
+POPULAR_PIZZAS_LIMIT = 5
+MAX_POPULAR_PIZZAS_LIMIT = 100
+RECENT_ORDERS_LIMIT = 10
+MAX_RECENT_ORDERS_LIMIT = 500
+PIZZAS_BY_PRICE_LIMIT = 100
+MAX_PIZZAS_BY_PRICE_LIMIT = 1000
+# Popularity windows, counted in whole hours (Pizza_Popularity buckets)
+POPULARITY_WINDOWS = {'hour': timedelta(hours=1), 'day': timedelta(days=1), 'week': timedelta(weeks=1)}
 
+# Test accounts of the /api/v1 API (passwords admin123 and user123), hashed in advance so starting is cheap
+SEED_USERS = (
+    ('admin', 'pbkdf2:sha256:600000$FAOLEunVyWmQ8GGZ$a8232cf594528a65fe67a896a1aaeb765fd95cbcc00c578e0defc8a6bf34ef86',
+     'admin@pizza.com', '+380123456789', '123 Main St', True),
+    ('user', 'pbkdf2:sha256:600000$wo6VrYDQYTOfuYc8$bc2c38baee4c6921b8df8e6b27be60b53d7c7ad44b96a53e9cc3bffeb4e7450a',
+     'user@gmail.com', '+380987654321', '456 Oak Ave', False),
+)
 
-def init_autodoc_swagger(app: Flask) -> None:
-    app.config.setdefault("SWAGGER", {
-        "uiversion": 3,
-        "title": "Pets Shop API",
-        "openapi": "3.0.3",
-    })
+POOL_OPTIONS = ("poolclass", "pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_pre_ping", "pool_use_lifo")
 
-    swagger_template = {
-        "openapi": "3.0.3",
-        "info": {
-            "title": "Pets Shop API",
-            "version": "1.0.0",
-            "description": "Autogenerated Swagger docs",
-            "contact": {"name": "Arsen Pavliuk", "email": "test@gmail.com"},
-            "license": {"name": "MIT"},
-        },
-        "servers": [
-            {"url": "/"}
-        ],
-        "components": {
-            "securitySchemes": {
-                "bearerAuth": {
-                    "type": "http",
-                    "scheme": "bearer",
-                    "bearerFormat": "JWT"
-                }
-            }
-        },
-        "security": [{"bearerAuth": []}],
-    }
+todos = {}
 
-    Swagger(app, template=swagger_template)
 
 def create_app(app_config: Dict[str, Any], additional_config: Dict[str, Any]) -> Flask:
     """
@@ -80,19 +83,45 @@ def create_app(app_config: Dict[str, Any], additional_config: Dict[str, Any]) ->
     :param additional_config: additional configuration
     :return: Flask application object
     """
-    _process_input_config(app_config, additional_config)
-    app = Flask(__name__)
-    app.config["SECRET_KEY"] = secrets.token_hex(16)
-    app.config = {**app.config, **app_config}
+    timings: Dict[str, float] = {}
+    with _phase(timings, "config"):
+        _process_input_config(app_config, additional_config)
+        app = Flask(__name__)
+        app.json = FastJSONProvider(app)
+        app.config["SECRET_KEY"] = os.getenv(SECRET_KEY) or secrets.token_hex(16)
+        app.config = {**app.config, **app_config}
+        CORS(app)
     
-    CORS(app)
-    _init_db(app)
-    register_routes(app)
-    _init_swagger(app)
+    with _phase(timings, "db"):
+        _init_db(app)
+    with _phase(timings, "cache"):
+        _init_cache(app)
+    with _phase(timings, "auth"):
+        _init_auth(app)
+    with _phase(timings, "routes"):
+        register_routes(app)
+    with _phase(timings, "swagger"):
+        _init_swagger(app)
     
+    # seconds per phase, reported by python -m scripts.profile_startup
+    app.extensions[STARTUP_TIMINGS] = timings
     return app
 
 
+@contextmanager
+def _phase(timings: Dict[str, float], name: str) -> Iterator[None]:
+    """
+    Measures wall time of a create_app phase
+    :param timings: seconds by phase name
+    :param name: phase name
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = time.perf_counter() - started
+
+
 def _do_cursor_task(app:Flask):
     with open("cursor.sql", "r") as file:
         sql_script = file.read()
@@ -283,7 +312,28 @@ def _init_trigger(app: Flask) -> None:
 
 
 
-def _init_swagger(app: Flask) -> None:
+def write_openapi_spec(path: str) -> None:
+    """
+    Writes the OpenAPI document of the /api/v1 API to path without connecting to the database,
+    e.g. at image build time
+    :param path: target file
+    """
+    app = Flask(__name__)
+    api = _init_swagger(app)
+    with app.test_request_context():
+        api.write_spec(path)
+
+
+def _init_swagger(app: Flask) -> SpecApi:
+    """
+    Registers the /api/v1 API; its OpenAPI document is generated on first request and cached
+    :param app: Flask application object
+    :return: the API
+    """
+    from my_project.auth.domain.orders.DeliveryStatus import (
+        CANCELLED_ORDER_STATUS, NEW_ORDER_STATUS, ORDER_STATUSES,
+    )
+
     authorizations = {
         'Bearer': {
             'type': 'apiKey',
@@ -293,16 +343,25 @@ def _init_swagger(app: Flask) -> None:
         }
     }
     
-    api = Api(
+    api = SpecApi(
         app, 
         title='Pizza Delivery Management API 228',
         description='Complete REST API for pizza delivery management system with authentication',
         version='2.0',
-        doc='/api/docs/',
+        doc=SWAGGER_UI_PATH if app.config.get(SWAGGER_UI) else False,
+        spec_file=app.config.get(OPENAPI_SPEC_FILE),
         prefix='/api/v1',
         authorizations=authorizations,
         security='Bearer'
     )
+
+    @api.representation('application/json')
+    def output_json(data, code, headers=None):
+        # same encoder as the blueprints instead of restx's json.dumps
+        response = app.json.response(data)
+        response.status_code = code
+        response.headers.extend(headers or {})
+        return response
     
     user_model = api.model('User', {
         'id': fields.Integer(description='User ID'),
@@ -401,7 +460,7 @@ def _init_swagger(app: Flask) -> None:
     
     order_status_model = api.model('OrderStatus', {
         'status': fields.String(required=True, description='New order status', 
-                              enum=['New', 'Preparing', 'On the way', 'Delivered', 'Cancelled'])
+                              enum=ORDER_STATUSES)
     })
     
     def token_required(f):
@@ -414,42 +473,102 @@ def _init_swagger(app: Flask) -> None:
             try:
                 if token.startswith('Bearer '):
                     token = token[7:]
-                data = jwt.decode(token, app.config['SECRET_KEY'], algorithms=['HS256'])
+                data = token_service.decode(token)
                 g.current_user = data['username']
-            except:
+            except (jwt.InvalidTokenError, KeyError):
                 api.abort(401, 'Invalid token!')
             
             return f(*args, **kwargs)
         return decorated
     
-    users_db = {
-        'admin': {
-            'id': 1,
-            'username': 'admin',
-            'email': 'admin@pizza.com',
-            'password': generate_password_hash('admin123'),
-            'phone': '+380123456789',
-            'address': '123 Main St'
-        },
-        'user': {
-            'id': 2,
-            'username': 'user',
-            'email': 'user@gmail.com', 
-            'password': generate_password_hash('user123'),
-            'phone': '+380987654321',
-            'address': '456 Oak Ave'
+    from my_project.auth.dao import (
+        delivery_status_dao, ingredients_dao, order_stats_dao, orders_dao, payment_status_dao, pizza_dao,
+        pizza_stats_dao, users_dao,
+    )
+    from my_project.auth.dao.general_dao import DTO_PROFILE
+    from my_project.auth.dao.orders.OrdersDAO import API_PROFILE
+    from my_project.auth.service.password_service import PasswordHashingBusy, password_service
+    from my_project.auth.service.token_service import token_service
+    from my_project.auth.domain import Users
+    from my_project.auth.domain import Order as OrderModel, Pizza as PizzaModel, PizzaOrder as PizzaOrderModel
+
+    def user_to_api(user: Users) -> Dict[str, Any]:
+        return {
+            'id': user.id,
+            'username': user.username,
+            'email': user.email,
+            'phone': user.phone_number,
+            'address': user.address
         }
-    }
-    
-    pizzas_db = {
-        1: {'id': 1, 'name': 'Margherita', 'description': 'Classic pizza with tomatoes and mozzarella', 'price': 299.0, 'size': 'Medium', 'ingredients': ['tomatoes', 'mozzarella', 'basil']},
-        2: {'id': 2, 'name': 'Pepperoni', 'description': 'Pizza with pepperoni and cheese', 'price': 349.0, 'size': 'Large', 'ingredients': ['pepperoni', 'mozzarella', 'tomato sauce']},
-        3: {'id': 3, 'name': 'Vegetarian', 'description': 'Pizza with vegetables', 'price': 319.0, 'size': 'Medium', 'ingredients': ['bell peppers', 'mushrooms', 'onions', 'tomatoes']}
-    }
-    
-    orders_db = {}
-    order_counter = 1
-    
+
+    def pizza_to_api(pizza: PizzaModel) -> Dict[str, Any]:
+        return {
+            'id': pizza.id,
+            'name': pizza.name,
+            'description': pizza.description,
+            'price': float(pizza.price) if pizza.price is not None else None,
+            'size': pizza.size,
+            'ingredients': [ingredient.name for ingredient in pizza.ingredients]
+        }
+
+    def order_to_api(order: OrderModel) -> Dict[str, Any]:
+        return {
+            'id': order.id,
+            'username': order.user.username,
+            'user_id': order.userid,
+            # price of the pizza at the moment of ordering
+            'pizzas': [{**pizza_to_api(line.pizza), 'price': float(line.price)} for line in order.pizza_orders],
+            'total_price': float(order.Total_Price) if order.Total_Price is not None else 0.0,
+            'status': order.delivery_status.status,
+            'delivery_address': order.delivery_address,
+            'created_at': order.Created_AT.isoformat() if order.Created_AT else None
+        }
+
+    def int_arg(name: str, default: int, maximum: int) -> int:
+        """Reads positive integer query parameter"""
+        value = request.args.get(name, default)
+        try:
+            value = int(value)
+        except ValueError:
+            api.abort(400, f'{name} must be an integer')
+        if not 1 <= value <= maximum:
+            api.abort(400, f'{name} must be between 1 and {maximum}')
+        return value
+
+    def datetime_arg(name: str) -> Optional[datetime]:
+        """Reads optional ISO 8601 datetime query parameter"""
+        value = request.args.get(name)
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            api.abort(400, f'{name} must be an ISO 8601 datetime')
+
+    def price_arg(name: str) -> Optional[Decimal]:
+        """Reads optional non-negative price query parameter"""
+        value = request.args.get(name)
+        if not value:
+            return None
+        try:
+            value = Decimal(value)
+        except InvalidOperation:
+            api.abort(400, f'{name} must be a number')
+        if not value.is_finite() or value < 0:
+            api.abort(400, f'{name} must be a non-negative number')
+        return value
+
+    def current_user() -> Users:
+        user = users_dao.find_by_username(g.current_user)
+        if not user:
+            api.abort(404, 'User not found')
+        return user
+
+    def is_admin() -> bool:
+        """Checks the admin flag of the user of the token, the username alone grants nothing"""
+        user = users_dao.find_by_username(g.current_user)
+        return bool(user and user.is_admin)
+
     ns_auth = api.namespace('auth', description='Authentication and authorization')
     ns_users = api.namespace('users', description='User management')
     ns_pizzas = api.namespace('pizzas', description='Pizza catalog')
@@ -468,17 +587,27 @@ def _init_swagger(app: Flask) -> None:
             if not username or not data.get('password') or not data.get('email'):
                 api.abort(400, 'Username, password and email are required')
             
-            if username in users_db:
+            if users_dao.find_by_username(username):
                 api.abort(400, f'User {username} already exists')
             
-            users_db[username] = {
-                'id': len(users_db) + 1,
-                'username': username,
-                'email': data.get('email'),
-                'password': generate_password_hash(data.get('password')),
-                'phone': data.get('phone', ''),
-                'address': data.get('address', '')
-            }
+            try:
+                password_hash = password_service.hash(data.get('password'))
+            except PasswordHashingBusy:
+                api.abort(503, 'Too many requests, try again later')
+            
+            try:
+                users_dao.create(Users(
+                    username=username,
+                    U_Name=data.get('name', username),
+                    U_Surname=data.get('surname', ''),
+                    email=data.get('email'),
+                    password_hash=password_hash,
+                    phone_number=data.get('phone', ''),
+                    address=data.get('address', '')
+                ))
+            except IntegrityError:
+                # registered concurrently by another request
+                api.abort(400, f'User {username} already exists')
             
             return {'message': f'User {username} registered successfully!'}, 201
     
@@ -492,21 +621,26 @@ def _init_swagger(app: Flask) -> None:
             username = data.get('username')
             password = data.get('password')
             
-            user = users_db.get(username)
-            if not user or not check_password_hash(user['password'], password):
+            user = users_dao.find_by_username(username) if username else None
+            try:
+                valid = bool(user and user.password_hash and password
+                             and password_service.verify(user.password_hash, password))
+            except PasswordHashingBusy:
+                api.abort(503, 'Too many requests, try again later')
+            if not valid:
                 api.abort(401, 'Invalid credentials')
             
-            token = jwt.encode({
+            token = token_service.encode({
                 'username': username,
                 'exp': datetime.utcnow() + timedelta(hours=24)
-            }, app.config['SECRET_KEY'], algorithm='HS256')
+            })
             
             return {
                 'token': token,
                 'user': {
-                    'id': user['id'],
-                    'username': user['username'],
-                    'email': user['email']
+                    'id': user.id,
+                    'username': user.username,
+                    'email': user.email
                 },
                 'message': 'Login successful!'
             }
@@ -518,10 +652,7 @@ def _init_swagger(app: Flask) -> None:
         @api.marshal_with(user_model)
         def get(self):
             """Get current user profile"""
-            user = users_db.get(g.current_user)
-            if not user:
-                api.abort(404, 'User not found')
-            return user
+            return user_to_api(current_user())
     
     @ns_users.route('/')
     class UsersList(Resource):
@@ -530,16 +661,16 @@ def _init_swagger(app: Flask) -> None:
         @api.marshal_list_with(user_model)
         def get(self):
             """Get all users (admin only)"""
-            if g.current_user != 'admin':
+            if not is_admin():
                 api.abort(403, 'Access denied')
-            return list(users_db.values())
+            return [user_to_api(user) for user in users_dao.find_all()]
     
     @ns_pizzas.route('/')
     class PizzasList(Resource):
         @api.marshal_list_with(pizza_model)
         def get(self):
             """Get pizza catalog"""
-            return list(pizzas_db.values())
+            return [pizza_to_api(pizza) for pizza in pizza_dao.find_all()]
         
         @api.doc(security='Bearer')
         @token_required
@@ -547,31 +678,30 @@ def _init_swagger(app: Flask) -> None:
         @api.marshal_with(pizza_model)
         def post(self):
             """Add new pizza (admin only)"""
-            if g.current_user != 'admin':
+            if not is_admin():
                 api.abort(403, 'Only administrators can add pizzas')
             
             data = request.get_json()
-            pizza_id = max(pizzas_db.keys()) + 1 if pizzas_db else 1
-            pizza = {
-                'id': pizza_id,
-                'name': data.get('name'),
-                'description': data.get('description'),
-                'price': data.get('price'),
-                'size': data.get('size', 'Medium'),
-                'ingredients': data.get('ingredients', [])
-            }
-            pizzas_db[pizza_id] = pizza
-            return pizza, 201
+            pizza = PizzaModel(
+                name=data.get('name'),
+                description=data.get('description'),
+                price=data.get('price'),
+                size=data.get('size', 'Medium'),
+                quantity=data.get('quantity', 0),
+                ingredients=ingredients_dao.find_or_create_by_names(data.get('ingredients', []))
+            )
+            pizza_dao.create(pizza)
+            return pizza_to_api(pizza), 201
     
     @ns_pizzas.route('/<int:pizza_id>')
     class Pizza(Resource):
         @api.marshal_with(pizza_model)
         def get(self, pizza_id):
             """Get pizza by ID"""
-            pizza = pizzas_db.get(pizza_id)
+            pizza = pizza_dao.find_by_id(pizza_id)
             if not pizza:
                 api.abort(404, 'Pizza not found')
-            return pizza
+            return pizza_to_api(pizza)
         
         @api.doc(security='Bearer')
         @token_required
@@ -579,36 +709,38 @@ def _init_swagger(app: Flask) -> None:
         @api.marshal_with(pizza_model)
         def put(self, pizza_id):
             """Update pizza by ID (admin only)"""
-            if g.current_user != 'admin':
+            if not is_admin():
                 api.abort(403, 'Only administrators can update pizzas')
             
-            pizza = pizzas_db.get(pizza_id)
+            data = request.get_json()
+            fields_to_update = {name: data[name] for name in ('name', 'description', 'price', 'size') if name in data}
+            if fields_to_update:
+                pizza = pizza_dao.patch(pizza_id, fields_to_update, DTO_PROFILE)
+            else:
+                pizza = pizza_dao.find_by_id(pizza_id)
             if not pizza:
                 api.abort(404, 'Pizza not found')
             
-            data = request.get_json()
-            pizza.update({
-                'name': data.get('name', pizza['name']),
-                'description': data.get('description', pizza['description']),
-                'price': data.get('price', pizza['price']),
-                'size': data.get('size', pizza['size']),
-                'ingredients': data.get('ingredients', pizza['ingredients'])
-            })
+            if 'ingredients' in data:
+                pizza = pizza_dao.set_ingredients(pizza_id, ingredients_dao.find_or_create_by_names(data['ingredients']))
             
-            return pizza
+            return pizza_to_api(pizza)
         
         @api.doc(security='Bearer')
         @api.marshal_with(message_response_model)
         @token_required
         def delete(self, pizza_id):
             """Delete pizza by ID (admin only)"""
-            if g.current_user != 'admin':
+            if not is_admin():
                 api.abort(403, 'Only administrators can delete pizzas')
             
-            if pizza_id not in pizzas_db:
+            if not pizza_dao.find_by_id(pizza_id):
                 api.abort(404, 'Pizza not found')
             
-            del pizzas_db[pizza_id]
+            try:
+                pizza_dao.delete(pizza_id)
+            except IntegrityError:
+                api.abort(409, 'Pizza is used in orders')
             return {'message': f'Pizza with ID {pizza_id} deleted successfully'}
     
     @ns_orders.route('/')
@@ -618,9 +750,8 @@ def _init_swagger(app: Flask) -> None:
         @api.marshal_list_with(order_model)
         def get(self):
             """Get user orders"""
-            user_orders = [order for order in orders_db.values() 
-                          if order.get('username') == g.current_user]
-            return user_orders
+            user = current_user()
+            return [order_to_api(order) for order in orders_dao.find_by_user_id(user.id, API_PROFILE)]
         
         @api.doc(security='Bearer')
         @api.expect(order_create_model)
@@ -628,40 +759,32 @@ def _init_swagger(app: Flask) -> None:
         @token_required
         def post(self):
             """Create new order"""
-            nonlocal order_counter
             data = request.get_json()
             pizza_ids = data.get('pizza_ids', [])
             
             if not pizza_ids:
                 api.abort(400, 'Order must contain at least one pizza')
             
-            ordered_pizzas = []
-            total_price = 0
-            
-            for pid in pizza_ids:
-                pizza = pizzas_db.get(pid)
-                if pizza:
-                    ordered_pizzas.append(pizza)
-                    total_price += pizza['price']
+            pizzas = {pizza.id: pizza for pizza in map(pizza_dao.find_by_id, set(pizza_ids)) if pizza}
+            ordered_pizzas = [pizzas[pid] for pid in pizza_ids if pid in pizzas]
             
             if not ordered_pizzas:
                 api.abort(400, 'No valid pizzas found')
             
-            order = {
-                'id': order_counter,
-                'username': g.current_user,
-                'user_id': users_db[g.current_user]['id'],
-                'pizzas': ordered_pizzas,
-                'total_price': total_price,
-                'status': 'New',
-                'delivery_address': data.get('address', users_db[g.current_user]['address']),
-                'created_at': datetime.utcnow().isoformat()
-            }
-            
-            orders_db[order_counter] = order
-            order_counter += 1
+            user = current_user()
+            order = OrderModel(
+                userid=user.id,
+                Payment_Statusid=payment_status_dao.find_by_status(DEFAULT_PAYMENT_STATUS).id,
+                Delivery_Statusid=delivery_status_dao.find_by_status(NEW_ORDER_STATUS).id,
+                Total_Price=sum(pizza.price or 0 for pizza in ordered_pizzas),
+                delivery_address=data.get('address', user.address),
+                Created_AT=datetime.utcnow()
+            )
+            orders_dao.create_with_pizzas(order, [
+                PizzaOrderModel(pizza_id=pizza.id, price=pizza.price or 0) for pizza in ordered_pizzas
+            ])
             
-            return order, 201
+            return order_to_api(orders_dao.find_by_id(order.id, API_PROFILE)), 201
     
     @ns_orders.route('/<int:order_id>')
     class Order(Resource):
@@ -670,14 +793,14 @@ def _init_swagger(app: Flask) -> None:
         @api.marshal_with(order_model)
         def get(self, order_id):
             """Get order by ID"""
-            order = orders_db.get(order_id)
+            order = orders_dao.find_by_id(order_id, API_PROFILE)
             if not order:
                 api.abort(404, 'Order not found')
             
-            if order['username'] != g.current_user and g.current_user != 'admin':
+            if order.user.username != g.current_user and not is_admin():
                 api.abort(403, 'Access denied')
             
-            return order
+            return order_to_api(order)
         
         @api.doc(security='Bearer')
         @api.expect(order_status_model)
@@ -685,19 +808,20 @@ def _init_swagger(app: Flask) -> None:
         @token_required
         def put(self, order_id):
             """Update order status (admin only)"""
-            if g.current_user != 'admin':
+            if not is_admin():
                 api.abort(403, 'Only administrators can update order status')
             
-            order = orders_db.get(order_id)
-            if not order:
+            if not orders_dao.find_by_id(order_id):
                 api.abort(404, 'Order not found')
             
             data = request.get_json()
             new_status = data.get('status')
             
             if new_status:
-                order['status'] = new_status
-                return order
+                status = delivery_status_dao.find_by_status(new_status)
+                if not status:
+                    api.abort(400, f'Unknown status {new_status}')
+                return order_to_api(orders_dao.patch(order_id, {'Delivery_Statusid': status.id}, API_PROFILE))
             
             api.abort(400, 'Status is required')
         
@@ -706,17 +830,19 @@ def _init_swagger(app: Flask) -> None:
         @token_required
         def delete(self, order_id):
             """Cancel order"""
-            order = orders_db.get(order_id)
+            order = orders_dao.find_by_id(order_id, API_PROFILE)
             if not order:
                 api.abort(404, 'Order not found')
             
-            if order['username'] != g.current_user and g.current_user != 'admin':
+            if order.user.username != g.current_user and not is_admin():
                 api.abort(403, 'You can only cancel your own orders')
             
-            if order['status'] in ['Preparing', 'On the way', 'Delivered']:
+            if order.delivery_status.status in ['Preparing', 'On the way', 'Delivered', 'Cancelled']:
                 api.abort(400, 'Cannot cancel order with current status')
             
-            del orders_db[order_id]
+            # the order is kept for history and statistics
+            cancelled = delivery_status_dao.find_by_status(CANCELLED_ORDER_STATUS)
+            orders_dao.patch(order_id, {'Delivery_Statusid': cancelled.id})
             return {'message': f'Order {order_id} cancelled'}
     
     @ns_orders.route('/all')
@@ -726,9 +852,9 @@ def _init_swagger(app: Flask) -> None:
         @api.marshal_list_with(order_model)
         def get(self):
             """Get all orders (admin only)"""
-            if g.current_user != 'admin':
+            if not is_admin():
                 api.abort(403, 'Access denied')
-            return list(orders_db.values())
+            return [order_to_api(order) for order in orders_dao.find_all(API_PROFILE)]
     
     @ns_orders.route('/stats')
     class OrderStats(Resource):
@@ -737,110 +863,106 @@ def _init_swagger(app: Flask) -> None:
         @token_required
         def get(self):
             """Order statistics (admin only)"""
-            if g.current_user != 'admin':
+            if not is_admin():
                 api.abort(403, 'Access denied')
             
-            total_orders = len(orders_db)
-            total_revenue = sum(order.get('total_price', 0) for order in orders_db.values())
-            
-            status_counts = {}
-            for order in orders_db.values():
-                status = order.get('status', 'Unknown')
-                status_counts[status] = status_counts.get(status, 0) + 1
+            stats = order_stats_dao.find_summary()
+            total_orders = sum(order_count for _, order_count, _ in stats)
+            # cancelled orders have no revenue and do not count in the average
+            paid_orders = sum(order_count for status, order_count, _ in stats if status != CANCELLED_ORDER_STATUS)
+            total_revenue = float(sum(revenue for _, _, revenue in stats))
             
             return {
                 'total_orders': total_orders,
                 'total_revenue': total_revenue,
-                'status_distribution': status_counts,
-                'average_order_value': total_revenue / total_orders if total_orders > 0 else 0
+                'status_distribution': {status: order_count for status, order_count, _ in stats},
+                'average_order_value': total_revenue / paid_orders if paid_orders > 0 else 0
             }
     
     @ns_pizzas.route('/popular')
     class PopularPizzas(Resource):
+        @api.doc(params={
+            'window': f'Count orders of the last {", ".join(POPULARITY_WINDOWS)} only (default: all time)',
+            'limit': f'Number of pizzas (default {POPULAR_PIZZAS_LIMIT}, max {MAX_POPULAR_PIZZAS_LIMIT})'
+        })
         @api.marshal_list_with(popular_pizza_model)
         def get(self):
             """Get top popular pizzas"""
-            pizza_counts = {}
-            
-            for order in orders_db.values():
-                for pizza in order.get('pizzas', []):
-                    pizza_id = pizza.get('id')
-                    if pizza_id:
-                        pizza_counts[pizza_id] = pizza_counts.get(pizza_id, 0) + 1
-            
-            popular_pizzas = []
-            for pizza_id, count in sorted(pizza_counts.items(), key=lambda x: x[1], reverse=True)[:5]:
-                pizza = pizzas_db.get(pizza_id)
-                if pizza:
-                    popular_pizzas.append({
-                        **pizza,
-                        'order_count': count
-                    })
-            
-            return popular_pizzas
+            limit = int_arg('limit', POPULAR_PIZZAS_LIMIT, MAX_POPULAR_PIZZAS_LIMIT)
+            window = request.args.get('window')
+            if window is not None and window not in POPULARITY_WINDOWS:
+                api.abort(400, f'window must be one of: {", ".join(POPULARITY_WINDOWS)}')
+            since = datetime.utcnow() - POPULARITY_WINDOWS[window] if window else None
+            return [{**pizza_to_api(pizza), 'order_count': count}
+                    for pizza, count in pizza_stats_dao.find_popular(limit, since)]
     
     @ns_pizzas.route('/by-price')
     class PizzasByPrice(Resource):
+        @api.doc(params={
+            'min_price': 'Lowest price (inclusive)',
+            'max_price': 'Highest price (inclusive)',
+            'limit': f'Number of pizzas (default {PIZZAS_BY_PRICE_LIMIT}, max {MAX_PIZZAS_BY_PRICE_LIMIT})'
+        })
         @api.marshal_list_with(pizza_model)
         def get(self):
             """Pizzas sorted by price"""
-            sorted_pizzas = sorted(pizzas_db.values(), key=lambda x: x.get('price', 0))
-            return sorted_pizzas
+            min_price = price_arg('min_price')
+            max_price = price_arg('max_price')
+            if min_price is not None and max_price is not None and min_price > max_price:
+                api.abort(400, 'min_price must not be greater than max_price')
+            limit = int_arg('limit', PIZZAS_BY_PRICE_LIMIT, MAX_PIZZAS_BY_PRICE_LIMIT)
+            return [pizza_to_api(pizza) for pizza in pizza_dao.find_by_price(min_price, max_price, limit)]
     
     @ns_users.route('/active')
     class ActiveUsers(Resource):
-        @api.doc(security='Bearer')
+        @api.doc(security='Bearer', params={
+            'limit': f'Number of users (default {ACTIVE_USERS_LIMIT}, max {MAX_ACTIVE_USERS_LIMIT})',
+            'since': 'Count only orders created at or after this ISO 8601 datetime'
+        })
         @api.marshal_list_with(active_user_model)
         @token_required
         def get(self):
             """Get active users (admin only)"""
-            if g.current_user != 'admin':
+            if not is_admin():
                 api.abort(403, 'Access denied')
             
-            user_order_counts = {}
-            for order in orders_db.values():
-                username = order.get('username')
-                if username:
-                    user_order_counts[username] = user_order_counts.get(username, 0) + 1
-            
-            active_users = []
-            for username, order_count in user_order_counts.items():
-                user = users_db.get(username)
-                if user:
-                    active_users.append({
-                        'username': username,
-                        'email': user.get('email'),
-                        'order_count': order_count,
-                        'total_spent': sum(order.get('total_price', 0) 
-                                         for order in orders_db.values() 
-                                         if order.get('username') == username)
-                    })
-            
-            return sorted(active_users, key=lambda x: x['order_count'], reverse=True)
+            limit = int_arg('limit', ACTIVE_USERS_LIMIT, MAX_ACTIVE_USERS_LIMIT)
+            since = datetime_arg('since')
+            return [{
+                'username': user.username,
+                'email': user.email,
+                'order_count': order_count,
+                'total_spent': float(total_spent)
+            } for user, order_count, total_spent in users_dao.find_active(limit, since)]
     
     @ns_orders.route('/recent')
     class RecentOrders(Resource):
-        @api.doc(security='Bearer')
+        @api.doc(security='Bearer', params={
+            'limit': f'Number of orders (default {RECENT_ORDERS_LIMIT}, max {MAX_RECENT_ORDERS_LIMIT})',
+            'before': 'Only orders created before this ISO 8601 datetime (created_at of the last order of a page)',
+            'before_id': 'With before, also orders created exactly at before with a smaller id (id of the last order)'
+        })
         @token_required
         def get(self):
             """Recent orders (admin only)"""
-            if g.current_user != 'admin':
+            if not is_admin():
                 api.abort(403, 'Access denied')
             
-            recent_orders = sorted(
-                orders_db.values(),
-                key=lambda x: x.get('created_at', ''),
-                reverse=True
-            )[:10]
-            
-            return recent_orders
+            limit = int_arg('limit', RECENT_ORDERS_LIMIT, MAX_RECENT_ORDERS_LIMIT)
+            before = datetime_arg('before')
+            before_id = request.args.get('before_id')
+            if before_id is not None:
+                if before is None or not before_id.isdigit():
+                    api.abort(400, 'before_id must be an integer and requires before')
+                before_id = int(before_id)
+            return [order_to_api(order) for order in orders_dao.find_recent(limit, before, before_id, API_PROFILE)]
     
     @ns_orders.route('/statuses')
     class OrderStatuses(Resource):
         def get(self):
             """Get available order statuses"""
             return {
-                'statuses': ['New', 'Preparing', 'On the way', 'Delivered', 'Cancelled'],
+                'statuses': ORDER_STATUSES,
                 'descriptions': {
                     'New': 'Order has been placed and is waiting to be processed',
                     'Preparing': 'Order is being prepared in the kitchen',
@@ -860,9 +982,9 @@ def _init_swagger(app: Flask) -> None:
                 'message': 'Pizza Delivery API is running!',
                 'version': '2.0',
                 'database': 'connected',
-                'users_count': len(users_db),
-                'pizzas_count': len(pizzas_db),
-                'orders_count': len(orders_db),
+                'users_count': users_dao.count(),
+                'pizzas_count': pizza_dao.count(),
+                'orders_count': orders_dao.count(),
                 'timestamp': datetime.utcnow().isoformat()
             }
     
@@ -870,7 +992,8 @@ def _init_swagger(app: Flask) -> None:
     def hello_world():
         return jsonify({
             'message': 'Welcome to Pizza Delivery Management API!',
-            'docs_url': '/api/docs/',
+            'docs_url': SWAGGER_UI_PATH if app.config.get(SWAGGER_UI) else None,
+            'openapi_url': '/api/v1/swagger.json',
             'api_version': '2.0',
             'features': [
                 'JWT Authentication',
@@ -914,32 +1037,180 @@ def _init_swagger(app: Flask) -> None:
                 'user': {'username': 'user', 'password': 'user123'}
             },
             'instructions': [
-                '1. Visit /api/docs/ for interactive API documentation',
+                '1. Visit /api/docs/ for interactive API documentation (if SWAGGER_UI is enabled) '
+                'or load /api/v1/swagger.json into any OpenAPI tool',
                 '2. Login with test credentials to get JWT token',
                 '3. Use "Bearer <token>" in Authorization header for protected endpoints',
                 '4. Admin users have access to management features'
             ]
         })
 
+    return api
+
+
+def migrate_database(app_config: Dict[str, Any], additional_config: Dict[str, Any]) -> List[str]:
+    """
+    Brings the database to the current schema version and creates the starting data (python app.py migrate),
+    does nothing if it is up to date
+    :param app_config: Flask configuration
+    :param additional_config: additional configuration
+    :return: descriptions of the executed schema changes
+    """
+    from my_project.migrate import SCHEMA_VERSION, schema_version
+
+    _process_input_config(app_config, additional_config)
+    app = Flask(__name__)
+    app.config = {**app.config, **app_config}
+    _init_db_engine(app)
+    with app.app_context():
+        if schema_version() == SCHEMA_VERSION:
+            # no DDL, seeding or statistics rebuild racing with the counters of running workers
+            return []
+    return _migrate(app)
+
+
 def _init_db(app: Flask) -> None:
     """
-    Initializes DB with SQLAlchemy
+    Initializes DB with SQLAlchemy and checks the schema version with one query, without any DDL.
+    Migrates an outdated database only if AUTO_MIGRATE is enabled
     :param app: Flask application object
     """
-    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", {})
+    from my_project.migrate import SCHEMA_VERSION, schema_version
 
+    _init_db_engine(app)
+    with app.app_context():
+        version = schema_version()
+    if version == SCHEMA_VERSION:
+        return
+    if not app.config.get(AUTO_MIGRATE):
+        raise RuntimeError(f"Database schema version is {version}, expected {SCHEMA_VERSION}: "
+                           f"run 'python app.py migrate' or enable {AUTO_MIGRATE}")
+    _migrate(app)
 
 
+def _init_db_engine(app: Flask) -> None:
+    """
+    Configures the SQLAlchemy engine of app
+    :param app: Flask application object
+    """
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = _engine_options(
+        app.config["SQLALCHEMY_DATABASE_URI"], app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {}
+    )
     db.init_app(app)
 
-    if not database_exists(app.config["SQLALCHEMY_DATABASE_URI"]):
-        create_database(app.config["SQLALCHEMY_DATABASE_URI"])
 
-    import my_project.auth.domain
+def _migrate(app: Flask) -> List[str]:
+    """
+    Runs schema changes, creates the starting data and stores the new schema version
+    :param app: Flask application object
+    :return: descriptions of the executed schema changes
+    """
+    from my_project.migrate import migrate_schema, set_schema_version
+
+    from my_project.auth.dao import order_stats_dao, pizza_stats_dao
+
+    changes = migrate_schema(app)
+    _init_api_data(app)
     with app.app_context():
-        db.create_all()
+        # a new version may count differently, the maintained statistics are recomputed
+        order_stats_dao.rebuild()
+        pizza_stats_dao.rebuild()
+        set_schema_version()
+    return changes
+
+def _init_cache(app: Flask) -> None:
+    """
+    Applies catalog cache settings (CATALOG_CACHE_TTL seconds, CATALOG_CACHE_SIZE entries)
+    and connects the shared DTO cache if REDIS_URL is configured
+    :param app: Flask application object
+    """
+    from my_project.auth.dao.cache import configure_caches
+    from my_project.auth.dao.redis_cache import dto_cache
+    import my_project.auth.dao
+
+    configure_caches(app.config.get("CATALOG_CACHE_TTL"), app.config.get("CATALOG_CACHE_SIZE"))
+    dto_cache.init_app(app)
+
+
+def _init_auth(app: Flask) -> None:
+    """
+    Loads the JWT keyset and the password hashing settings of the environment
+    :param app: Flask application object
+    """
+    from my_project.auth.service.password_service import password_service
+    from my_project.auth.service.token_service import token_service
+
+    token_service.init_app(app)
+    password_service.init_app(app)
+
+
+def _init_api_data(app: Flask) -> None:
+    """
+    Creates statuses, test users and the starting pizza catalog of the /api/v1 API if they are missing
+    :param app: Flask application object
+    """
+    from my_project.auth.dao import (
+        delivery_status_dao, ingredients_dao, order_stats_dao, payment_status_dao, pizza_dao, pizza_stats_dao,
+        users_dao,
+    )
+    from my_project.auth.domain import DeliveryStatus, PaymentStatus, Pizza, Users
+    from my_project.auth.domain.orders.DeliveryStatus import ORDER_STATUSES
+
+    with app.app_context():
+        for status in ORDER_STATUSES:
+            if not delivery_status_dao.find_by_status(status):
+                delivery_status_dao.create(DeliveryStatus(status=status))
+        if not payment_status_dao.find_by_status(DEFAULT_PAYMENT_STATUS):
+            payment_status_dao.create(PaymentStatus(status=DEFAULT_PAYMENT_STATUS))
+
+        for username, password_hash, email, phone, address, is_admin in SEED_USERS:
+            user = users_dao.find_by_username(username)
+            if user:
+                # databases older than the admin flag: only the seeded account itself (same salted hash) is
+                # granted, not an account registered again under its username
+                if is_admin and not user.is_admin and user.password_hash == password_hash:
+                    users_dao.grant_admin(user)
+                continue
+            try:
+                users_dao.create(Users(username=username, U_Name=username, U_Surname='', email=email,
+                                       password_hash=password_hash, phone_number=phone, address=address,
+                                       is_admin=is_admin))
+            except IntegrityError:
+                pass  # created by another worker
+
+        order_stats_dao.rebuild_if_empty()
+        pizza_stats_dao.rebuild_if_empty()
+
+        if pizza_dao.count():
+            return
+        for name, description, price, size, ingredient_names in (
+            ('Margherita', 'Classic pizza with tomatoes and mozzarella', 299.0, 'Medium', ['tomatoes', 'mozzarella', 'basil']),
+            ('Pepperoni', 'Pizza with pepperoni and cheese', 349.0, 'Large', ['pepperoni', 'mozzarella', 'tomato sauce']),
+            ('Vegetarian', 'Pizza with vegetables', 319.0, 'Medium', ['bell peppers', 'mushrooms', 'onions', 'tomatoes']),
+        ):
+            pizza_dao.create(Pizza(name=name, description=description, price=price, size=size, quantity=0,
+                                   ingredients=ingredients_dao.find_or_create_by_names(ingredient_names)))
+
+
+def _engine_options(uri: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merges engine options of the environment config with the pool defaults
+    :param uri: database connection string
+    :param options: SQLALCHEMY_ENGINE_OPTIONS of the environment config
+    :return: engine options for Flask-SQLAlchemy
+    """
+    from my_project.auth.dao.pool import MeteredQueuePool
+
+    if uri.startswith("sqlite"):
+        # SQLite uses its own single-connection pools and isolation levels
+        return {key: value for key, value in options.items()
+                if key not in POOL_OPTIONS and key != "isolation_level"}
+    return {**DEFAULT_ENGINE_OPTIONS, "poolclass": MeteredQueuePool, **options}
+
 
 def _process_input_config(app_config: Dict[str, Any], additional_config: Dict[str, Any]) -> None:
+    from dotenv import load_dotenv
+
     load_dotenv()
     conn = os.getenv(SQLALCHEMY_DATABASE_URI)
     if conn:
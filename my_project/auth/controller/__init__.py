@@ -10,6 +10,8 @@ from my_project.auth.controller.orders.DeliveryStatusController import DeliveryS
 from my_project.auth.controller.orders.PizzaOrderController import PizzaOrderController
 from my_project.auth.controller.orders.PaymentStatusController import PaymentStatusController
 from my_project.auth.controller.orders.IngredientsController import IngredientsController
+from my_project.auth.controller.orders.ToppingController import ToppingController
+from my_project.auth.controller.orders.PizzaIngredietsController import PizzaIngredientsController
 
 # Initialize controllers
 orders_controller = OrdersController()
@@ -24,3 +26,5 @@ delivery_status_controller = DeliveryStatusController()
 pizza_order_controller = PizzaOrderController()
 payment_status_controller = PaymentStatusController()
 ingredients_controller = IngredientsController()
+toppings_controller = ToppingController()
+pizza_ingredients_controller = PizzaIngredientsController()
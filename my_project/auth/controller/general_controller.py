@@ -1,11 +1,13 @@
 
 
 from abc import ABC
-from typing import List, Dict
+from typing import Iterable, List, Dict
 
 from http import HTTPStatus
 from flask import abort
 
+from my_project.auth.dao.general_dao import BULK_CHUNK_SIZE
+
 
 class GeneralController(ABC):
     """
@@ -40,13 +42,17 @@ class GeneralController(ABC):
         """
         return self._service.create(obj).put_into_dto()
 
-    def create_all(self, obj_list: List[object]) -> List[object]:
+    def create_all(self, rows: Iterable[Dict[str, object]], chunk_size: int = BULK_CHUNK_SIZE,
+                   upsert: bool = False) -> List[Dict[str, object]]:
         """
-        Creates objects from object list using Service layer.
-        :param obj_list: object list to create in Database
-        :return: list of created objects as DTOs
+        Creates objects from rows in chunks using Service layer.
+        :param rows: field names and values of objects to create
+        :param chunk_size: number of rows sent to database at once
+        :param upsert: update existing rows with the same key instead of failing
+        :return: timings of every chunk
+        :raise BulkWriteError: a chunk was rejected, answered by route.bulk.bulk_create with the committed rows
         """
-        return list(map(lambda x: x.put_into_dto(), self._service.create(obj_list)))
+        return self._service.create_all(rows, chunk_size, upsert)
 
     def update(self, key: int, new_obj: object) -> None:
         """
@@ -59,17 +65,20 @@ class GeneralController(ABC):
             abort(HTTPStatus.NOT_FOUND)
         self._service.update(key, new_obj)
 
-    def patch(self, key: int, value_dict: Dict[str, object]) -> None:
+    def patch(self, key: int, value_dict: Dict[str, object]) -> object:
         """
-        Modifies defined field of object in database table using Service layer.
+        Modifies defined fields of object in database table using Service layer.
         :param key: integer key (surrogate primary key)
         :param value_dict: key-values
+        :return: DTO for updated object
         """
-        obj = self._service.find_by_id(key)
+        try:
+            obj = self._service.patch(key, value_dict)
+        except ValueError:
+            abort(HTTPStatus.UNPROCESSABLE_ENTITY)
         if obj is None:
             abort(HTTPStatus.NOT_FOUND)
-        for field_name, value in value_dict.items():
-            self._service.patch(key, field_name, value)
+        return obj.put_into_dto()
 
     def delete(self, key: int) -> None:
         """
@@ -1,4 +1,5 @@
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from my_project.auth.dao.general_dao import Criteria
 from my_project.auth.dao.orders.PizzaIngredientsDAO import PizzaIngredientsDAO
 from my_project.auth.domain.orders.PizzaIngredients import PizzaIngredient
 
@@ -8,11 +9,29 @@ class PizzaIngredientsController:
     def find_all(self) -> List[PizzaIngredient]:
         return self._dao.find_all()
 
+    def find_page(self, limit: int, after: Optional[list] = None, profile: Optional[str] = None, fields: Optional[Sequence[str]] = None, criteria: Optional[Criteria] = None) -> Tuple[List[PizzaIngredient], Optional[list]]:
+        return self._dao.find_page(limit, after, profile, fields, criteria)
+
+    def iter_all(self, profile: Optional[str] = None, fields: Optional[Sequence[str]] = None, criteria: Optional[Criteria] = None) -> Iterator[PizzaIngredient]:
+        return self._dao.iter_all(profile=profile, fields=fields, criteria=criteria)
+
     def create(self, pizza_ingredient: PizzaIngredient) -> None:
         self._dao.create(pizza_ingredient)
 
-    def find_by_id(self, pizza_id: int, ingredient_id: int) -> PizzaIngredient:
-        return self._dao.find_by_id(pizza_id, ingredient_id)
+    def create_all(self, rows: Iterable[Dict[str, object]], chunk_size: int, upsert: bool) -> List[Dict[str, object]]:
+        return self._dao.create_all(rows, chunk_size, upsert)
+
+    def dto_tables(self) -> Tuple[str, ...]:
+        return self._dao.dto_tables()
+
+    def parse_fields(self, fields: str) -> Tuple[str, ...]:
+        return self._dao.parse_fields(fields)
+
+    def parse_criteria(self, filters: Iterable[Tuple[str, str]], sort: Optional[str] = None) -> Criteria:
+        return self._dao.parse_criteria(filters, sort)
+
+    def find_by_id(self, pizza_id: int, ingredient_id: int, profile: Optional[str] = None, fields: Optional[Sequence[str]] = None) -> PizzaIngredient:
+        return self._dao.find_by_id((pizza_id, ingredient_id), profile, fields)
 
     def update(self, pizza_id: int, ingredient_id: int, pizza_ingredient: PizzaIngredient) -> None:
         self._dao.update(pizza_id, ingredient_id, pizza_ingredient)
@@ -21,4 +40,10 @@ class PizzaIngredientsController:
         self._dao.delete(pizza_id, ingredient_id)
 
     def find_all_with_details(self) -> List[Dict]:
-        return self._dao.find_all_with_details()
\ No newline at end of file
+        return self._dao.find_all_with_details()
+
+    def find_page_with_details(self, limit: int, after: Optional[list] = None) -> Tuple[List[Dict], Optional[list]]:
+        return self._dao.find_page_with_details(limit, after)
+
+    def iter_all_with_details(self) -> Iterator[Dict]:
+        return self._dao.iter_all_with_details()
@@ -1,4 +1,5 @@
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from my_project.auth.dao.general_dao import Criteria
 from my_project.auth.dao.orders.SaladDAO import SaladDAO
 from my_project.auth.domain.orders.Salad import Salad
 
@@ -8,14 +9,38 @@ class SaladController:
     def find_all(self) -> List[Salad]:
         return self._dao.find_all()
 
+    def find_page(self, limit: int, after: Optional[list] = None, profile: Optional[str] = None, fields: Optional[Sequence[str]] = None, criteria: Optional[Criteria] = None) -> Tuple[List[Salad], Optional[list]]:
+        return self._dao.find_page(limit, after, profile, fields, criteria)
+
+    def iter_all(self, profile: Optional[str] = None, fields: Optional[Sequence[str]] = None, criteria: Optional[Criteria] = None) -> Iterator[Salad]:
+        return self._dao.iter_all(profile=profile, fields=fields, criteria=criteria)
+
     def create(self, salad: Salad) -> None:
         self._dao.create(salad)
 
-    def find_by_id(self, salad_id: int) -> Salad:
-        return self._dao.find_by_id(salad_id)
+    def create_all(self, rows: Iterable[Dict[str, object]], chunk_size: int, upsert: bool) -> List[Dict[str, object]]:
+        return self._dao.create_all(rows, chunk_size, upsert)
+
+    def dto_tables(self) -> Tuple[str, ...]:
+        return self._dao.dto_tables()
+
+    def parse_fields(self, fields: str) -> Tuple[str, ...]:
+        return self._dao.parse_fields(fields)
+
+    def parse_criteria(self, filters: Iterable[Tuple[str, str]], sort: Optional[str] = None) -> Criteria:
+        return self._dao.parse_criteria(filters, sort)
+
+    def find_by_id(self, salad_id: int, profile: Optional[str] = None, fields: Optional[Sequence[str]] = None) -> Salad:
+        return self._dao.find_by_id(salad_id, profile, fields)
+
+    def find_dto_by_id(self, salad_id: int, fields: Optional[Sequence[str]] = None) -> Optional[Dict[str, object]]:
+        return self._dao.find_dto_by_id(salad_id, fields)
 
     def update(self, salad_id: int, salad: Salad) -> None:
         self._dao.update(salad_id, salad)
 
+    def patch(self, salad_id: int, value_dict: Dict[str, object], profile: Optional[str] = None) -> Optional[Salad]:
+        return self._dao.patch(salad_id, value_dict, profile)
+
     def delete(self, salad_id: int) -> None:
         self._dao.delete(salad_id)
@@ -1,5 +1,6 @@
 # my_project/auth/controller/orders/ToppingController.py
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from my_project.auth.dao.general_dao import Criteria
 from my_project.auth.dao.orders.ToppingsDAO import ToppingsDAO
 from my_project.auth.domain.orders.Toppings import Topping
 
@@ -9,14 +10,38 @@ class ToppingController:
     def find_all(self) -> List[Topping]:
         return self._dao.find_all()
 
+    def find_page(self, limit: int, after: Optional[list] = None, profile: Optional[str] = None, fields: Optional[Sequence[str]] = None, criteria: Optional[Criteria] = None) -> Tuple[List[Topping], Optional[list]]:
+        return self._dao.find_page(limit, after, profile, fields, criteria)
+
+    def iter_all(self, profile: Optional[str] = None, fields: Optional[Sequence[str]] = None, criteria: Optional[Criteria] = None) -> Iterator[Topping]:
+        return self._dao.iter_all(profile=profile, fields=fields, criteria=criteria)
+
     def create(self, topping: Topping) -> None:
         self._dao.create(topping)
 
-    def find_by_id(self, topping_id: int) -> Topping:
-        return self._dao.find_by_id(topping_id)
+    def create_all(self, rows: Iterable[Dict[str, object]], chunk_size: int, upsert: bool) -> List[Dict[str, object]]:
+        return self._dao.create_all(rows, chunk_size, upsert)
+
+    def dto_tables(self) -> Tuple[str, ...]:
+        return self._dao.dto_tables()
+
+    def parse_fields(self, fields: str) -> Tuple[str, ...]:
+        return self._dao.parse_fields(fields)
+
+    def parse_criteria(self, filters: Iterable[Tuple[str, str]], sort: Optional[str] = None) -> Criteria:
+        return self._dao.parse_criteria(filters, sort)
+
+    def find_by_id(self, topping_id: int, profile: Optional[str] = None, fields: Optional[Sequence[str]] = None) -> Topping:
+        return self._dao.find_by_id(topping_id, profile, fields)
+
+    def find_dto_by_id(self, topping_id: int, fields: Optional[Sequence[str]] = None) -> Optional[Dict[str, object]]:
+        return self._dao.find_dto_by_id(topping_id, fields)
 
     def update(self, topping_id: int, topping: Topping) -> None:
         self._dao.update(topping_id, topping)
 
+    def patch(self, topping_id: int, value_dict: Dict[str, object], profile: Optional[str] = None) -> Optional[Topping]:
+        return self._dao.patch(topping_id, value_dict, profile)
+
     def delete(self, topping_id: int) -> None:
         self._dao.delete(topping_id)
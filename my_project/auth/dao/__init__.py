@@ -15,6 +15,8 @@ from .orders.PaymentStatusDAO import PaymentStatusDAO
 from .orders.ToppingsDAO import ToppingsDAO
 from .orders.PizzaIngredientsDAO import PizzaIngredientsDAO
 from .orders.IngredientsDAO import IngredientsDAO
+from .orders.OrderStatsDAO import OrderStatsDAO
+from .orders.PizzaStatsDAO import PizzaStatsDAO
 
 # Initialize DAOs for each entity
 gender_dao = GenderDAO()
@@ -31,3 +33,5 @@ payment_status_dao = PaymentStatusDAO()
 toppings_dao = ToppingsDAO()
 pizza_ingredients_dao = PizzaIngredientsDAO()
 ingredients_dao = IngredientsDAO()
+order_stats_dao = OrderStatsDAO()
+pizza_stats_dao = PizzaStatsDAO()
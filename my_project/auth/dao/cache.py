@@ -0,0 +1,149 @@
+"""
+Process-local read-through cache for rarely changing (catalog) tables.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+CATALOG_CACHE_TTL = 300.0
+CATALOG_CACHE_SIZE = 256
+
+# Every cache created in this process, used to invalidate by table name
+_caches: List["CatalogCache"] = []
+_caches_lock = threading.Lock()
+
+
+class CatalogCache:
+    """
+    TTL + LRU cache of query results, dropped as a whole when one of its tables is written.
+    """
+
+    def __init__(self, name: str, tables: Iterable[str],
+                 ttl: float = CATALOG_CACHE_TTL, max_size: int = CATALOG_CACHE_SIZE) -> None:
+        """
+        :param name: cache name shown in statistics
+        :param tables: names of tables the cached results are read from
+        :param ttl: seconds an entry stays valid
+        :param max_size: maximal number of entries, the least recently used ones are evicted
+        """
+        self.name = name
+        self.tables = frozenset(tables)
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so that a load started before it is not stored
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        with _caches_lock:
+            _caches.append(self)
+
+    def get_or_load(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """
+        Gets cached value of key, calls load and stores its result on miss.
+        :param key: hashable entry key
+        :param load: function reading the value from database
+        :return: cached or loaded value
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            generation = self._generation
+
+        value = load()
+
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        """
+        Drops all entries.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self.invalidations += 1
+
+    def configure(self, ttl: Optional[float] = None, max_size: Optional[int] = None) -> None:
+        """
+        Changes entry lifetime and size limit, drops all entries.
+        :param ttl: seconds an entry stays valid
+        :param max_size: maximal number of entries
+        """
+        if ttl is not None:
+            self.ttl = float(ttl)
+        if max_size is not None:
+            self.max_size = int(max_size)
+        self.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Gets counters of the cache.
+        :return: statistics DTO
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "tables": sorted(self.tables),
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+def invalidate_table(table: str) -> None:
+    """
+    Drops every cache that reads from table.
+    :param table: table name
+    """
+    with _caches_lock:
+        caches = list(_caches)
+    for cache in caches:
+        if table in cache.tables:
+            cache.clear()
+
+
+def configure_caches(ttl: Optional[float] = None, max_size: Optional[int] = None) -> None:
+    """
+    Applies lifetime and size limit to all caches.
+    :param ttl: seconds an entry stays valid
+    :param max_size: maximal number of entries per cache
+    """
+    with _caches_lock:
+        caches = list(_caches)
+    for cache in caches:
+        cache.configure(ttl, max_size)
+
+
+def cache_stats() -> List[Dict[str, Any]]:
+    """
+    Gets counters of all caches.
+    :return: list of statistics DTOs
+    """
+    with _caches_lock:
+        caches = list(_caches)
+    return [cache.stats() for cache in caches]
@@ -4,13 +4,77 @@ apavelchak@gmail.com
 © Andrii Pavelchak
 """
 
+import json
+import operator
+import time
 from abc import ABC
-from typing import List
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
 
-from sqlalchemy import inspect
-from sqlalchemy.orm import Mapper
+from sqlalchemy import and_, insert, inspect, or_, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Mapper, Query, Session, lazyload, load_only
 
 from my_project import db
+from my_project.auth.dao.cache import CatalogCache, invalidate_table
+from my_project.auth.dao.redis_cache import dto_cache
+
+STREAM_BATCH_SIZE = 1000
+BULK_CHUNK_SIZE = 500
+
+# Loader profile for rendering the full put_into_dto() of the domain type
+DTO_PROFILE = "dto"
+
+# Comparisons of filter parameters (?Created_AT__gte=...), a parameter without suffix compares for equality
+COMPARISON_OPERATORS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+}
+FILTER_OPERATORS = tuple(COMPARISON_OPERATORS) + ("in", "isnull", "startswith")
+
+# Unique/primary key violations: MySQL ER_DUP_ENTRY and ER_DUP_ENTRY_WITH_KEY_NAME, PostgreSQL unique_violation
+DUPLICATE_KEY_CODES = {1062, 1586, "23505"}
+DUPLICATE_KEY_SQLITE_ERRORS = {"SQLITE_CONSTRAINT_UNIQUE", "SQLITE_CONSTRAINT_PRIMARYKEY"}
+
+
+class Criteria(NamedTuple):
+    """
+    Compiled filters and sort order of a collection query, see GeneralDAO.parse_criteria.
+    """
+    filters: Tuple[Any, ...] = ()
+    # (column attribute, descending) in ordering priority, the primary key is appended when ordering
+    order: Tuple[Tuple[Any, bool], ...] = ()
+
+
+class BulkWriteError(Exception):
+    """
+    A chunk of GeneralDAO.create_all was rejected, the chunks before it stay committed.
+    """
+
+    def __init__(self, error: Exception, timings: List[Dict[str, object]]) -> None:
+        """
+        :param error: ValueError of a wrong row or IntegrityError of the database
+        :param timings: timings of the committed chunks
+        """
+        super().__init__(str(error))
+        self.error = error
+        self.timings = timings
+
+    @property
+    def committed_rows(self) -> int:
+        """
+        Gets number of leading rows of the input that were committed.
+        """
+        return sum(chunk["rows"] for chunk in self.timings)
 
 
 class GeneralDAO(ABC):
@@ -19,21 +83,277 @@ class GeneralDAO(ABC):
     """
     _domain_type = None
     _session = db.session
+    # Eager-loading option sets keyed by the DTO shape being rendered
+    _loader_profiles: Dict[str, Tuple] = {}
+    # Read-through cache of find_all/find_page/find_by_id, None reads database every time
+    _cache: Optional[CatalogCache] = None
+    # Other tables put_into_dto() reads from (through relationships)
+    _dto_tables: Tuple[str, ...] = ()
+    # Loader option of every relationship put_into_dto() renders, keyed by its DTO field
+    _relationship_fields: Dict[str, Any] = {}
+    # Columns put_into_dto() never renders, not selectable with ?fields=
+    _hidden_fields: Tuple[str, ...] = ()
+    # Columns the generic write paths (update, patch, create_all) never set, e.g. credentials
+    _readonly_fields: Tuple[str, ...] = ()
+    # Indexed columns usable in filters and sort orders besides the primary key
+    _query_fields: Tuple[str, ...] = ()
+
+    def _query(self, profile: Optional[str] = None, session: Optional[Session] = None,
+               fields: Optional[Sequence[str]] = None) -> Query:
+        """
+        Builds the base query for the domain type with eager-loading options of the profile.
+        :param profile: loader profile name, None loads relationships lazily
+        :param session: session to query in, the request session by default
+        :param fields: DTO fields to load (see parse_fields) instead of the profile, other columns are deferred
+        :return: query object
+        """
+        query = (session or self._session).query(self._domain_type)
+        if fields is not None:
+            query = query.options(*self._projection_options(fields))
+        elif profile is not None:
+            query = query.options(*self._loader_profiles.get(profile, ()))
+        return query
+
+    def dto_fields(self) -> Tuple[str, ...]:
+        """
+        Gets the fields a projection of the domain type may select: mapped columns and rendered relationships.
+        :return: tuple of field names
+        """
+        mapper: Mapper = inspect(self._domain_type)
+        columns = tuple(attr.key for attr in mapper.column_attrs if attr.key not in self._hidden_fields)
+        return columns + tuple(self._relationship_fields)
+
+    def parse_fields(self, fields: str) -> Tuple[str, ...]:
+        """
+        Validates a comma separated field list (?fields=id,name) against the mapper of the domain type.
+        :param fields: comma separated field names
+        :return: field names in request order without duplicates
+        :raise ValueError: the list is empty or names an unknown field
+        """
+        names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+        if not names:
+            raise ValueError("No fields requested")
+        allowed = self.dto_fields()
+        for name in names:
+            if name not in allowed:
+                raise ValueError(f"Unknown field '{name}'")
+        return names
+
+    def _projection_options(self, fields: Sequence[str]) -> List[Any]:
+        """
+        Builds loader options selecting only the columns of fields and eager-loading only their relationships.
+        Relationships not in fields are never accessed when the projection is rendered, so they are not loaded at all.
+        :param fields: validated field names
+        :return: query options
+        """
+        mapper: Mapper = inspect(self._domain_type)
+        columns = [mapper.column_attrs[name].class_attribute for name in fields if name in mapper.column_attrs]
+        # the primary key is loaded anyway, load_only needs at least one column
+        columns = columns or [mapper.get_property_by_column(column).class_attribute for column in mapper.primary_key]
+        # lazyload("*") also overrides lazy="joined" mappings, the requested relationships override it
+        return [load_only(*columns), lazyload("*")] + [self._relationship_fields[name] for name in fields
+                                                       if name in self._relationship_fields]
+
+    def query_fields(self) -> Tuple[str, ...]:
+        """
+        Gets the fields filters and sort orders may use: the primary key and the indexed _query_fields.
+        :return: tuple of field names
+        """
+        mapper: Mapper = inspect(self._domain_type)
+        keys = tuple(mapper.get_property_by_column(column).key for column in mapper.primary_key)
+        return keys + tuple(name for name in self._query_fields if name not in keys)
+
+    def parse_criteria(self, filters: Iterable[Tuple[str, str]], sort: Optional[str] = None) -> Criteria:
+        """
+        Compiles filter parameters (field=value or field__operator=value with one of FILTER_OPERATORS)
+        and a sort list (field,-field for descending) into SQL, accepting only query_fields.
+        :param filters: parameter names and values, one field may be given several times
+        :param sort: comma separated sort fields or None
+        :return: compiled criteria
+        :raise ValueError: unknown field or operator, wrong value
+        """
+        mapper: Mapper = inspect(self._domain_type)
+        allowed = self.query_fields()
+        expressions = []
+        for name, value in filters:
+            field_name, _, operator_name = name.partition("__")
+            if field_name not in allowed or (operator_name or "eq") not in FILTER_OPERATORS:
+                raise ValueError(f"Unknown filter '{name}'")
+            column_attr = mapper.column_attrs[field_name]
+            expressions.append(_filter_expression(column_attr.class_attribute, column_attr.columns[0],
+                                                  operator_name or "eq", value))
+        order = []
+        for item in (sort or "").split(","):
+            field_name = item.strip().lstrip("-")
+            if not field_name:
+                continue
+            if field_name not in allowed:
+                raise ValueError(f"Unknown sort field '{field_name}'")
+            order.append((mapper.column_attrs[field_name].class_attribute, item.strip().startswith("-")))
+        return Criteria(tuple(expressions), tuple(order))
+
+    def _ordering(self, criteria: Optional[Criteria]) -> List[Tuple[Any, bool]]:
+        """
+        Gets the full keyset order: sort fields of criteria, then the primary key (ascending).
+        :param criteria: criteria or None for the primary key order
+        :return: (column attribute, descending) pairs
+        """
+        order = list(criteria.order) if criteria is not None else []
+        mapper: Mapper = inspect(self._domain_type)
+        sorted_keys = {attribute.key for attribute, _ in order}
+        for column in mapper.primary_key:
+            attribute = mapper.get_property_by_column(column).class_attribute
+            if attribute.key not in sorted_keys:
+                order.append((attribute, False))
+        return order
 
-    def find_all(self) -> List[object]:
+    def _filtered(self, query: Query, criteria: Optional[Criteria]) -> Query:
+        """
+        Applies filters of criteria to query.
+        """
+        return query.filter(*criteria.filters) if criteria is not None and criteria.filters else query
+
+    def find_all(self, profile: Optional[str] = None) -> List[object]:
         """
         Gets all objects from table.
+        :param profile: loader profile name
         :return: list of all objects
         """
-        return self._session.query(self._domain_type).all()
+        if self._cache is not None:
+            return [self._attach(obj) for obj in self._cached(("all",), Query.all)]
+        return self._query(profile).all()
+
+    def find_page(self, limit: int, after: Optional[Sequence[object]] = None, profile: Optional[str] = None,
+                  fields: Optional[Sequence[str]] = None,
+                  criteria: Optional[Criteria] = None) -> Tuple[List[object], Optional[list]]:
+        """
+        Gets one page of objects ordered by primary key, or by the sort fields of criteria (keyset pagination).
+        :param limit: maximal number of objects on the page
+        :param after: key values of the last object on the previous page
+        :param profile: loader profile name
+        :param fields: DTO fields to load instead of the profile (cached catalogs are complete anyway)
+        :param criteria: filters and sort order (see parse_criteria), filtered pages are not cached
+        :return: objects of the page and key values to continue after (None on the last page)
+        """
+        if self._cache is not None and criteria is None:
+            cursor = json.dumps(list(after), default=str) if after is not None else None
+            objects, next_key = self._cached(("page", limit, cursor), lambda query: self._page(query, limit, after))
+            return [self._attach(obj) for obj in objects], next_key
+        return self._page(self._filtered(self._query(profile, fields=fields), criteria), limit, after, criteria)
 
-    def find_by_id(self, key: int) -> object:
+    def _page(self, query: Query, limit: int, after: Optional[Sequence[object]],
+              criteria: Optional[Criteria] = None) -> Tuple[List[object], Optional[list]]:
+        """
+        Applies keyset pagination to query.
+        :param query: query over the domain type
+        :param limit: maximal number of objects on the page
+        :param after: key values of the last object on the previous page
+        :param criteria: criteria whose sort order is used, None orders by primary key
+        :return: objects of the page and key values to continue after (None on the last page)
+        """
+        ordering = self._ordering(criteria)
+        if after is not None:
+            if len(after) != len(ordering):
+                raise ValueError("Cursor does not match the sort order")
+            values = [_coerce_value(attribute.property.columns[0], value)
+                      for (attribute, _), value in zip(ordering, after)]
+            query = query.filter(_keyset_after(ordering, values))
+        objects = query.order_by(*_order_by(ordering)).limit(limit + 1).all()
+        if len(objects) <= limit:
+            return objects, None
+        objects = objects[:limit]
+        return objects, [getattr(objects[-1], attribute.key) for attribute, _ in ordering]
+
+    def iter_all(self, batch_size: int = STREAM_BATCH_SIZE, profile: Optional[str] = None,
+                 fields: Optional[Sequence[str]] = None, criteria: Optional[Criteria] = None) -> Iterator[object]:
+        """
+        Streams all objects from table through a server-side cursor, batch by batch.
+        :param batch_size: number of rows fetched and converted to objects at once
+        :param profile: loader profile name
+        :param fields: DTO fields to load instead of the profile
+        :param criteria: filters and sort order (see parse_criteria)
+        :return: iterator over all (matching) objects
+        """
+        query = self._filtered(self._query(profile, fields=fields), criteria)
+        query = query.order_by(*_order_by(self._ordering(criteria)))
+        return iter(query.execution_options(stream_results=True).yield_per(batch_size))
+
+    def find_by_id(self, key: int, profile: Optional[str] = None, fields: Optional[Sequence[str]] = None) -> object:
         """
         Gets object from database table by integer key.
         :param key: integer key (surrogate primary key)
+        :param profile: loader profile name
+        :param fields: DTO fields to load instead of the profile
         :return: search object
         """
-        return self._session.query(self._domain_type).get(key)
+        if self._cache is not None:
+            obj = self._cached(("id", key), lambda query: query.get(key))
+            return self._attach(obj) if obj is not None else None
+        return self._query(profile, fields=fields).get(key)
+
+    def find_dto_by_id(self, key: int, fields: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Gets DTO of object by integer key through the shared Redis cache (when configured).
+        A projection is read from database with only its fields, bypassing the cache.
+        :param key: integer key (surrogate primary key)
+        :param fields: DTO fields to render (see parse_fields), None renders the full DTO
+        :return: DTO or None if there is no object with such key
+        """
+        if fields is not None:
+            obj = self.find_by_id(key, fields=fields)
+            return project_dto(obj, fields) if obj is not None else None
+
+        def load() -> Optional[Dict[str, Any]]:
+            obj = self.find_by_id(key, DTO_PROFILE)
+            return obj.put_into_dto() if obj is not None else None
+
+        return dto_cache.get_or_load(self._domain_type.__tablename__, key, self.dto_tables(), load)
+
+    def dto_tables(self) -> Tuple[str, ...]:
+        """
+        Gets all tables the DTO of the domain type is read from.
+        :return: tuple of table names
+        """
+        return (self._domain_type.__tablename__,) + self._dto_tables
+
+    def _cached(self, key: Hashable, load: Callable[[Query], object]) -> object:
+        """
+        Reads result of load from the cache or from database.
+        Results are loaded in a separate session with the full DTO profile, so the cached
+        objects are detached and do not lazy-load nor expire on commits of request sessions.
+        :param key: cache key of the result
+        :param load: function running the query
+        :return: cached result (detached objects)
+        """
+        def load_detached() -> object:
+            with self._session.session_factory() as session:
+                return load(self._query(DTO_PROFILE, session))
+
+        return self._cache.get_or_load(key, load_detached)
+
+    def _attach(self, obj: object) -> object:
+        """
+        Copies cached object into the request session without SQL.
+        :param obj: detached cached object
+        :return: object of the request session
+        """
+        return self._session.merge(obj, load=False)
+
+    def _after_write(self, *tables: str) -> None:
+        """
+        Invalidates cached reads of the table of the domain type in this and (through Redis) other processes.
+        :param tables: other tables written in the same transaction
+        """
+        for table in (self._domain_type.__tablename__,) + tables:
+            invalidate_table(table)
+            dto_cache.invalidate(table)
+
+    def count(self) -> int:
+        """
+        Gets number of objects in table.
+        :return: number of rows
+        """
+        return self._session.query(self._domain_type).count()
 
     def create(self, obj: object) -> object:
         """
@@ -43,21 +363,81 @@ class GeneralDAO(ABC):
         """
         self._session.add(obj)
         self._session.commit()
+        self._after_write()
         return obj
 
-    def create_all(self, obj_list: List[object]) -> List[object]:
+    def create_all(self, rows: Iterable[Dict[str, object]], chunk_size: int = BULK_CHUNK_SIZE,
+                   upsert: bool = False) -> List[Dict[str, object]]:
         """
-        Creates objects from object list.
-        :param obj_list: object list to create in Database
-        :return: list of created object
+        Inserts rows with one executemany INSERT per chunk, each chunk is committed in its own transaction.
+        :param rows: field names and values of objects to create
+        :param chunk_size: number of rows sent to database at once
+        :param upsert: update existing rows with the same key instead of failing
+        :return: timings of every chunk
+        :raise BulkWriteError: a chunk has a wrong row or violates a constraint, the chunks before it are committed
         """
-        self._session.add_all(obj_list)
-        self._session.commit()
-        return obj_list
+        timings = []
+        try:
+            for number, chunk in enumerate(_chunks(rows, chunk_size), start=1):
+                started = time.perf_counter()
+                chunk = [self._coerce_row(row) for row in chunk]
+                # executemany needs the same set of columns in every row of a statement
+                groups: Dict[Tuple[str, ...], List[Dict[str, object]]] = {}
+                for row in chunk:
+                    groups.setdefault(tuple(sorted(row)), []).append(row)
+                try:
+                    for columns, group in groups.items():
+                        statement = self._upsert_statement(columns) if upsert else insert(self._domain_type.__table__)
+                        self._session.execute(statement, group)
+                    self._session.commit()
+                except Exception:
+                    self._session.rollback()
+                    raise
+                timings.append({
+                    "chunk": number,
+                    "rows": len(chunk),
+                    "seconds": round(time.perf_counter() - started, 6),
+                })
+        except (ValueError, IntegrityError) as error:
+            raise BulkWriteError(error, timings) from error
+        finally:
+            # chunks committed before a failure are visible as well
+            if timings:
+                self._after_write()
+        return timings
+
+    def _coerce_row(self, row: Dict[str, object]) -> Dict[str, object]:
+        """
+        Checks that every field is a writable column of the domain type and converts JSON values to column types.
+        :param row: field names and values of object
+        :return: column keys and converted values
+        """
+        if not isinstance(row, dict) or not row:
+            raise ValueError("Row must be a non-empty object")
+        mapper: Mapper = inspect(self._domain_type)
+        result = {}
+        for field_name, value in row.items():
+            column_attr = mapper.column_attrs.get(field_name)
+            if column_attr is None:
+                raise ValueError(f"Unknown field '{field_name}'")
+            if field_name in self._readonly_fields:
+                raise ValueError(f"Field '{field_name}' can not be written")
+            column = column_attr.columns[0]
+            result[column.key] = _coerce_value(column, value)
+        return result
+
+    def _upsert_statement(self, columns: Sequence[str]):
+        """
+        Builds INSERT that updates the existing row on primary key conflict.
+        :param columns: column keys present in rows
+        :return: insert statement of the current database dialect
+        """
+        dialect = self._session.get_bind(mapper=inspect(self._domain_type)).dialect.name
+        return upsert_statement(dialect, self._domain_type.__table__, columns)
 
     def update(self, key: int, in_obj: object) -> None:
         """
-        Updates object in database table
+        Updates object in database table, read-only fields keep their values.
         :param key: integer key (surrogate primary key)
         :param in_obj: object to update in Database
         """
@@ -65,21 +445,63 @@ class GeneralDAO(ABC):
         mapper: Mapper = inspect(type(in_obj))  # Metadata
         columns = mapper.columns._collection
         for column_name, column_obj, *_ in columns:
-            if not column_obj.primary_key:
+            if not column_obj.primary_key and column_name not in self._readonly_fields:
                 value = getattr(in_obj, column_name)
                 setattr(domain_obj, column_name, value)
         self._session.commit()
+        self._after_write()
 
-    def patch(self, key: int, field_name: str, value: object) -> None:
+    def patch(self, key: int, value_dict: Dict[str, object], profile: Optional[str] = None) -> Optional[object]:
         """
-        Modifies defined field of object in database table.
+        Modifies several fields of object with one UPDATE in a single transaction.
         :param key: integer key (surrogate primary key)
-        :param field_name: field name of object
-        :param value: field value of object
+        :param value_dict: field names and values of object
+        :param profile: loader profile name for the returned object
+        :return: updated object or None if there is no object with such key
         """
-        domain_obj = self._session.query(self._domain_type).get(key)
-        setattr(domain_obj, field_name, value)
-        self._session.commit()
+        value_dict = self._coerce_patch_fields(value_dict)
+        domain_obj = self._query(profile).get(key)
+        if domain_obj is None:
+            return None
+        for field_name, value in value_dict.items():
+            setattr(domain_obj, field_name, value)
+        session = self._session()
+        expire_on_commit = session.expire_on_commit
+        session.expire_on_commit = False  # the object already holds the new state, no reload needed
+        try:
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.expire_on_commit = expire_on_commit
+        self._after_write()
+        stale = [relationship.key for relationship in inspect(self._domain_type).relationships
+                 if any(column.key in value_dict for column in relationship.local_columns)]
+        if stale:
+            session.expire(domain_obj, stale)
+        return domain_obj
+
+    def _coerce_patch_fields(self, value_dict: Dict[str, object]) -> Dict[str, object]:
+        """
+        Checks that every field is a writable non-key column of the domain type and converts JSON values to column types.
+        :param value_dict: field names and values of object
+        :return: field names and converted values
+        :raise ValueError: value_dict is not a non-empty object or names a field that can not be patched
+        """
+        if not isinstance(value_dict, dict):
+            raise ValueError("Patch must be an object")
+        if not value_dict:
+            raise ValueError("Nothing to patch")
+        mapper: Mapper = inspect(self._domain_type)
+        result = {}
+        for field_name, value in value_dict.items():
+            column_attr = mapper.column_attrs.get(field_name)
+            if (column_attr is None or field_name in self._readonly_fields
+                    or any(column.primary_key for column in column_attr.columns)):
+                raise ValueError(f"Field '{field_name}' can not be patched")
+            result[field_name] = _coerce_value(column_attr.columns[0], value)
+        return result
 
     def delete(self, key: int) -> None:
         """
@@ -92,7 +514,8 @@ class GeneralDAO(ABC):
             self._session.commit()
         except Exception:
             self._session.rollback()
-            raise 
+            raise
+        self._after_write()
 
     def delete_all(self) -> None:
         """
@@ -100,3 +523,191 @@ class GeneralDAO(ABC):
         """
         self._session.query(self._domain_type).delete()
         self._session.commit()
+        self._after_write()
+
+
+def _order_by(ordering: Sequence[Tuple[Any, bool]]) -> List[Any]:
+    """
+    Converts keyset order to ORDER BY clauses.
+    :param ordering: (column, descending) pairs
+    :return: list of order clauses
+    """
+    return [column.desc() if descending else column for column, descending in ordering]
+
+
+def _keyset_after(ordering: Sequence[Tuple[Any, bool]], values: Sequence[object]):
+    """
+    Builds condition "row comes after values" for keyset pagination in ordering.
+    NULLs are taken as the smallest values, as MySQL and SQLite sort them.
+    :param ordering: (column, descending) pairs in ordering priority, ending with the primary key
+    :param values: values of the ordering columns of the last seen row
+    :return: SQL boolean expression
+    """
+    clauses = []
+    for i, (column, descending) in enumerate(ordering):
+        value = values[i]
+        if value is None and descending:
+            continue  # NULLs come last in descending order, only the next columns can advance
+        if value is None:
+            beyond = column.isnot(None)
+        elif descending:
+            beyond = or_(column < value, column.is_(None))
+        else:
+            beyond = column > value
+        equal_prefix = [ordering[j][0].is_(None) if values[j] is None else ordering[j][0] == values[j]
+                        for j in range(i)]
+        clauses.append(and_(*equal_prefix, beyond))
+    return or_(*clauses)
+
+
+def _filter_expression(attribute, column, operator_name: str, value: str):
+    """
+    Compiles one filter parameter.
+    :param attribute: mapped column attribute
+    :param column: table column
+    :param operator_name: one of FILTER_OPERATORS
+    :param value: parameter value
+    :return: SQL boolean expression
+    """
+    if operator_name == "isnull":
+        if value.lower() not in ("true", "false", "1", "0"):
+            raise ValueError(f"Wrong value for '{column.name}'")
+        return attribute.is_(None) if value.lower() in ("true", "1") else attribute.isnot(None)
+    if operator_name == "in":
+        return attribute.in_([_coerce_value(column, item) for item in value.split(",")])
+    if operator_name == "startswith":
+        if column.type.python_type is not str:
+            raise ValueError(f"Wrong filter for '{column.name}'")
+        # a prefix LIKE can still use the index of the column
+        return attribute.startswith(value, autoescape=True)
+    return COMPARISON_OPERATORS[operator_name](attribute, _coerce_value(column, value))
+
+
+def _chunks(rows: Iterable[Dict[str, object]], size: int) -> Iterator[List[Dict[str, object]]]:
+    """
+    Splits rows into lists of at most size rows without reading the whole input.
+    :param rows: any iterable of rows
+    :param size: chunk size
+    :return: iterator over chunks
+    """
+    iterator = iter(rows)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+def _coerce_value(column, value: object) -> object:
+    """
+    Converts JSON value (string/number) to the Python type of column.
+    :param column: table column
+    :param value: JSON value
+    :return: converted value
+    """
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if isinstance(value, python_type) and not isinstance(value, bool) or python_type is str:
+        return value
+    try:
+        if python_type is datetime:
+            return datetime.fromisoformat(str(value))
+        if python_type is date:
+            return date.fromisoformat(str(value))
+        if python_type is Decimal:
+            return Decimal(str(value))
+        if python_type in (int, float):
+            return python_type(value)
+    except (TypeError, ValueError, InvalidOperation) as exc:
+        raise ValueError(f"Wrong value for '{column.name}'") from exc
+    return value
+
+
+def upsert_statement(dialect: str, table, columns: Sequence[str], increment: bool = False):
+    """
+    Builds INSERT that updates the existing row on primary key conflict, in one atomic statement
+    (ON DUPLICATE KEY UPDATE, ON CONFLICT DO UPDATE), so concurrent inserts of the same key do not fail.
+    :param dialect: name of the database dialect
+    :param table: table to insert into
+    :param columns: column keys present in rows
+    :param increment: add the inserted values to the existing ones instead of replacing them (counters)
+    :return: insert statement of the dialect
+    """
+    key_columns = [column.key for column in table.primary_key]
+    update_columns = [column for column in columns if column not in key_columns]
+    if dialect == "mysql":
+        statement = mysql_insert(table)
+        new_values = statement.inserted
+    elif dialect in ("sqlite", "postgresql"):
+        statement = sqlite_insert(table) if dialect == "sqlite" else postgresql_insert(table)
+        new_values = statement.excluded
+    else:
+        raise ValueError(f"Upsert is not supported for {dialect}")
+    values = {column: table.c[column] + new_values[column] if increment else new_values[column]
+              for column in update_columns}
+    if dialect == "mysql":
+        return statement.on_duplicate_key_update(values or {key_columns[0]: new_values[key_columns[0]]})
+    if not values:
+        return statement.on_conflict_do_nothing(index_elements=key_columns)
+    return statement.on_conflict_do_update(index_elements=key_columns, set_=values)
+
+
+def is_duplicate_key(error: IntegrityError) -> bool:
+    """
+    Tells a unique or primary key violation from the other integrity errors (NOT NULL, foreign key, check).
+    :param error: integrity error of a statement
+    :return: True if a row with the same key exists
+    """
+    orig = error.orig
+    sqlite_error = getattr(orig, "sqlite_errorname", None)
+    if sqlite_error is not None:
+        return sqlite_error in DUPLICATE_KEY_SQLITE_ERRORS
+    code = getattr(orig, "pgcode", None) or (orig.args[0] if getattr(orig, "args", None) else None)
+    return code in DUPLICATE_KEY_CODES
+
+
+def old_values(session: Session, obj: object, attributes: Sequence[str]) -> Tuple[object, ...]:
+    """
+    Gets values of attributes of persistent object as they are in the database (for flush listeners).
+    :param session: session the object belongs to
+    :param obj: persistent object
+    :param attributes: attribute names
+    :return: values in the order of attributes
+    """
+    state = inspect(obj)
+    values = []
+    for attribute in attributes:
+        history = state.attrs[attribute].history
+        if history.deleted or history.unchanged:
+            values.append((history.deleted or history.unchanged)[0])
+        elif not history.added:
+            values.append(getattr(obj, attribute))
+        else:
+            # set on an expired object, the previous value was never loaded
+            mapper = state.mapper
+            columns = [mapper.attrs[name].columns[0] for name in attributes]
+            condition = and_(*(column == key for column, key in zip(mapper.primary_key, state.identity)))
+            return tuple(session.connection().execute(select(*columns).where(condition)).one())
+    return tuple(values)
+
+
+def project_dto(obj: object, fields: Sequence[str]) -> Dict[str, Any]:
+    """
+    Renders only fields of object, the projection counterpart of put_into_dto().
+    Related objects are rendered with their own put_into_dto().
+    :param obj: domain object loaded with the same fields
+    :param fields: validated field names
+    :return: DTO with the requested fields
+    """
+    dto = {}
+    for name in fields:
+        value = getattr(obj, name)
+        if isinstance(value, list):
+            value = [item.put_into_dto() for item in value]
+        elif hasattr(value, "put_into_dto"):
+            value = value.put_into_dto()
+        dto[name] = value
+    return dto
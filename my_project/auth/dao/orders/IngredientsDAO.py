@@ -1,16 +1,30 @@
-from typing import List, Optional
+from typing import List
+from my_project.auth.dao.cache import CatalogCache
 from my_project.auth.dao.general_dao import GeneralDAO
 from my_project.auth.domain.orders.Ingredients import Ingredient
 
 class IngredientsDAO(GeneralDAO):
     _domain_type = Ingredient
+    _cache = CatalogCache("ingredients", (Ingredient.__tablename__,))
 
-    def create(self, ingredient: Ingredient) -> None:
-        self._session.add(ingredient)
-        self._session.commit()
+    def find_by_names(self, names: List[str]) -> List[Ingredient]:
+        """
+        Gets ingredients with any of names.
+        :param names: ingredient names
+        :return: list of ingredients
+        """
+        if not names:
+            return []
+        return self._session.query(Ingredient).filter(Ingredient.name.in_(names)).all()
 
-    def find_all(self) -> List[Ingredient]:
-        return self._session.query(Ingredient).all()
-
-    def find_by_id(self, ingredient_id: int) -> Optional[Ingredient]:
-        return self._session.query(Ingredient).filter(Ingredient.ingredient_id == ingredient_id).first()
\ No newline at end of file
+    def find_or_create_by_names(self, names: List[str]) -> List[Ingredient]:
+        """
+        Gets ingredients by names, creates the missing ones with zero quantity.
+        :param names: ingredient names
+        :return: list of ingredients in order of names without duplicates
+        """
+        ingredients = {ingredient.name: ingredient for ingredient in self.find_by_names(names)}
+        for name in names:
+            if name not in ingredients:
+                ingredients[name] = self.create(Ingredient(name=name, quantity=0))
+        return [ingredients[name] for name in dict.fromkeys(names)]
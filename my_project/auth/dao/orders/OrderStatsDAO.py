@@ -0,0 +1,129 @@
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import case, event, func, inspect, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from my_project import db
+from my_project.auth.dao.general_dao import GeneralDAO, old_values, upsert_statement
+from my_project.auth.domain.orders.DeliveryStatus import CANCELLED_ORDER_STATUS, DeliveryStatus
+from my_project.auth.domain.orders.Orders import Order
+from my_project.auth.domain.orders.OrderStats import OrderStats
+
+# Order attributes the summary depends on
+_TRACKED = ("Delivery_Statusid", "Total_Price")
+
+class OrderStatsDAO(GeneralDAO):
+    _domain_type = OrderStats
+
+    def find_summary(self) -> List[Tuple[str, int, Decimal]]:
+        """
+        Gets number of orders and revenue per delivery status from the summary rows.
+        :return: list of (status, order count, revenue), cancelled orders are counted without revenue
+        """
+        return (self._session.query(DeliveryStatus.status, OrderStats.order_count, OrderStats.revenue)
+                .join(OrderStats.delivery_status)
+                .filter(OrderStats.order_count > 0)
+                .all())
+
+    def rebuild(self) -> None:
+        """
+        Recomputes the summary rows from Orders in one transaction.
+        """
+        try:
+            self._session.query(OrderStats).delete()
+            self._session.execute(insert(OrderStats.__table__).from_select(
+                ["Delivery_Statusid", "order_count", "revenue"],
+                select(Order.Delivery_Statusid,
+                       func.count(Order.id),
+                       func.coalesce(func.sum(order_revenue()), 0))
+                .group_by(Order.Delivery_Statusid),
+            ))
+            self._session.commit()
+        except Exception:
+            self._session.rollback()
+            raise
+        self._after_write()
+
+    def rebuild_if_empty(self) -> None:
+        """
+        Builds the summary rows when they are missing while there are orders (first start, restored dump).
+        """
+        if not self.count() and self._session.query(Order.id).first() is not None:
+            self.rebuild()
+
+
+def order_revenue():
+    """
+    Builds the revenue of an order for SQL aggregates: its Total_Price, 0 if it is cancelled.
+    :return: SQL expression over Orders
+    """
+    cancelled_id = (select(DeliveryStatus.id)
+                    .where(DeliveryStatus.status == CANCELLED_ORDER_STATUS)
+                    .scalar_subquery())
+    return case((Order.Delivery_Statusid == cancelled_id, 0), else_=Order.Total_Price)
+
+
+def _apply_deltas(connection: Connection, deltas: Dict[int, List]) -> None:
+    """
+    Adds deltas to the summary rows, creating missing rows in the same atomic upsert,
+    so concurrent first orders of a status do not fail on the primary key.
+    :param connection: connection of the flushing session
+    :param deltas: change of [order count, revenue] per delivery status
+    """
+    rows = [{"Delivery_Statusid": status_id, "order_count": order_count, "revenue": revenue}
+            for status_id, (order_count, revenue) in sorted(deltas.items()) if order_count or revenue]
+    if rows:
+        statement = upsert_statement(connection.dialect.name, OrderStats.__table__,
+                                     ("Delivery_Statusid", "order_count", "revenue"), increment=True)
+        connection.execute(statement, rows)
+
+
+@event.listens_for(db.session, "before_flush")
+def _track_order_stats(session: Session, flush_context, instances) -> None:
+    """
+    Adds the changes of orders in this flush to Order_Stats within the same transaction.
+    Cancelled orders are counted in their status without revenue.
+    Core bulk statements (GeneralDAO.create_all/delete_all) are not seen here,
+    OrdersDAO rebuilds the summary after them.
+    """
+    deltas: Dict[int, List] = defaultdict(lambda: [0, Decimal(0)])
+    cancelled: Dict[str, Optional[int]] = {}
+
+    def is_cancelled(status_id: int) -> bool:
+        if "id" not in cancelled:
+            cancelled["id"] = session.execute(
+                select(DeliveryStatus.id).where(DeliveryStatus.status == CANCELLED_ORDER_STATUS)
+            ).scalar()
+        return status_id == cancelled["id"]
+
+    def add(status_id, count: int, price) -> None:
+        if status_id is None:
+            return
+        deltas[status_id][0] += count
+        if not is_cancelled(status_id):
+            deltas[status_id][1] += count * Decimal(str(price or 0))
+
+    with session.no_autoflush:
+        for obj in session.new:
+            if isinstance(obj, Order):
+                add(obj.Delivery_Statusid, 1, obj.Total_Price)
+        for obj in session.deleted:
+            if isinstance(obj, Order):
+                old_status_id, old_price = old_values(session, obj, _TRACKED)
+                add(old_status_id, -1, old_price)
+        for obj in session.dirty:
+            if not isinstance(obj, Order) or obj in session.deleted:
+                continue
+            state = inspect(obj)
+            if not (state.attrs.Delivery_Statusid.history.has_changes()
+                    or state.attrs.Total_Price.history.has_changes()):
+                continue
+            old_status_id, old_price = old_values(session, obj, _TRACKED)
+            add(old_status_id, -1, old_price)
+            add(obj.Delivery_Statusid, 1, obj.Total_Price)
+
+    if deltas:
+        _apply_deltas(session.connection(), deltas)
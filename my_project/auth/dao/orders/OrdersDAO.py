@@ -1,17 +1,101 @@
-from typing import List, Optional
-from my_project.auth.dao.general_dao import GeneralDAO
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from my_project.auth.dao.general_dao import GeneralDAO, DTO_PROFILE, BULK_CHUNK_SIZE
+from my_project.auth.dao.orders.OrderStatsDAO import OrderStatsDAO
+from my_project.auth.dao.orders.PizzaStatsDAO import PizzaStatsDAO
+from my_project.auth.domain.orders.DeliveryStatus import DeliveryStatus
 from my_project.auth.domain.orders.Orders import Order
-from sqlalchemy.orm import joinedload
+from my_project.auth.domain.orders.PaymentStatus import PaymentStatus
+from my_project.auth.domain.orders.Pizza import Pizza
+from my_project.auth.domain.orders.PizzaOrder import PizzaOrder
+from my_project.auth.domain.orders.Users import Users
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import joinedload, selectinload
+
+# Loader profile of the /api/v1 order representation: user, status and ordered pizzas
+API_PROFILE = "api"
 
 class OrdersDAO(GeneralDAO):
     _domain_type = Order
+    _relationship_fields = {
+        "user": joinedload(Order.user),
+        "payment_status": joinedload(Order.payment_status),
+        "delivery_status": joinedload(Order.delivery_status),
+    }
+    _loader_profiles = {
+        DTO_PROFILE: tuple(_relationship_fields.values()),
+        API_PROFILE: (
+            joinedload(Order.user),
+            joinedload(Order.delivery_status),
+            selectinload(Order.pizza_orders).joinedload(PizzaOrder.pizza).selectinload(Pizza.ingredients),
+        ),
+    }
+    _dto_tables = (Users.__tablename__, PaymentStatus.__tablename__, DeliveryStatus.__tablename__)
+    # userid and Delivery_Statusid lead composite indexes with Created_AT, see Order.__table_args__
+    _query_fields = ("userid", "Payment_Statusid", "Delivery_Statusid", "Created_AT")
+
+    def create_all(self, rows: Iterable[Dict[str, object]], chunk_size: int = BULK_CHUNK_SIZE,
+                   upsert: bool = False) -> List[Dict[str, object]]:
+        """
+        Inserts rows in chunks and rebuilds Order_Stats and Pizza_Stats, which the Core INSERTs bypass.
+        """
+        try:
+            return super().create_all(rows, chunk_size, upsert)
+        finally:
+            OrderStatsDAO().rebuild()
+            PizzaStatsDAO().rebuild()
+
+    def delete_all(self) -> None:
+        """
+        Deletes all orders and rebuilds Order_Stats and Pizza_Stats, which the bulk DELETE bypasses.
+        """
+        super().delete_all()
+        OrderStatsDAO().rebuild()
+        PizzaStatsDAO().rebuild()
 
-    def create(self, order: Order) -> None:
+    def create_with_pizzas(self, order: Order, pizza_orders: List[PizzaOrder]) -> Order:
+        """
+        Creates order with its pizza lines in one transaction.
+        The order id comes from the autoincrement column when the order is flushed,
+        so concurrent requests never share or reuse ids.
+        :param order: new order
+        :param pizza_orders: new pizza lines of the order
+        :return: created order
+        """
+        order.pizza_orders = pizza_orders
         self._session.add(order)
-        self._session.commit()
+        try:
+            self._session.commit()
+        except Exception:
+            self._session.rollback()
+            raise
+        self._after_write(PizzaOrder.__tablename__)
+        return order
 
-    def find_all(self) -> List[Order]:
-        return self._session.query(Order).options(joinedload(Order.user)).all()
+    def find_by_user_id(self, user_id: int, profile: Optional[str] = None) -> List[Order]:
+        """
+        Gets orders of user.
+        :param user_id: integer key of user
+        :param profile: loader profile name
+        :return: list of orders
+        """
+        return self._query(profile).filter(Order.userid == user_id).order_by(Order.id).all()
 
-    def find_by_id(self, order_id: int) -> Optional[Order]:
-        return self._session.query(Order).filter(Order.id == order_id).first()
+    def find_recent(self, limit: int, before: Optional[datetime] = None, before_id: Optional[int] = None,
+                    profile: Optional[str] = None) -> List[Order]:
+        """
+        Gets the latest orders walking the Created_AT index backwards (keyset pagination).
+        :param limit: maximal number of orders
+        :param before: only orders created before this time
+        :param before_id: with before, also orders created exactly at before with smaller id
+        :param profile: loader profile name
+        :return: list of orders, the newest first
+        """
+        query = self._query(profile)
+        if before is not None:
+            condition = Order.Created_AT < before
+            if before_id is not None:
+                condition = or_(condition, and_(Order.Created_AT == before, Order.id < before_id))
+            query = query.filter(condition)
+        return query.order_by(Order.Created_AT.desc(), Order.id.desc()).limit(limit).all()
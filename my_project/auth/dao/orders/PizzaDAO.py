@@ -1,16 +1,69 @@
+from decimal import Decimal
 from typing import List, Optional
-from my_project.auth.dao.general_dao import GeneralDAO
+from sqlalchemy.orm import selectinload
+
+from my_project.auth.dao.cache import CatalogCache
+from my_project.auth.dao.general_dao import GeneralDAO, DTO_PROFILE
+from my_project.auth.domain.orders.Ingredients import Ingredient
 from my_project.auth.domain.orders.Pizza import Pizza
+from my_project.auth.domain.orders.PizzaIngredients import PizzaIngredient
 
 class PizzaDAO(GeneralDAO):
     _domain_type = Pizza
+    _relationship_fields = {"ingredients": selectinload(Pizza.ingredients)}
+    _loader_profiles = {
+        DTO_PROFILE: tuple(_relationship_fields.values()),
+    }
+    # DTO of pizza embeds its ingredients
+    _dto_tables = (Ingredient.__tablename__, PizzaIngredient.__tablename__)
+    _cache = CatalogCache("pizza", (Pizza.__tablename__,) + _dto_tables)
+    _query_fields = ("name", "price")
+
+    def find_by_name(self, name: str) -> List[Pizza]:
+        """
+        Gets pizzas with exactly this name through the name index.
+        :param name: pizza name
+        :return: list of pizzas with ingredients loaded
+        """
+        def load(query):
+            return query.filter(Pizza.name == name).order_by(Pizza.id).all()
+
+        return [self._attach(pizza) for pizza in self._cached(("name", name), load)]
 
-    def create(self, pizza: Pizza) -> None:
-        self._session.add(pizza)
-        self._session.commit()
+    def find_by_price(self, min_price: Optional[Decimal], max_price: Optional[Decimal], limit: int) -> List[Pizza]:
+        """
+        Gets the cheapest pizzas in price range, read in price order from the price index.
+        Without bounds pizzas without price come first.
+        :param min_price: lowest price (inclusive) or None
+        :param max_price: highest price (inclusive) or None
+        :param limit: maximal number of pizzas
+        :return: list of pizzas with ingredients loaded
+        """
+        def load(query):
+            if min_price is not None:
+                query = query.filter(Pizza.price >= min_price)
+            if max_price is not None:
+                query = query.filter(Pizza.price <= max_price)
+            return query.order_by(Pizza.price, Pizza.id).limit(limit).all()
 
-    def find_all(self) -> List[Pizza]:
-        return self._session.query(Pizza).all()
+        key = ("price", str(min_price), str(max_price), limit)
+        return [self._attach(pizza) for pizza in self._cached(key, load)]
 
-    def find_by_id(self, pizza_id: int) -> Optional[Pizza]:
-        return self._session.query(Pizza).filter(Pizza.id == pizza_id).first()
\ No newline at end of file
+    def set_ingredients(self, key: int, ingredients: List[Ingredient]) -> Optional[Pizza]:
+        """
+        Replaces ingredients of pizza.
+        :param key: integer key (surrogate primary key)
+        :param ingredients: persistent ingredients
+        :return: updated pizza or None if there is no pizza with such key
+        """
+        pizza = self._query(DTO_PROFILE).get(key)
+        if pizza is None:
+            return None
+        pizza.ingredients = ingredients
+        try:
+            self._session.commit()
+        except Exception:
+            self._session.rollback()
+            raise
+        self._after_write()
+        return pizza
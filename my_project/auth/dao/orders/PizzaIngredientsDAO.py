@@ -1,19 +1,29 @@
-from typing import List, Optional, Dict
+from typing import Iterator, List, Optional, Dict, Sequence, Tuple
 
 from sqlalchemy.orm import joinedload
 
-from my_project.auth.dao.general_dao import GeneralDAO
+from my_project.auth.dao.general_dao import GeneralDAO, DTO_PROFILE
+from my_project.auth.domain.orders.Ingredients import Ingredient
+from my_project.auth.domain.orders.Pizza import Pizza
 from my_project.auth.domain.orders.PizzaIngredients import PizzaIngredient
 
+# Профіль для find_*_with_details: піца без списку інгредієнтів
+DETAILS_PROFILE = "details"
+
 class PizzaIngredientsDAO(GeneralDAO):
     _domain_type = PizzaIngredient
-
-    def create(self, pizza_ingredient: PizzaIngredient) -> None:
-        self._session.add(pizza_ingredient)
-        self._session.commit()
-
-    def find_all(self) -> List[PizzaIngredient]:
-        return self._session.query(PizzaIngredient).all()
+    _relationship_fields = {
+        "pizza": joinedload(PizzaIngredient.pizza).selectinload(Pizza.ingredients),
+        "ingredient": joinedload(PizzaIngredient.ingredient),
+    }
+    _loader_profiles = {
+        DTO_PROFILE: tuple(_relationship_fields.values()),
+        DETAILS_PROFILE: (
+            joinedload(PizzaIngredient.pizza),
+            joinedload(PizzaIngredient.ingredient),
+        ),
+    }
+    _dto_tables = (Pizza.__tablename__, Ingredient.__tablename__)
 
     def find_by_pizza_id(self, pizza_id: int) -> List[PizzaIngredient]:
         return self._session.query(PizzaIngredient).filter(PizzaIngredient.pizza_id == pizza_id).all()
@@ -22,28 +32,36 @@ class PizzaIngredientsDAO(GeneralDAO):
         """
         Повертає список записів PizzaIngredients з розгорнутими даними про піцу та інгредієнти.
         """
-        query = (
-            self._session.query(PizzaIngredient)
-            .options(joinedload(PizzaIngredient.pizza), joinedload(PizzaIngredient.ingredient))
-        )
-        result = []
-
-        for record in query.all():
-            result.append({
-                "pizza_ingredient": {
-                    "pizza_id": record.pizza_id,
-                    "ingredient_id": record.ingredient_id
-                },
-                "pizza": {
-                    "id": record.pizza.id,
-                    "name": record.pizza.name,
-                    "quantity": record.pizza.quantity
-                },
-                "ingredient": {
-                    "ingredient_id": record.ingredient.ingredient_id,
-                    "name": record.ingredient.name,
-                    "quantity": record.ingredient.quantity
-                }
-            })
-
-        return result
\ No newline at end of file
+        return [self._put_details_into_dto(record) for record in self._query(DETAILS_PROFILE).all()]
+
+    def find_page_with_details(self, limit: int, after: Optional[Sequence[object]] = None) -> Tuple[List[Dict], Optional[list]]:
+        """
+        Повертає сторінку записів PizzaIngredients з розгорнутими даними (keyset-пагінація за первинним ключем).
+        """
+        records, next_key = self._page(self._query(DETAILS_PROFILE), limit, after)
+        return [self._put_details_into_dto(record) for record in records], next_key
+
+    def iter_all_with_details(self) -> Iterator[Dict]:
+        """
+        Повертає всі записи PizzaIngredients з розгорнутими даними, читаючи їх курсором на сервері пакетами.
+        """
+        return (self._put_details_into_dto(record) for record in self.iter_all(profile=DETAILS_PROFILE))
+
+    @staticmethod
+    def _put_details_into_dto(record: PizzaIngredient) -> Dict:
+        return {
+            "pizza_ingredient": {
+                "pizza_id": record.pizza_id,
+                "ingredient_id": record.ingredient_id
+            },
+            "pizza": {
+                "id": record.pizza.id,
+                "name": record.pizza.name,
+                "quantity": record.pizza.quantity
+            },
+            "ingredient": {
+                "ingredient_id": record.ingredient.ingredient_id,
+                "name": record.ingredient.name,
+                "quantity": record.ingredient.quantity
+            }
+        }
@@ -1,16 +1,25 @@
-from typing import List, Optional
-from my_project.auth.dao.general_dao import GeneralDAO
+from typing import Dict, Iterable, List
+from my_project.auth.dao.general_dao import GeneralDAO, BULK_CHUNK_SIZE
+from my_project.auth.dao.orders.PizzaStatsDAO import PizzaStatsDAO
 from my_project.auth.domain.orders.PizzaOrder import PizzaOrder
 
 class PizzaOrderDAO(GeneralDAO):
     _domain_type = PizzaOrder
+    _query_fields = ("order_id", "pizza_id")
 
-    def create(self, pizza_order: PizzaOrder) -> None:
-        self._session.add(pizza_order)
-        self._session.commit()
+    def create_all(self, rows: Iterable[Dict[str, object]], chunk_size: int = BULK_CHUNK_SIZE,
+                   upsert: bool = False) -> List[Dict[str, object]]:
+        """
+        Inserts rows in chunks and rebuilds Pizza_Stats, which the Core INSERTs bypass.
+        """
+        try:
+            return super().create_all(rows, chunk_size, upsert)
+        finally:
+            PizzaStatsDAO().rebuild()
 
-    def find_all(self) -> List[PizzaOrder]:
-        return self._session.query(PizzaOrder).all()
-
-    def find_by_id(self, pizza_order_id: int) -> Optional[PizzaOrder]:
-        return self._session.query(PizzaOrder).filter(PizzaOrder.id == pizza_order_id).first()
+    def delete_all(self) -> None:
+        """
+        Deletes all pizza lines and rebuilds Pizza_Stats, which the bulk DELETE bypasses.
+        """
+        super().delete_all()
+        PizzaStatsDAO().rebuild()
@@ -0,0 +1,260 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, event, func, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.sql.functions import GenericFunction
+
+from my_project import db
+from my_project.auth.dao.general_dao import GeneralDAO, old_values, upsert_statement
+from my_project.auth.domain.orders.DeliveryStatus import CANCELLED_ORDER_STATUS, DeliveryStatus
+from my_project.auth.domain.orders.Orders import Order
+from my_project.auth.domain.orders.Pizza import Pizza
+from my_project.auth.domain.orders.PizzaOrder import PizzaOrder
+from my_project.auth.domain.orders.PizzaPopularity import PizzaPopularity
+from my_project.auth.domain.orders.PizzaStats import PizzaStats
+
+# Hourly buckets older than the longest popularity window are dropped
+POPULARITY_RETENTION = timedelta(weeks=1)
+# Start of the retention when this process last dropped expired buckets
+_purged_before: Optional[datetime] = None
+
+
+class hour_floor(GenericFunction):
+    """
+    Truncates datetime to the start of its hour.
+    """
+    type = db.DateTime()
+    inherit_cache = True
+
+
+@compiles(hour_floor)
+def _hour_floor(element, compiler, **kw) -> str:
+    return "date_trunc('hour', %s)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(hour_floor, "mysql")
+def _hour_floor_mysql(element, compiler, **kw) -> str:
+    return "DATE_FORMAT(%s, '%%%%Y-%%%%m-%%%%d %%%%H:00:00')" % compiler.process(element.clauses, **kw)
+
+
+@compiles(hour_floor, "sqlite")
+def _hour_floor_sqlite(element, compiler, **kw) -> str:
+    # same text format as SQLAlchemy stores DateTime values in SQLite
+    return "strftime('%%Y-%%m-%%d %%H:00:00.000000', %s)" % compiler.process(element.clauses, **kw)
+
+
+def hour_of(moment: datetime) -> datetime:
+    """
+    Gets the hourly bucket of moment.
+    :param moment: creation time of order
+    :return: start of the hour
+    """
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def database_now(connection: Connection) -> datetime:
+    """
+    Reads the clock of the database, the one Created_AT defaults (db.func.now()) are taken from.
+    :param connection: database connection or session
+    :return: current time of the database
+    """
+    return connection.execute(select(func.now())).scalar()
+
+
+def retention_start(now: datetime) -> datetime:
+    """
+    Gets the oldest hourly bucket that is kept.
+    :param now: current time of the database
+    :return: start of the hour
+    """
+    return hour_of(now - POPULARITY_RETENTION)
+
+
+class PizzaStatsDAO(GeneralDAO):
+    _domain_type = PizzaStats
+
+    def find_popular(self, limit: int, since: Optional[datetime] = None) -> List[Tuple[Pizza, int]]:
+        """
+        Gets pizzas ordered the most times from the maintained counters.
+        :param limit: maximal number of pizzas
+        :param since: count only orders created in the hours starting at or after this time
+        :return: list of (pizza with ingredients, number of ordered lines), the most popular first
+        """
+        if since is None:
+            ranking = (select(PizzaStats.pizza_id, PizzaStats.order_count)
+                       .where(PizzaStats.order_count > 0)
+                       .order_by(PizzaStats.order_count.desc(), PizzaStats.pizza_id))
+        else:
+            order_count = func.sum(PizzaPopularity.order_count).label("order_count")
+            ranking = (select(PizzaPopularity.pizza_id, order_count)
+                       .where(PizzaPopularity.hour >= hour_of(since))
+                       .group_by(PizzaPopularity.pizza_id)
+                       .having(order_count > 0)
+                       .order_by(order_count.desc(), PizzaPopularity.pizza_id))
+        ranking = ranking.limit(limit).subquery()
+        return (self._session.query(Pizza, ranking.c.order_count)
+                .options(selectinload(Pizza.ingredients))
+                .join(ranking, ranking.c.pizza_id == Pizza.id)
+                .order_by(ranking.c.order_count.desc(), Pizza.id)
+                .all())
+
+    def rebuild(self) -> None:
+        """
+        Recomputes the counters and the recent hourly buckets from Pizza_Order in one transaction.
+        """
+        cancelled_ids = select(DeliveryStatus.id).where(DeliveryStatus.status == CANCELLED_ORDER_STATUS)
+        lines = (select(PizzaOrder.pizza_id, Order.Created_AT)
+                 .join(Order, Order.id == PizzaOrder.order_id)
+                 .where(Order.Delivery_Statusid.not_in(cancelled_ids))
+                 .subquery())
+        hour = hour_floor(lines.c.Created_AT)
+        try:
+            self._session.execute(delete(PizzaStats.__table__))
+            self._session.execute(delete(PizzaPopularity.__table__))
+            self._session.execute(insert(PizzaStats.__table__).from_select(
+                ["pizza_id", "order_count"],
+                select(lines.c.pizza_id, func.count()).group_by(lines.c.pizza_id),
+            ))
+            self._session.execute(insert(PizzaPopularity.__table__).from_select(
+                ["pizza_id", "hour", "order_count"],
+                select(lines.c.pizza_id, hour, func.count())
+                .where(lines.c.Created_AT >= retention_start(database_now(self._session)))
+                .group_by(lines.c.pizza_id, hour),
+            ))
+            self._session.commit()
+        except Exception:
+            self._session.rollback()
+            raise
+        self._after_write(PizzaPopularity.__tablename__)
+
+    def rebuild_if_empty(self) -> None:
+        """
+        Builds the counters when they are missing while there are ordered pizzas (first start, restored dump).
+        """
+        if not self.count() and self._session.query(PizzaOrder.id).filter(PizzaOrder.order_id.isnot(None)).first():
+            self.rebuild()
+
+
+def _apply_deltas(connection: Connection, deltas: Dict[Tuple[int, Optional[datetime]], int], now: datetime) -> None:
+    """
+    Adds deltas to the counters and the hourly buckets, creating missing rows in the same atomic upsert,
+    so concurrent orders of a new pizza or hour do not fail on the primary key.
+    :param connection: connection of the flushing session
+    :param deltas: change of the line count per pizza and hour (None for orders without Created_AT)
+    :param now: current time of the database
+    """
+    global _purged_before
+    oldest_hour = retention_start(now)
+    totals: Dict[int, int] = defaultdict(int)
+    buckets = []
+    for (pizza_id, hour), order_count in deltas.items():
+        totals[pizza_id] += order_count
+        if order_count and hour is not None and hour >= oldest_hour:
+            buckets.append({"pizza_id": pizza_id, "hour": hour, "order_count": order_count})
+    stats = [{"pizza_id": pizza_id, "order_count": order_count}
+             for pizza_id, order_count in totals.items() if order_count]
+    dialect = connection.dialect.name
+    # rows are locked in key order, concurrent flushes can not deadlock on each other
+    if buckets:
+        buckets.sort(key=lambda row: (row["pizza_id"], row["hour"]))
+        connection.execute(upsert_statement(dialect, PizzaPopularity.__table__, ("pizza_id", "hour", "order_count"),
+                                            increment=True), buckets)
+    if stats:
+        stats.sort(key=lambda row: row["pizza_id"])
+        connection.execute(upsert_statement(dialect, PizzaStats.__table__, ("pizza_id", "order_count"),
+                                            increment=True), stats)
+    if _purged_before is None or _purged_before < oldest_hour:
+        # once an hour per process is enough, the expired buckets are not read anyway
+        connection.execute(delete(PizzaPopularity.__table__).where(PizzaPopularity.hour < oldest_hour))
+        _purged_before = oldest_hour
+
+
+@event.listens_for(db.session, "before_flush")
+def _track_pizza_stats(session: Session, flush_context, instances) -> None:
+    """
+    Adds ordered lines of this flush to Pizza_Stats and Pizza_Popularity within the same transaction.
+    A line counts while it belongs to an order that is not cancelled, in the hour the order was created.
+    Core bulk statements (GeneralDAO.create_all/delete_all) are not seen here,
+    OrdersDAO and PizzaOrderDAO rebuild the counters after them.
+    """
+    lines = [obj for obj in session.new | session.deleted | session.dirty if isinstance(obj, PizzaOrder)]
+    orders = [obj for obj in session.dirty | session.deleted if isinstance(obj, Order)]
+    if not lines and not orders:
+        return
+
+    deltas: Dict[Tuple[int, Optional[datetime]], int] = defaultdict(int)
+    cancelled: Dict[str, Optional[int]] = {}
+    clock: Dict[str, datetime] = {}
+
+    def now() -> datetime:
+        if "now" not in clock:
+            clock["now"] = database_now(session)
+        return clock["now"]
+
+    def is_cancelled(status_id: Optional[int]) -> bool:
+        if "id" not in cancelled:
+            cancelled["id"] = session.execute(
+                select(DeliveryStatus.id).where(DeliveryStatus.status == CANCELLED_ORDER_STATUS)
+            ).scalar()
+        return status_id == cancelled["id"]
+
+    def bucket_of(order: Order) -> Optional[datetime]:
+        if order.Created_AT is None and order in session.new:
+            # sets the column default now, the bucket is the hour the order is stored with (as rebuild reads it)
+            order.Created_AT = now()
+        return hour_of(order.Created_AT) if order.Created_AT is not None else None
+
+    def add(pizza_id: Optional[int], order: Optional[Order], status_id: Optional[int], count: int) -> None:
+        if pizza_id is None or order is None or is_cancelled(status_id):
+            return
+        deltas[(pizza_id, bucket_of(order))] += count
+
+    def order_of(line: PizzaOrder, order_id: Optional[int]) -> Optional[Order]:
+        if line.order is not None and line.order.id in (order_id, None):
+            return line.order
+        return session.get(Order, order_id) if order_id is not None else None
+
+    with session.no_autoflush:
+        for obj in session.new:
+            if isinstance(obj, PizzaOrder):
+                order = order_of(obj, obj.order_id)
+                add(obj.pizza_id, order, order and order.Delivery_Statusid, 1)
+        for obj in session.deleted:
+            if isinstance(obj, PizzaOrder):
+                pizza_id, order_id = old_values(session, obj, ("pizza_id", "order_id"))
+                order = session.get(Order, order_id) if order_id is not None else None
+                add(pizza_id, order, order and order.Delivery_Statusid, -1)
+            elif isinstance(obj, Order):
+                # its lines stay without order
+                status_id, = old_values(session, obj, ("Delivery_Statusid",))
+                for line in obj.pizza_orders:
+                    if line not in session.new and line not in session.deleted:
+                        add(line.pizza_id, obj, status_id, -1)
+        for obj in session.dirty:
+            if obj in session.deleted:
+                continue
+            if isinstance(obj, PizzaOrder):
+                pizza_id, order_id = old_values(session, obj, ("pizza_id", "order_id"))
+                if (pizza_id, order_id) == (obj.pizza_id, obj.order_id):
+                    continue
+                order = session.get(Order, order_id) if order_id is not None else None
+                add(pizza_id, order, order and order.Delivery_Statusid, -1)
+                order = order_of(obj, obj.order_id)
+                add(obj.pizza_id, order, order and order.Delivery_Statusid, 1)
+            elif isinstance(obj, Order):
+                status_id, = old_values(session, obj, ("Delivery_Statusid",))
+                if is_cancelled(status_id) == is_cancelled(obj.Delivery_Statusid):
+                    continue
+                count = -1 if is_cancelled(obj.Delivery_Statusid) else 1
+                for line in obj.pizza_orders:
+                    if line not in session.new and line not in session.deleted:
+                        # dirty lines are counted with their own order above
+                        if line not in session.dirty or old_values(session, line, ("order_id",))[0] == obj.id:
+                            deltas[(line.pizza_id, bucket_of(obj))] += count
+
+    if deltas:
+        _apply_deltas(session.connection(), deltas, now())
@@ -1,16 +1,55 @@
-from typing import List, Optional
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional, Tuple
+from sqlalchemy import func
+
 from my_project.auth.dao.general_dao import GeneralDAO
+from my_project.auth.dao.orders.OrderStatsDAO import order_revenue
+from my_project.auth.domain.orders.Orders import Order
 from my_project.auth.domain.orders.Users import Users
 
 class UsersDAO(GeneralDAO):
     _domain_type = Users
+    _hidden_fields = ("password_hash",)
+    # Credentials of the /api/v1 login, set only by registration, and the admin flag
+    _readonly_fields = ("username", "password_hash", "is_admin")
+    _query_fields = ("username",)
 
-    def create(self, user: Users) -> None:
-        self._session.add(user)
-        self._session.commit()
+    def find_by_username(self, username: str) -> Optional[Users]:
+        """
+        Gets user by login of the /api/v1 API.
+        :param username: unique username
+        :return: user or None
+        """
+        return self._session.query(Users).filter(Users.username == username).first()
 
-    def find_all(self) -> List[Users]:
-        return self._session.query(Users).all()
+    def grant_admin(self, user: Users) -> None:
+        """
+        Gives user admin rights, which the generic write paths can not.
+        :param user: user of this session
+        """
+        user.is_admin = True
+        self._session.commit()
+        self._after_write()
 
-    def find_by_id(self, user_id: int) -> Optional[Users]:
-        return self._session.query(Users).filter(Users.id == user_id).first()
+    def find_active(self, limit: int, since: Optional[datetime] = None) -> List[Tuple[Users, int, Decimal]]:
+        """
+        Gets the top users by number of orders with their total spent (cancelled orders cost nothing).
+        Orders are aggregated in one GROUP BY over Orders and only the top rows are joined with Users.
+        :param limit: number of users
+        :param since: count only orders created at or after this time
+        :return: list of (user, order count, total spent), the most active first
+        """
+        order_count = func.count(Order.id).label("order_count")
+        total_spent = func.coalesce(func.sum(order_revenue()), 0).label("total_spent")
+        ranking = self._session.query(Order.userid.label("userid"), order_count, total_spent)
+        if since is not None:
+            ranking = ranking.filter(Order.Created_AT >= since)
+        ranking = (ranking.group_by(Order.userid)
+                   .order_by(order_count.desc(), Order.userid)
+                   .limit(limit)
+                   .subquery())
+        return (self._session.query(Users, ranking.c.order_count, ranking.c.total_spent)
+                .join(ranking, ranking.c.userid == Users.id)
+                .order_by(ranking.c.order_count.desc(), Users.id)
+                .all())
@@ -0,0 +1,96 @@
+"""
+Connection pool with checkout metrics.
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool, QueuePool
+
+
+class PoolMetrics:
+    """
+    Counters of connection checkouts of a pool.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, seconds: float, timed_out: bool = False) -> None:
+        """
+        Accounts one checkout.
+        :param seconds: time the caller waited for the connection
+        :param timed_out: the pool was exhausted for the whole pool_timeout
+        """
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += timed_out
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Gets counters.
+        :return: statistics DTO
+        """
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_total_seconds": round(self.wait_total, 6),
+                "wait_avg_seconds": round(self.wait_total / self.checkouts, 6) if self.checkouts else None,
+                "wait_max_seconds": round(self.wait_max, 6),
+            }
+
+
+class MeteredQueuePool(QueuePool):
+    """
+    QueuePool that measures how long callers wait for a connection
+    (including opening a new one and pre-ping).
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - started)
+        return connection
+
+    def recreate(self) -> "MeteredQueuePool":
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def pool_stats(pool: Pool) -> Dict[str, Any]:
+    """
+    Gets current state and checkout metrics of pool.
+    :param pool: engine pool
+    :return: statistics DTO
+    """
+    stats: Dict[str, Any] = {"pool": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+            "checked_in": pool.checkedin(),
+            "in_use": pool.checkedout(),
+            "overflow": pool.overflow(),
+        })
+    if isinstance(pool, MeteredQueuePool):
+        stats.update(pool.metrics.stats())
+    return stats
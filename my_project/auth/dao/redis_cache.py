@@ -0,0 +1,204 @@
+"""
+Optional Redis cache of serialized DTOs shared by all worker processes.
+
+Entries are keyed by table, primary key and the versions of the tables the DTO is read from.
+A write increments the version of its table in Redis and announces it over pub/sub, so every
+process stops using old entries and drops its local catalog caches of that table.
+Without REDIS_URL the cache is disabled and every read goes to the database,
+and the redis package is not even imported.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from my_project.auth.dao.cache import invalidate_table
+from my_project.json_provider import dumps_bytes, loads
+
+REDIS_URL = "REDIS_URL"
+DTO_CACHE_TTL = 3600
+# Versions are re-read from Redis at least this often in case a pub/sub message was lost
+VERSION_TTL = 5.0
+INVALIDATION_CHANNEL = "dto:invalidate"
+
+logger = logging.getLogger(__name__)
+
+
+class DtoCache:
+    """
+    Redis-backed cache of put_into_dto() output with cross-process invalidation.
+    """
+
+    def __init__(self) -> None:
+        self._client = None
+        self._listener = None
+        self._versions: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        # Lets a process ignore its own invalidation messages
+        self._origin = uuid.uuid4().hex
+        # redis.RedisError once a client is set; catches nothing while the cache is disabled
+        self._errors: Tuple[type, ...] = ()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._client is not None
+
+    def init_app(self, app) -> None:
+        """
+        Connects to REDIS_URL of the app config or of the environment, disables the cache if it is not set.
+        :param app: Flask application object
+        """
+        url = app.config.get(REDIS_URL) or os.getenv(REDIS_URL)
+        if not url:
+            self.init_client(None)
+            return
+        try:
+            import redis
+        except ImportError:
+            logger.warning("%s is set but redis package is not installed, DTO cache is disabled", REDIS_URL)
+            self.init_client(None)
+            return
+        self.init_client(redis.Redis.from_url(url))
+
+    def init_client(self, client) -> None:
+        """
+        Uses client (redis.Redis compatible, e.g. fakeredis) and subscribes to invalidations.
+        :param client: Redis client or None to disable the cache
+        """
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        with self._lock:
+            self._versions.clear()
+        self._client = client
+        if client is None:
+            return
+        from redis import RedisError
+        self._errors = (RedisError,)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{INVALIDATION_CHANNEL: self._on_invalidation})
+        self._listener = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def get_or_load(self, table: str, key: object, tables: Iterable[str],
+                    load: Callable[[], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """
+        Gets DTO of object from Redis or calls load and stores its result.
+        :param table: table of the object
+        :param key: primary key of the object
+        :param tables: all tables the DTO is read from
+        :param load: function reading the DTO from database, returns None if there is no object
+        :return: DTO or None
+        """
+        if self._client is None:
+            return load()
+        try:
+            versions = [self.version(name) for name in tables]
+            cache_key = f"dto:{table}:{key}:{'.'.join(map(str, versions))}"
+            cached = self._client.get(cache_key)
+        except self._errors:
+            self.errors += 1
+            return load()
+        if cached is not None:
+            self.hits += 1
+            return loads(cached)
+
+        self.misses += 1
+        dto = load()
+        if dto is not None:
+            try:
+                self._client.set(cache_key, dumps_bytes(dto), ex=DTO_CACHE_TTL)
+            except self._errors:
+                self.errors += 1
+        return dto
+
+    def version(self, table: str) -> int:
+        """
+        Gets the current version of table (0 when the cache is disabled).
+        :param table: table name
+        :return: version number
+        """
+        if self._client is None:
+            return 0
+        now = time.monotonic()
+        with self._lock:
+            known = self._versions.get(table)
+        if known is not None and known[1] > now:
+            return known[0]
+        version = int(self._client.get(f"dto:version:{table}") or 0)
+        self._set_version(table, version)
+        return version
+
+    def versions(self, tables: Iterable[str]) -> Optional[List[str]]:
+        """
+        Gets versions of tables shared by all processes.
+        Without Redis there are none: a write in one worker process is not seen by the others.
+        :param tables: table names
+        :return: version strings or None if Redis is not configured or not reachable
+        """
+        if self._client is None:
+            return None
+        try:
+            return [str(self.version(table)) for table in tables]
+        except self._errors:
+            self.errors += 1
+            return None
+
+    def invalidate(self, table: str) -> None:
+        """
+        Makes all cached DTOs read from table stale in every process.
+        :param table: table name
+        """
+        if self._client is None:
+            return
+        try:
+            version = self._client.incr(f"dto:version:{table}")
+            self._set_version(table, version)
+            self._client.publish(INVALIDATION_CHANNEL, json.dumps({
+                "table": table,
+                "version": version,
+                "origin": self._origin,
+            }))
+        except self._errors:
+            self.errors += 1
+            logger.exception("Could not invalidate DTO cache of %s", table)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Gets counters of the cache.
+        :return: statistics DTO
+        """
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+        }
+
+    def _set_version(self, table: str, version: int) -> None:
+        with self._lock:
+            known = self._versions.get(table)
+            # a late message must not roll the version back
+            if known is None or known[0] <= version or known[1] <= time.monotonic():
+                self._versions[table] = (version, time.monotonic() + VERSION_TTL)
+
+    def _on_invalidation(self, message: Dict[str, Any]) -> None:
+        try:
+            data = json.loads(message["data"])
+            table = data["table"]
+            version = int(data["version"])
+        except (KeyError, TypeError, ValueError):
+            return
+        if data.get("origin") == self._origin:
+            return
+        self._set_version(table, version)
+        invalidate_table(table)
+
+
+dto_cache = DtoCache()
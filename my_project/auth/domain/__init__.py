@@ -11,4 +11,7 @@ from .orders.Drinks import Drink
 from .orders.Ingredients import Ingredient
 from .orders.Toppings import Topping
 from .orders.PizzaIngredients import PizzaIngredient
-from .orders.Orders import Order
\ No newline at end of file
+from .orders.Orders import Order
+from .orders.OrderStats import OrderStats
+from .orders.PizzaStats import PizzaStats
+from .orders.PizzaPopularity import PizzaPopularity
\ No newline at end of file
@@ -7,11 +7,11 @@ class DeliveryOrder(db.Model):
     __tablename__ = "Delivery_Orders"
 
     DeliveryID = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    OrderID = db.Column(db.Integer, db.ForeignKey("Orders.id"), nullable=False)
-    DeliveryPersonID = db.Column(db.Integer, db.ForeignKey("Delivery_Person.id"), nullable=False)
+    OrderID = db.Column(db.Integer, db.ForeignKey("Orders.id"), nullable=False, index=True)
+    DeliveryPersonID = db.Column(db.Integer, db.ForeignKey("Delivery_Person.id"), nullable=False, index=True)
     EstimatedDeliveryTime = db.Column(db.DateTime)
     ActualDeliveryTime = db.Column(db.DateTime)
-    CreatedAt = db.Column(db.DateTime, default=db.func.now())
+    CreatedAt = db.Column(db.DateTime, default=db.func.now(), index=True)
     def put_into_dto(self) -> Dict[str, Any]:
         return {
             "DeliveryID": self.DeliveryID,
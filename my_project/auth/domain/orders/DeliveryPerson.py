@@ -9,7 +9,7 @@ class DeliveryPerson(db.Model):
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     Name = db.Column(db.String(255), nullable=False)
     Surname = db.Column(db.String(255), nullable=False)
-    Gender = db.Column(db.Integer, db.ForeignKey("Gender.id"))
+    Gender = db.Column(db.Integer, db.ForeignKey("Gender.id"), index=True)
     PhoneNumber = db.Column(db.String(15))
     CurrentLocation = db.Column(db.String(255))
 
@@ -3,6 +3,11 @@ from my_project import db
 from typing import Dict, Any
 from my_project.auth.domain.i_dto import IDto
 
+# Order statuses of the /api/v1 API, stored as Delivery_Status rows
+ORDER_STATUSES = ['New', 'Preparing', 'On the way', 'Delivered', 'Cancelled']
+NEW_ORDER_STATUS = 'New'
+CANCELLED_ORDER_STATUS = 'Cancelled'
+
 
 class DeliveryStatus(db.Model, IDto):
     __tablename__ = "Delivery_Status"
@@ -0,0 +1,24 @@
+from __future__ import annotations
+from typing import Dict, Any
+from my_project import db
+
+
+class OrderStats(db.Model):
+    """
+    Running number of orders and revenue per delivery status (no revenue for cancelled orders),
+    maintained together with Orders.
+    """
+    __tablename__ = "Order_Stats"
+
+    Delivery_Statusid = db.Column(db.Integer, db.ForeignKey("Delivery_Status.id"), primary_key=True)
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+
+    delivery_status = db.relationship("DeliveryStatus")
+
+    def put_into_dto(self) -> Dict[str, Any]:
+        return {
+            "Delivery_Statusid": self.Delivery_Statusid,
+            "order_count": self.order_count,
+            "revenue": self.revenue,
+        }
@@ -8,19 +8,26 @@ from my_project.auth.domain.orders.DeliveryStatus import DeliveryStatus
 
 class Order(db.Model):
     __tablename__ = "Orders"
+    # equality on the foreign key, range/order on the date: orders of a user or in a status by date
+    __table_args__ = (
+        db.Index("ix_Orders_Delivery_Statusid_Created_AT", "Delivery_Statusid", "Created_AT"),
+        db.Index("ix_Orders_userid_Created_AT", "userid", "Created_AT"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     userid = db.Column(db.Integer, db.ForeignKey("Users.id"), nullable=False)
-    Payment_Statusid = db.Column(db.Integer, db.ForeignKey("Payment_Status.id"), nullable=False)
+    Payment_Statusid = db.Column(db.Integer, db.ForeignKey("Payment_Status.id"), nullable=False, index=True)
     Delivery_Statusid = db.Column(db.Integer, db.ForeignKey("Delivery_Status.id"), nullable=False)
     Expected_delivery_time = db.Column(db.DateTime)
     Actual_delivery_time = db.Column(db.DateTime)
     Total_Price = db.Column(db.Numeric(10, 2))
-    Created_AT = db.Column(db.DateTime, default=db.func.now())
+    Created_AT = db.Column(db.DateTime, default=db.func.now(), index=True)
+    delivery_address = db.Column(db.String(255), nullable=True)
 
     user = db.relationship("Users", backref="orders")
     payment_status = db.relationship("PaymentStatus", backref="orders")
     delivery_status = db.relationship("DeliveryStatus", backref="orders")
+    pizza_orders = db.relationship("PizzaOrder", backref="order")
 
     def put_into_dto(self) -> Dict[str, Any]:
         return {
@@ -28,8 +35,10 @@ class Order(db.Model):
             "user": self.user.put_into_dto() if self.user else None,
             "payment_status": self.payment_status.put_into_dto() if self.payment_status else None,
             "delivery_status": self.delivery_status.put_into_dto() if self.delivery_status else None,
-            "Expected_delivery_time": self.Expected_delivery_time.isoformat() if self.Expected_delivery_time else None,
-            "Actual_delivery_time": self.Actual_delivery_time.isoformat() if self.Actual_delivery_time else None,
-            "Total_Price": float(self.Total_Price) if self.Total_Price else None,
-            "Created_AT": self.Created_AT.isoformat() if self.Created_AT else None,
+            "Expected_delivery_time": self.Expected_delivery_time,
+            "Actual_delivery_time": self.Actual_delivery_time,
+            # a zero price stays null, as it was rendered before the JSON provider took over the conversion
+            "Total_Price": self.Total_Price or None,
+            "Created_AT": self.Created_AT,
+            "delivery_address": self.delivery_address,
         }
@@ -7,8 +7,11 @@ class Pizza(db.Model):
     __tablename__ = "Pizza"
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    name = db.Column(db.String(255), nullable=False)
+    name = db.Column(db.String(255), nullable=False, index=True)
     quantity = db.Column(db.Integer, nullable=False)
+    description = db.Column(db.String(255), nullable=True)
+    price = db.Column(db.Numeric(10, 2), nullable=True, index=True)
+    size = db.Column(db.String(20), nullable=True)
     ingredients = db.relationship(
         "Ingredient",
         secondary="Pizza_Ingredients",
@@ -20,6 +23,9 @@ class Pizza(db.Model):
             "id": self.id,
             "name": self.name,
             "quantity": self.quantity,
+            "description": self.description,
+            "price": self.price,
+            "size": self.size,
             "ingredients": [ingredient.put_into_dto() for ingredient in self.ingredients]
         }
 
@@ -9,10 +9,13 @@ class PizzaIngredient(db.Model):
     __tablename__ = "Pizza_Ingredients"
 
     pizza_id = db.Column(db.Integer, db.ForeignKey("Pizza.id"), primary_key=True)
-    ingredient_id = db.Column(db.Integer, db.ForeignKey("Ingredients.ingredient_id"), primary_key=True)
+    # the primary key (pizza_id, ingredient_id) does not serve lookups by ingredient
+    ingredient_id = db.Column(db.Integer, db.ForeignKey("Ingredients.ingredient_id"), primary_key=True, index=True)
 
-    pizza = db.relationship("Pizza", backref="pizza_ingredients", lazy="joined")
-    ingredient = db.relationship("Ingredient", backref="ingredient_pizzas", lazy="joined")
+    # The link rows are owned by the Pizza.ingredients many-to-many; read-only backrefs keep
+    # the ORM from blanking out their primary key when a pizza or an ingredient is deleted
+    pizza = db.relationship("Pizza", backref=db.backref("pizza_ingredients", viewonly=True), lazy="joined")
+    ingredient = db.relationship("Ingredient", backref=db.backref("ingredient_pizzas", viewonly=True), lazy="joined")
 
     def put_into_dto(self) -> Dict[str, Any]:
         return {
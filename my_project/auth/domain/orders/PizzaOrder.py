@@ -7,16 +7,19 @@ class PizzaOrder(db.Model):
     __tablename__ = "Pizza_Order"
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    pizza_id = db.Column(db.Integer, db.ForeignKey("Pizza.id"), nullable=False)
-    toppings_id = db.Column(db.Integer, db.ForeignKey("Toppings.topping_id"))
+    pizza_id = db.Column(db.Integer, db.ForeignKey("Pizza.id"), nullable=False, index=True)
+    toppings_id = db.Column(db.Integer, db.ForeignKey("Toppings.topping_id"), index=True)
     price = db.Column(db.Numeric(10, 2), nullable=False)
+    order_id = db.Column(db.Integer, db.ForeignKey("Orders.id"), nullable=True, index=True)
+    pizza = db.relationship("Pizza")
 
     def put_into_dto(self) -> Dict[str, Any]:
         return {
             "id": self.id,
             "pizza_id": self.pizza_id,
             "toppings_id": self.toppings_id,
-            "price": float(self.price),
+            "price": self.price,
+            "order_id": self.order_id,
         }
 
     @staticmethod
@@ -0,0 +1,21 @@
+from __future__ import annotations
+from typing import Dict, Any
+from my_project import db
+
+
+class PizzaPopularity(db.Model):
+    """
+    Number of ordered lines per pizza and hour the order was created in, kept for the recent hours only.
+    """
+    __tablename__ = "Pizza_Popularity"
+
+    pizza_id = db.Column(db.Integer, db.ForeignKey("Pizza.id"), primary_key=True)
+    hour = db.Column(db.DateTime, primary_key=True, index=True)
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def put_into_dto(self) -> Dict[str, Any]:
+        return {
+            "pizza_id": self.pizza_id,
+            "hour": self.hour,
+            "order_count": self.order_count,
+        }
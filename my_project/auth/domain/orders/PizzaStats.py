@@ -0,0 +1,19 @@
+from __future__ import annotations
+from typing import Dict, Any
+from my_project import db
+
+
+class PizzaStats(db.Model):
+    """
+    Running number of ordered lines per pizza (cancelled orders excluded), maintained together with Pizza_Order.
+    """
+    __tablename__ = "Pizza_Stats"
+
+    pizza_id = db.Column(db.Integer, db.ForeignKey("Pizza.id"), primary_key=True)
+    order_count = db.Column(db.Integer, nullable=False, default=0, index=True)
+
+    def put_into_dto(self) -> Dict[str, Any]:
+        return {
+            "pizza_id": self.pizza_id,
+            "order_count": self.order_count,
+        }
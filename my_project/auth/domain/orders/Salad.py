@@ -11,7 +11,7 @@ class Salad(db.Model):
     price = db.Column(db.Numeric(10, 2), nullable=False)
 
     def put_into_dto(self) -> Dict[str, Any]:
-        return {"id": self.id, "name": self.name, "price": float(self.price)}
+        return {"id": self.id, "name": self.name, "price": self.price}
 
     @staticmethod
     def create_from_dto(dto_dict: Dict[str, Any]) -> Salad:
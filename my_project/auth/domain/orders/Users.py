@@ -12,6 +12,11 @@ class Users(db.Model):
     address = db.Column(db.String(255), nullable=True)
     email = db.Column(db.String(255), nullable=False)
     phone_number = db.Column(db.String(50), nullable=True)
+    # Login of the /api/v1 API
+    username = db.Column(db.String(100), unique=True, nullable=True)
+    password_hash = db.Column(db.String(255), nullable=True)
+    # Access to the admin-only resources, granted only in the database, never by a username
+    is_admin = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
 
     def put_into_dto(self) -> Dict[str, Any]:
         return {
@@ -21,4 +26,6 @@ class Users(db.Model):
             "address": self.address,
             "email": self.email,
             "phone_number": self.phone_number,
+            "username": self.username,
+            "is_admin": self.is_admin,
         }
@@ -13,6 +13,10 @@ def register_routes(app: Flask) -> None:
     # Register error handler blueprint
     app.register_blueprint(err_handler_bp)
 
+    # Register operational statistics blueprint
+    from .admin import admin_bp
+    app.register_blueprint(admin_bp)
+
     # Import and register blueprints for each specific entity
     from .orders.GenderBlueprint import gender_bp
     from .orders.PizzaBlueprint import pizza_bp
@@ -0,0 +1,51 @@
+"""
+Operational statistics of the process (caches etc.), readable by users with admin rights only.
+"""
+
+from http import HTTPStatus
+
+from flask import Blueprint, Response, jsonify, make_response
+
+from my_project import db
+from my_project.auth.dao.cache import cache_stats
+from my_project.auth.dao.pool import pool_stats
+from my_project.auth.dao.redis_cache import dto_cache
+from my_project.auth.route.authorization import require_admin
+from my_project.auth.service.password_service import password_service
+from my_project.auth.service.token_service import token_service
+
+admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
+
+admin_bp.before_request(require_admin)
+
+
+@admin_bp.get('/cache')
+def get_cache_stats() -> Response:
+    """
+    Gets hit/miss counters of the catalog caches and the verified token cache of this process
+    and of the shared DTO cache.
+    :return: Response object
+    """
+    return make_response(jsonify({
+        "catalog": cache_stats(),
+        "dto": dto_cache.stats(),
+        "tokens": token_service.stats(),
+    }), HTTPStatus.OK)
+
+
+@admin_bp.get('/pool')
+def get_pool_stats() -> Response:
+    """
+    Gets state (in use, overflow) and checkout wait metrics of the database connection pool.
+    :return: Response object
+    """
+    return make_response(jsonify(pool_stats(db.engine.pool)), HTTPStatus.OK)
+
+
+@admin_bp.get('/passwords')
+def get_password_hashing_stats() -> Response:
+    """
+    Gets queue depth and timings of the password hashing pool.
+    :return: Response object
+    """
+    return make_response(jsonify(password_service.stats()), HTTPStatus.OK)
@@ -0,0 +1,50 @@
+"""
+Admin check of blueprint routes with the Bearer tokens of the /api/v1 API.
+
+Admin rights are the is_admin flag of the Users row of the token, read on every request:
+a username alone grants nothing, so an account registered again under a deleted admin's
+username is an ordinary user.
+"""
+
+from functools import wraps
+from http import HTTPStatus
+from typing import Callable
+
+import jwt
+from flask import abort, request
+
+from my_project.auth.dao import users_dao
+from my_project.auth.service.token_service import token_service
+
+
+def require_admin() -> None:
+    """
+    Checks the Bearer token of the request like the admin-only /api/v1 resources do.
+    Aborts with 401 without a valid token and with 403 for users without admin rights.
+    """
+    token = request.headers.get("Authorization")
+    if not token:
+        abort(HTTPStatus.UNAUTHORIZED)
+    if token.startswith("Bearer "):
+        token = token[7:]
+    try:
+        claims = token_service.decode(token)
+    except jwt.InvalidTokenError:
+        abort(HTTPStatus.UNAUTHORIZED)
+    username = claims.get("username")
+    user = users_dao.find_by_username(username) if username else None
+    if not user or not user.is_admin:
+        abort(HTTPStatus.FORBIDDEN)
+
+
+def admin_required(view: Callable) -> Callable:
+    """
+    Lets only users with admin rights call the view (see require_admin).
+    :param view: view function
+    :return: decorated view function
+    """
+    @wraps(view)
+    def decorated(*args, **kwargs):
+        require_admin()
+        return view(*args, **kwargs)
+    return decorated
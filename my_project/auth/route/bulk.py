@@ -0,0 +1,93 @@
+"""
+Batch creation (POST /<entity>/bulk) shared by the entity routes.
+
+Every chunk is committed in its own transaction. When a chunk is rejected the response tells how many
+leading rows were committed before it: 409 for a duplicate key, 422 for wrong rows and the other
+constraint violations (NOT NULL, foreign key), with a body such as
+
+    {"error": "...", "committed_rows": 1000, "chunks": [...timings of the committed chunks...]}
+
+so the client can resend the rest.
+"""
+
+from http import HTTPStatus
+from typing import Any, Callable, Dict, Iterator, List
+
+from flask import abort, jsonify, make_response, request
+from sqlalchemy.exc import IntegrityError
+
+from my_project.auth.dao.general_dao import BULK_CHUNK_SIZE, BulkWriteError, is_duplicate_key
+from my_project.json_provider import loads
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+MAX_CHUNK_SIZE = 5000
+UPSERT_MODE = "upsert"
+INSERT_MODE = "insert"
+
+
+def read_bulk_rows() -> Iterator[Dict[str, Any]]:
+    """
+    Reads rows of the current request: a JSON array, or NDJSON (one object per line) read line by line.
+    A line that is not JSON raises ValueError when it is reached.
+    :return: iterator over rows
+    """
+    if request.mimetype == NDJSON_MIMETYPE:
+        return _read_ndjson()
+    content = request.get_json(silent=True)
+    if not isinstance(content, list):
+        abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+    return iter(content)
+
+
+def _read_ndjson() -> Iterator[Dict[str, Any]]:
+    for number, line in enumerate(request.stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = loads(line)
+        except ValueError as error:
+            raise ValueError(f"Line {number} is not JSON") from error
+        yield row
+
+
+def bulk_create(create_all: Callable[..., List[Dict[str, object]]]) -> Dict[str, Any]:
+    """
+    Creates rows of the current request in chunks (?chunk_size=&mode=insert|upsert).
+    :param create_all: controller method taking rows, chunk size and upsert flag
+    :return: response DTO with number of rows and per-chunk timings
+    """
+    chunk_size = request.args.get("chunk_size", BULK_CHUNK_SIZE)
+    try:
+        chunk_size = int(chunk_size)
+    except ValueError:
+        abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+    if not 1 <= chunk_size <= MAX_CHUNK_SIZE:
+        abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+    mode = request.args.get("mode", INSERT_MODE)
+    if mode not in (INSERT_MODE, UPSERT_MODE):
+        abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+
+    try:
+        timings = create_all(read_bulk_rows(), chunk_size, mode == UPSERT_MODE)
+    except BulkWriteError as error:
+        abort(make_response(jsonify({
+            "error": str(error.error.orig) if isinstance(error.error, IntegrityError) else str(error.error),
+            "committed_rows": error.committed_rows,
+            "chunks": error.timings,
+        }), bulk_error_status(error)))
+    return {
+        "rows": sum(chunk["rows"] for chunk in timings),
+        "chunks": timings,
+    }
+
+
+def bulk_error_status(error: BulkWriteError) -> HTTPStatus:
+    """
+    Gets the response status of a rejected chunk.
+    :param error: error raised by create_all
+    :return: 409 for a duplicate key, 422 otherwise
+    """
+    if isinstance(error.error, IntegrityError) and is_duplicate_key(error.error):
+        return HTTPStatus.CONFLICT
+    return HTTPStatus.UNPROCESSABLE_ENTITY
@@ -0,0 +1,73 @@
+"""
+Conditional GET (weak ETag / If-None-Match) of entity routes.
+
+With Redis (REDIS_URL) the ETag is made of the table versions shared by all worker processes,
+so a request with a matching If-None-Match gets 304 before the view reads the database.
+Without Redis a write in one worker process is not seen by the others (gunicorn with several
+workers), so the ETag is a hash of the response body instead: it is always current, but the
+view runs for every request and only the transfer of an unchanged body is saved.
+Streamed responses are not tagged in that mode, their body is never held as a whole.
+"""
+
+import hashlib
+from functools import wraps
+from http import HTTPStatus
+from typing import Callable, Iterable, Optional
+
+from flask import Response, make_response, request
+
+from my_project.auth.dao.redis_cache import dto_cache
+
+
+def conditional_get(tables: Iterable[str]) -> Callable:
+    """
+    Tags responses of the view with a weak ETag made of the versions of tables, the request URL and
+    the Accept header (which selects JSON or NDJSON on the streaming routes), or of the response body
+    when the versions are not shared (see the module docstring).
+    :param tables: all tables the response is read from
+    :return: view decorator
+    """
+    tables = tuple(tables)
+
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def decorated(*args, **kwargs) -> Response:
+            etag = _make_etag(tables)
+            if etag is None:
+                return _tag_content(make_response(view(*args, **kwargs)))
+            if request.if_none_match.contains_weak(etag):
+                return _not_modified(etag)
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == HTTPStatus.OK:
+                response.set_etag(etag, weak=True)
+                response.vary.add("Accept")
+            return response
+        return decorated
+    return decorator
+
+
+def _make_etag(tables: Iterable[str]) -> Optional[str]:
+    # versions are read before the view runs, so a concurrent write can only make the tag older than the body
+    versions = dto_cache.versions(tables)
+    if versions is None:
+        return None
+    raw = "|".join([request.full_path, request.headers.get("Accept", ""), *versions])
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _tag_content(response: Response) -> Response:
+    if response.status_code != HTTPStatus.OK or response.is_streamed:
+        return response
+    etag = hashlib.sha1(response.get_data()).hexdigest()
+    if request.if_none_match.contains_weak(etag):
+        return _not_modified(etag)
+    response.set_etag(etag, weak=True)
+    response.vary.add("Accept")
+    return response
+
+
+def _not_modified(etag: str) -> Response:
+    response = make_response("", HTTPStatus.NOT_MODIFIED)
+    response.set_etag(etag, weak=True)
+    response.vary.add("Accept")
+    return response
@@ -0,0 +1,38 @@
+"""
+Filters and sort order of the collection routes:
+
+    ?Delivery_Statusid=2&Created_AT__gte=2024-01-01T00:00:00&sort=-Created_AT
+
+Every other query parameter is a filter `field` or `field__operator` (eq, ne, gt, gte, lt, lte,
+in with comma separated values, isnull=true/false, startswith). Only the indexed fields a DAO
+declares are accepted, so every filter and sort order runs against an index in the database.
+"""
+
+from http import HTTPStatus
+from typing import Callable, Iterable, Optional, Tuple
+
+from flask import abort, request
+
+from my_project.auth.dao.general_dao import Criteria
+from my_project.auth.route.projection import FIELDS_ARG
+from my_project.auth.route.streaming import STREAM_ARG
+
+SORT_ARG = "sort"
+# Query parameters of pagination, projection and streaming, not filters
+RESERVED_ARGS = {"limit", "after", FIELDS_ARG, STREAM_ARG, SORT_ARG}
+
+
+def get_criteria(parse_criteria: Callable[[Iterable[Tuple[str, str]], Optional[str]], Criteria]) -> Optional[Criteria]:
+    """
+    Reads filters and sort order of the current request, aborts with 422 on unknown fields or wrong values.
+    :param parse_criteria: controller method compiling them
+    :return: criteria or None if the request has neither
+    """
+    filters = [(name, value) for name, value in request.args.items(multi=True) if name not in RESERVED_ARGS]
+    sort = request.args.get(SORT_ARG)
+    if not filters and sort is None:
+        return None
+    try:
+        return parse_criteria(filters, sort)
+    except ValueError:
+        abort(HTTPStatus.UNPROCESSABLE_ENTITY)
@@ -0,0 +1,99 @@
+"""
+/api/v1 flask-restx API that serves its OpenAPI document from a cache with an ETag.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from http import HTTPStatus
+from typing import Any, Dict, Optional, Tuple
+
+from flask import Response, current_app, request
+from flask_restx import Api, Resource
+
+# Only key of the document flask-restx returns when the schema fails to render
+SCHEMA_ERROR_KEY = "error"
+
+
+class SpecApi(Api):
+    """
+    Api whose swagger.json is serialized once per process, or read from a file built in advance
+    (python app.py openapi <file>), and answered with 304 when the client has it already.
+    """
+
+    def __init__(self, *args, spec_file: Optional[str] = None, **kwargs) -> None:
+        """
+        :param spec_file: pre-built OpenAPI JSON served instead of generating it, ignored if it does not exist
+        """
+        self.spec_file = spec_file
+        self._spec: Optional[Tuple[bytes, str]] = None
+        self._spec_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def _register_specs(self, app_or_blueprint) -> None:
+        if self._add_specs:
+            endpoint = "specs"
+            self._register_view(
+                app_or_blueprint,
+                SpecView,
+                self.default_namespace,
+                "/" + self.default_swagger_filename,
+                endpoint=endpoint,
+                resource_class_args=(self,),
+            )
+            self.endpoints.add(endpoint)
+
+    def spec(self) -> Tuple[bytes, Optional[str]]:
+        """
+        Gets the serialized OpenAPI document and its ETag, building it on first use.
+        A document that failed to render is not cached, the next request builds it again.
+        :return: JSON bytes and entity tag, None as tag for the error document
+        """
+        with self._spec_lock:
+            if self._spec is not None:
+                return self._spec
+            if self.spec_file and os.path.isfile(self.spec_file):
+                with open(self.spec_file, "rb") as file:
+                    content = file.read()
+            else:
+                schema = self.__schema__
+                content = json.dumps(schema, sort_keys=True).encode()
+                if _is_error(schema):
+                    # flask-restx caches the error document as __schema__ as well
+                    self.__dict__.pop("__schema__", None)
+                    return content, None
+            self._spec = (content, hashlib.sha1(content).hexdigest())
+            return self._spec
+
+    def write_spec(self, path: str) -> None:
+        """
+        Writes the generated OpenAPI document to path (needs a request context).
+        :param path: target file
+        :raise RuntimeError: the document failed to render
+        """
+        schema = self.__schema__
+        if _is_error(schema):
+            self.__dict__.pop("__schema__", None)
+            raise RuntimeError(f"OpenAPI document failed to render: {schema[SCHEMA_ERROR_KEY]}")
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(schema, file, sort_keys=True)
+
+
+def _is_error(schema: Dict[str, Any]) -> bool:
+    return SCHEMA_ERROR_KEY in schema
+
+
+class SpecView(Resource):
+    """
+    Serves the cached OpenAPI document.
+    """
+
+    def get(self) -> Response:
+        content, etag = self.api.spec()
+        response = current_app.response_class(content, mimetype="application/json")
+        if etag is None:
+            response.status_code = HTTPStatus.INTERNAL_SERVER_ERROR
+            return response
+        response.set_etag(etag)
+        return response.make_conditional(request)
@@ -1,15 +1,27 @@
 from http import HTTPStatus
 from flask import Blueprint, jsonify, Response, request, make_response
+from my_project.auth.dao.general_dao import DTO_PROFILE
 from my_project.auth.controller import delivery_orders_controller
 from my_project.auth.domain.orders.DeliveryOrders import DeliveryOrder
+from my_project.auth.route.bulk import bulk_create
+from my_project.auth.route.conditional import conditional_get
+from my_project.auth.route.filtering import get_criteria
+from my_project.auth.route.pagination import get_page, page_into_dto
+from my_project.auth.route.projection import get_fields, into_dto
+from my_project.auth.route.streaming import stream_requested, stream_response
 
 delivery_orders_bp = Blueprint('delivery_orders', __name__, url_prefix='/delivery_orders')
 
 @delivery_orders_bp.get('')
+@conditional_get(delivery_orders_controller.dto_tables())
 def get_all_delivery_orders() -> Response:
-    delivery_orders = delivery_orders_controller.find_all()
-    delivery_orders_dto = [delivery_order.put_into_dto() for delivery_order in delivery_orders]
-    return make_response(jsonify(delivery_orders_dto), HTTPStatus.OK)
+    fields = get_fields(delivery_orders_controller.parse_fields)
+    criteria = get_criteria(delivery_orders_controller.parse_criteria)
+    if stream_requested():
+        return stream_response(into_dto(delivery_order, fields)
+                               for delivery_order in delivery_orders_controller.iter_all(DTO_PROFILE, fields, criteria))
+    delivery_orders, next_key = get_page(delivery_orders_controller.find_page, profile=DTO_PROFILE, fields=fields, criteria=criteria)
+    return make_response(jsonify(page_into_dto(delivery_orders, next_key, fields)), HTTPStatus.OK)
 
 @delivery_orders_bp.post('')
 def create_delivery_order() -> Response:
@@ -18,11 +30,16 @@ def create_delivery_order() -> Response:
     delivery_orders_controller.create(delivery_order)
     return make_response(jsonify(delivery_order.put_into_dto()), HTTPStatus.CREATED)
 
+@delivery_orders_bp.post('/bulk')
+def create_delivery_order_bulk() -> Response:
+    return make_response(jsonify(bulk_create(delivery_orders_controller.create_all)), HTTPStatus.CREATED)
+
 @delivery_orders_bp.get('/<int:delivery_order_id>')
+@conditional_get(delivery_orders_controller.dto_tables())
 def get_delivery_order(delivery_order_id: int) -> Response:
-    delivery_order = delivery_orders_controller.find_by_id(delivery_order_id)
+    delivery_order = delivery_orders_controller.find_dto_by_id(delivery_order_id, get_fields(delivery_orders_controller.parse_fields))
     if delivery_order:
-        return make_response(jsonify(delivery_order.put_into_dto()), HTTPStatus.OK)
+        return make_response(jsonify(delivery_order), HTTPStatus.OK)
     return make_response(jsonify({"error": "Delivery order not found"}), HTTPStatus.NOT_FOUND)
 
 @delivery_orders_bp.put('/<int:delivery_order_id>')
@@ -37,6 +54,17 @@ def update_delivery_order(delivery_order_id: int) -> Response:
     delivery_orders_controller.update(updated_delivery_order)
     return make_response(jsonify(updated_delivery_order.put_into_dto()), HTTPStatus.OK)
 
+@delivery_orders_bp.patch('/<int:delivery_order_id>')
+def patch_delivery_order(delivery_order_id: int) -> Response:
+    content = request.get_json()
+    try:
+        delivery_order = delivery_orders_controller.patch(delivery_order_id, content, DTO_PROFILE)
+    except ValueError as error:
+        return make_response(jsonify({"error": str(error)}), HTTPStatus.UNPROCESSABLE_ENTITY)
+    if not delivery_order:
+        return make_response(jsonify({"error": "Delivery order not found"}), HTTPStatus.NOT_FOUND)
+    return make_response(jsonify(delivery_order.put_into_dto()), HTTPStatus.OK)
+
 @delivery_orders_bp.delete('/<int:delivery_order_id>')
 def delete_delivery_order(delivery_order_id: int) -> Response:
     delivery_order = delivery_orders_controller.find_by_id(delivery_order_id)
@@ -1,15 +1,23 @@
 from http import HTTPStatus
 from flask import Blueprint, jsonify, Response, request, make_response
+from my_project.auth.dao.general_dao import DTO_PROFILE
 from my_project.auth.controller import delivery_person_controller
 from my_project.auth.domain.orders.DeliveryPerson import DeliveryPerson
+from my_project.auth.route.bulk import bulk_create
+from my_project.auth.route.conditional import conditional_get
+from my_project.auth.route.filtering import get_criteria
+from my_project.auth.route.pagination import get_page, page_into_dto
+from my_project.auth.route.projection import get_fields
 
 delivery_person_bp = Blueprint('delivery_person', __name__, url_prefix='/delivery_person')
 
 @delivery_person_bp.get('')
+@conditional_get(delivery_person_controller.dto_tables())
 def get_all_delivery_people() -> Response:
-    delivery_people = delivery_person_controller.find_all()
-    delivery_people_dto = [delivery_person.put_into_dto() for delivery_person in delivery_people]
-    return make_response(jsonify(delivery_people_dto), HTTPStatus.OK)
+    fields = get_fields(delivery_person_controller.parse_fields)
+    criteria = get_criteria(delivery_person_controller.parse_criteria)
+    delivery_people, next_key = get_page(delivery_person_controller.find_page, profile=DTO_PROFILE, fields=fields, criteria=criteria)
+    return make_response(jsonify(page_into_dto(delivery_people, next_key, fields)), HTTPStatus.OK)
 
 @delivery_person_bp.post('')
 def create_delivery_person() -> Response:
@@ -19,11 +27,17 @@ def create_delivery_person() -> Response:
     return make_response(jsonify(delivery_person.put_into_dto()), HTTPStatus.CREATED)
 
 
+@delivery_person_bp.post('/bulk')
+def create_delivery_person_bulk() -> Response:
+    return make_response(jsonify(bulk_create(delivery_person_controller.create_all)), HTTPStatus.CREATED)
+
+
 @delivery_person_bp.get('/<int:delivery_person_id>')
+@conditional_get(delivery_person_controller.dto_tables())
 def get_delivery_person(delivery_person_id: int) -> Response:
-    delivery_person = delivery_person_controller.find_by_id(delivery_person_id)
+    delivery_person = delivery_person_controller.find_dto_by_id(delivery_person_id, get_fields(delivery_person_controller.parse_fields))
     if delivery_person:
-        return make_response(jsonify(delivery_person.put_into_dto()), HTTPStatus.OK)
+        return make_response(jsonify(delivery_person), HTTPStatus.OK)
     return make_response(jsonify({"error": "Delivery person not found"}), HTTPStatus.NOT_FOUND)
 
 
@@ -39,6 +53,18 @@ def update_delivery_person(delivery_person_id: int) -> Response:
     return make_response(jsonify(updated_delivery_person.put_into_dto()), HTTPStatus.OK)
 
 
+@delivery_person_bp.patch('/<int:delivery_person_id>')
+def patch_delivery_person(delivery_person_id: int) -> Response:
+    content = request.get_json()
+    try:
+        delivery_person = delivery_person_controller.patch(delivery_person_id, content, DTO_PROFILE)
+    except ValueError as error:
+        return make_response(jsonify({"error": str(error)}), HTTPStatus.UNPROCESSABLE_ENTITY)
+    if not delivery_person:
+        return make_response(jsonify({"error": "Delivery person not found"}), HTTPStatus.NOT_FOUND)
+    return make_response(jsonify(delivery_person.put_into_dto()), HTTPStatus.OK)
+
+
 @delivery_person_bp.delete('/<int:delivery_person_id>')
 def delete_delivery_person(delivery_person_id: int) -> Response:
     delivery_person = delivery_person_controller.find_by_id(delivery_person_id)
@@ -1,15 +1,23 @@
 from http import HTTPStatus
 from flask import Blueprint, jsonify, Response, request, make_response
+from my_project.auth.dao.general_dao import DTO_PROFILE
 from my_project.auth.controller import delivery_status_controller
 from my_project.auth.domain.orders.DeliveryStatus import DeliveryStatus
+from my_project.auth.route.bulk import bulk_create
+from my_project.auth.route.conditional import conditional_get
+from my_project.auth.route.filtering import get_criteria
+from my_project.auth.route.pagination import get_page, page_into_dto
+from my_project.auth.route.projection import get_fields
 
 delivery_status_bp = Blueprint('delivery_status', __name__, url_prefix='/delivery_status')
 
 @delivery_status_bp.get('')
+@conditional_get(delivery_status_controller.dto_tables())
 def get_all_delivery_statuses() -> Response:
-    statuses = delivery_status_controller.find_all()
-    statuses_dto = [status.put_into_dto() for status in statuses]
-    return make_response(jsonify(statuses_dto), HTTPStatus.OK)
+    fields = get_fields(delivery_status_controller.parse_fields)
+    criteria = get_criteria(delivery_status_controller.parse_criteria)
+    statuses, next_key = get_page(delivery_status_controller.find_page, profile=DTO_PROFILE, fields=fields, criteria=criteria)
+    return make_response(jsonify(page_into_dto(statuses, next_key, fields)), HTTPStatus.OK)
 
 @delivery_status_bp.post('')
 def create_delivery_status() -> Response:
@@ -18,11 +26,16 @@ def create_delivery_status() -> Response:
     delivery_status_controller.create(status)
     return make_response(jsonify(status.put_into_dto()), HTTPStatus.CREATED)
 
+@delivery_status_bp.post('/bulk')
+def create_delivery_status_bulk() -> Response:
+    return make_response(jsonify(bulk_create(delivery_status_controller.create_all)), HTTPStatus.CREATED)
+
 @delivery_status_bp.get('/<int:status_id>')
+@conditional_get(delivery_status_controller.dto_tables())
 def get_delivery_status(status_id: int) -> Response:
-    status = delivery_status_controller.find_by_id(status_id)
+    status = delivery_status_controller.find_dto_by_id(status_id, get_fields(delivery_status_controller.parse_fields))
     if status:
-        return make_response(jsonify(status.put_into_dto()), HTTPStatus.OK)
+        return make_response(jsonify(status), HTTPStatus.OK)
     return make_response(jsonify({"error": "Delivery status not found"}), HTTPStatus.NOT_FOUND)
 
 @delivery_status_bp.put('/<int:status_id>')
@@ -32,6 +45,17 @@ def update_delivery_status(status_id: int) -> Response:
     delivery_status_controller.update(status_id, status)
     return make_response("Delivery status updated", HTTPStatus.OK)
 
+@delivery_status_bp.patch('/<int:status_id>')
+def patch_delivery_status(status_id: int) -> Response:
+    content = request.get_json()
+    try:
+        status = delivery_status_controller.patch(status_id, content, DTO_PROFILE)
+    except ValueError as error:
+        return make_response(jsonify({"error": str(error)}), HTTPStatus.UNPROCESSABLE_ENTITY)
+    if not status:
+        return make_response(jsonify({"error": "Delivery status not found"}), HTTPStatus.NOT_FOUND)
+    return make_response(jsonify(status.put_into_dto()), HTTPStatus.OK)
+
 @delivery_status_bp.delete('/<int:status_id>')
 def delete_delivery_status(status_id: int) -> Response:
     delivery_status_controller.delete(status_id)
@@ -1,15 +1,23 @@
 from http import HTTPStatus
 from flask import Blueprint, jsonify, Response, request, make_response
+from my_project.auth.dao.general_dao import DTO_PROFILE
 from my_project.auth.controller import drinks_controller
 from my_project.auth.domain.orders.Drinks import Drink
+from my_project.auth.route.bulk import bulk_create
+from my_project.auth.route.conditional import conditional_get
+from my_project.auth.route.filtering import get_criteria
+from my_project.auth.route.pagination import get_page, page_into_dto
+from my_project.auth.route.projection import get_fields
 
 drinks_bp = Blueprint('drinks', __name__, url_prefix='/drinks')
 
 @drinks_bp.get('')
+@conditional_get(drinks_controller.dto_tables())
 def get_all_drinks() -> Response:
-    drinks = drinks_controller.find_all()
-    drinks_dto = [drink.put_into_dto() for drink in drinks]
-    return make_response(jsonify(drinks_dto), HTTPStatus.OK)
+    fields = get_fields(drinks_controller.parse_fields)
+    criteria = get_criteria(drinks_controller.parse_criteria)
+    drinks, next_key = get_page(drinks_controller.find_page, profile=DTO_PROFILE, fields=fields, criteria=criteria)
+    return make_response(jsonify(page_into_dto(drinks, next_key, fields)), HTTPStatus.OK)
 
 @drinks_bp.post('')
 def create_drink() -> Response:
@@ -18,11 +26,16 @@ def create_drink() -> Response:
     drinks_controller.create(drink)
     return make_response(jsonify(drink.put_into_dto()), HTTPStatus.CREATED)
 
+@drinks_bp.post('/bulk')
+def create_drink_bulk() -> Response:
+    return make_response(jsonify(bulk_create(drinks_controller.create_all)), HTTPStatus.CREATED)
+
 @drinks_bp.get('/<int:drink_id>')
+@conditional_get(drinks_controller.dto_tables())
 def get_drink(drink_id: int) -> Response:
-    drink = drinks_controller.find_by_id(drink_id)
+    drink = drinks_controller.find_dto_by_id(drink_id, get_fields(drinks_controller.parse_fields))
     if drink:
-        return make_response(jsonify(drink.put_into_dto()), HTTPStatus.OK)
+        return make_response(jsonify(drink), HTTPStatus.OK)
     return make_response(jsonify({"error": "Drink not found"}), HTTPStatus.NOT_FOUND)
 
 @drinks_bp.put('/<int:drink_id>')
@@ -32,6 +45,17 @@ def update_drink(drink_id: int) -> Response:
     drinks_controller.update(drink_id, drink)
     return make_response("Drink updated", HTTPStatus.OK)
 
+@drinks_bp.patch('/<int:drink_id>')
+def patch_drink(drink_id: int) -> Response:
+    content = request.get_json()
+    try:
+        drink = drinks_controller.patch(drink_id, content, DTO_PROFILE)
+    except ValueError as error:
+        return make_response(jsonify({"error": str(error)}), HTTPStatus.UNPROCESSABLE_ENTITY)
+    if not drink:
+        return make_response(jsonify({"error": "Drink not found"}), HTTPStatus.NOT_FOUND)
+    return make_response(jsonify(drink.put_into_dto()), HTTPStatus.OK)
+
 @drinks_bp.delete('/<int:drink_id>')
 def delete_drink(drink_id: int) -> Response:
     drinks_controller.delete(drink_id)
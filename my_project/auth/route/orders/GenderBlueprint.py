@@ -1,15 +1,23 @@
 from http import HTTPStatus
 from flask import Blueprint, jsonify, Response, request, make_response
+from my_project.auth.dao.general_dao import DTO_PROFILE
 from my_project.auth.controller import gender_controller
 from my_project.auth.domain.orders.Gender import Gender
+from my_project.auth.route.bulk import bulk_create
+from my_project.auth.route.conditional import conditional_get
+from my_project.auth.route.filtering import get_criteria
+from my_project.auth.route.pagination import get_page, page_into_dto
+from my_project.auth.route.projection import get_fields
 
 gender_bp = Blueprint('gender', __name__, url_prefix='/gender')
 
 @gender_bp.get('')
+@conditional_get(gender_controller.dto_tables())
 def get_all_genders() -> Response:
-    genders = gender_controller.find_all()
-    genders_dto = [gender.put_into_dto() for gender in genders]
-    return make_response(jsonify(genders_dto), HTTPStatus.OK)
+    fields = get_fields(gender_controller.parse_fields)
+    criteria = get_criteria(gender_controller.parse_criteria)
+    genders, next_key = get_page(gender_controller.find_page, profile=DTO_PROFILE, fields=fields, criteria=criteria)
+    return make_response(jsonify(page_into_dto(genders, next_key, fields)), HTTPStatus.OK)
 
 @gender_bp.post('')
 def create_gender() -> Response:
@@ -18,11 +26,16 @@ def create_gender() -> Response:
     gender_controller.create(gender)
     return make_response(jsonify(gender.put_into_dto()), HTTPStatus.CREATED)
 
+@gender_bp.post('/bulk')
+def create_gender_bulk() -> Response:
+    return make_response(jsonify(bulk_create(gender_controller.create_all)), HTTPStatus.CREATED)
+
 @gender_bp.get('/<int:gender_id>')
+@conditional_get(gender_controller.dto_tables())
 def get_gender(gender_id: int) -> Response:
-    gender = gender_controller.find_by_id(gender_id)
+    gender = gender_controller.find_dto_by_id(gender_id, get_fields(gender_controller.parse_fields))
     if gender:
-        return make_response(jsonify(gender.put_into_dto()), HTTPStatus.OK)
+        return make_response(jsonify(gender), HTTPStatus.OK)
     return make_response(jsonify({"error": "Gender not found"}), HTTPStatus.NOT_FOUND)
 
 @gender_bp.put('/<int:gender_id>')
@@ -32,6 +45,17 @@ def update_gender(gender_id: int) -> Response:
     gender_controller.update(gender_id, gender)
     return make_response("Gender updated", HTTPStatus.OK)
 
+@gender_bp.patch('/<int:gender_id>')
+def patch_gender(gender_id: int) -> Response:
+    content = request.get_json()
+    try:
+        gender = gender_controller.patch(gender_id, content, DTO_PROFILE)
+    except ValueError as error:
+        return make_response(jsonify({"error": str(error)}), HTTPStatus.UNPROCESSABLE_ENTITY)
+    if not gender:
+        return make_response(jsonify({"error": "Gender not found"}), HTTPStatus.NOT_FOUND)
+    return make_response(jsonify(gender.put_into_dto()), HTTPStatus.OK)
+
 @gender_bp.delete('/<int:gender_id>')
 def delete_gender(gender_id: int) -> Response:
     gender_controller.delete(gender_id)
@@ -1,16 +1,24 @@
 
 from http import HTTPStatus
 from flask import Blueprint, jsonify, Response, request, make_response
+from my_project.auth.dao.general_dao import DTO_PROFILE
 from my_project.auth.controller import ingredients_controller
 from my_project.auth.domain.orders.Ingredients import Ingredient
+from my_project.auth.route.bulk import bulk_create
+from my_project.auth.route.conditional import conditional_get
+from my_project.auth.route.filtering import get_criteria
+from my_project.auth.route.pagination import get_page, page_into_dto
+from my_project.auth.route.projection import get_fields
 
 ingredients_bp = Blueprint('ingredients', __name__, url_prefix='/ingredients')
 
 @ingredients_bp.get('')
+@conditional_get(ingredients_controller.dto_tables())
 def get_all_ingredients() -> Response:
-    ingredients = ingredients_controller.find_all()
-    ingredients_dto = [ingredient.put_into_dto() for ingredient in ingredients]
-    return make_response(jsonify(ingredients_dto), HTTPStatus.OK)
+    fields = get_fields(ingredients_controller.parse_fields)
+    criteria = get_criteria(ingredients_controller.parse_criteria)
+    ingredients, next_key = get_page(ingredients_controller.find_page, profile=DTO_PROFILE, fields=fields, criteria=criteria)
+    return make_response(jsonify(page_into_dto(ingredients, next_key, fields)), HTTPStatus.OK)
 
 @ingredients_bp.post('')
 def create_ingredient() -> Response:
@@ -19,11 +27,16 @@ def create_ingredient() -> Response:
     ingredients_controller.create(ingredient)
     return make_response(jsonify(ingredient.put_into_dto()), HTTPStatus.CREATED)
 
+@ingredients_bp.post('/bulk')
+def create_ingredient_bulk() -> Response:
+    return make_response(jsonify(bulk_create(ingredients_controller.create_all)), HTTPStatus.CREATED)
+
 @ingredients_bp.get('/<int:ingredient_id>')
+@conditional_get(ingredients_controller.dto_tables())
 def get_ingredient(ingredient_id: int) -> Response:
-    ingredient = ingredients_controller.find_by_id(ingredient_id)
+    ingredient = ingredients_controller.find_dto_by_id(ingredient_id, get_fields(ingredients_controller.parse_fields))
     if ingredient:
-        return make_response(jsonify(ingredient.put_into_dto()), HTTPStatus.OK)
+        return make_response(jsonify(ingredient), HTTPStatus.OK)
     return make_response(jsonify({"error": "Ingredient not found"}), HTTPStatus.NOT_FOUND)
 
 @ingredients_bp.put('/<int:ingredient_id>')
@@ -33,6 +46,17 @@ def update_ingredient(ingredient_id: int) -> Response:
     ingredients_controller.update(ingredient_id, ingredient)
     return make_response("Ingredient updated", HTTPStatus.OK)
 
+@ingredients_bp.patch('/<int:ingredient_id>')
+def patch_ingredient(ingredient_id: int) -> Response:
+    content = request.get_json()
+    try:
+        ingredient = ingredients_controller.patch(ingredient_id, content, DTO_PROFILE)
+    except ValueError as error:
+        return make_response(jsonify({"error": str(error)}), HTTPStatus.UNPROCESSABLE_ENTITY)
+    if not ingredient:
+        return make_response(jsonify({"error": "Ingredient not found"}), HTTPStatus.NOT_FOUND)
+    return make_response(jsonify(ingredient.put_into_dto()), HTTPStatus.OK)
+
 @ingredients_bp.delete('/<int:ingredient_id>')
 def delete_ingredient(ingredient_id: int) -> Response:
     ingredients_controller.delete(ingredient_id)
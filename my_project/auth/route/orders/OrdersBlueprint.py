@@ -1,15 +1,26 @@
 from http import HTTPStatus
 from flask import Blueprint, jsonify, Response, request, make_response
+from my_project.auth.dao.general_dao import DTO_PROFILE
 from my_project.auth.controller import orders_controller
 from my_project.auth.domain.orders.Orders import Order
+from my_project.auth.route.bulk import bulk_create
+from my_project.auth.route.conditional import conditional_get
+from my_project.auth.route.filtering import get_criteria
+from my_project.auth.route.pagination import get_page, page_into_dto
+from my_project.auth.route.projection import get_fields, into_dto
+from my_project.auth.route.streaming import stream_requested, stream_response
 
 orders_bp = Blueprint('orders', __name__, url_prefix='/orders')
 
 @orders_bp.get('')
+@conditional_get(orders_controller.dto_tables())
 def get_all_orders() -> Response:
-    orders = orders_controller.find_all()
-    orders_dto = [order.put_into_dto() for order in orders]
-    return make_response(jsonify(orders_dto), HTTPStatus.OK)
+    fields = get_fields(orders_controller.parse_fields)
+    criteria = get_criteria(orders_controller.parse_criteria)
+    if stream_requested():
+        return stream_response(into_dto(order, fields) for order in orders_controller.iter_all(DTO_PROFILE, fields, criteria))
+    orders, next_key = get_page(orders_controller.find_page, profile=DTO_PROFILE, fields=fields, criteria=criteria)
+    return make_response(jsonify(page_into_dto(orders, next_key, fields)), HTTPStatus.OK)
 
 @orders_bp.post('')
 def create_order() -> Response:
@@ -18,11 +29,16 @@ def create_order() -> Response:
     orders_controller.create(order)
     return make_response(jsonify(order.put_into_dto()), HTTPStatus.CREATED)
 
+@orders_bp.post('/bulk')
+def create_order_bulk() -> Response:
+    return make_response(jsonify(bulk_create(orders_controller.create_all)), HTTPStatus.CREATED)
+
 @orders_bp.get('/<int:order_id>')
+@conditional_get(orders_controller.dto_tables())
 def get_order(order_id: int) -> Response:
-    order = orders_controller.find_by_id(order_id)
+    order = orders_controller.find_dto_by_id(order_id, get_fields(orders_controller.parse_fields))
     if order:
-        return make_response(jsonify(order.put_into_dto()), HTTPStatus.OK)
+        return make_response(jsonify(order), HTTPStatus.OK)
     return make_response(jsonify({"error": "Order not found"}), HTTPStatus.NOT_FOUND)
 
 @orders_bp.put('/<int:order_id>')
@@ -37,6 +53,17 @@ def update_order(order_id: int) -> Response:
     orders_controller.update(updated_order)
     return make_response(jsonify(updated_order.put_into_dto()), HTTPStatus.OK)
 
+@orders_bp.patch('/<int:order_id>')
+def patch_order(order_id: int) -> Response:
+    content = request.get_json()
+    try:
+        order = orders_controller.patch(order_id, content, DTO_PROFILE)
+    except ValueError as error:
+        return make_response(jsonify({"error": str(error)}), HTTPStatus.UNPROCESSABLE_ENTITY)
+    if not order:
+        return make_response(jsonify({"error": "Order not found"}), HTTPStatus.NOT_FOUND)
+    return make_response(jsonify(order.put_into_dto()), HTTPStatus.OK)
+
 @orders_bp.delete('/<int:order_id>')
 def delete_order(order_id: int) -> Response:
     order = orders_controller.find_by_id(order_id)
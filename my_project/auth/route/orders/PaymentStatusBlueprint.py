@@ -1,15 +1,23 @@
 from http import HTTPStatus
 from flask import Blueprint, jsonify, Response, request, make_response
+from my_project.auth.dao.general_dao import DTO_PROFILE
 from my_project.auth.controller import payment_status_controller
 from my_project.auth.domain.orders.PaymentStatus import PaymentStatus
+from my_project.auth.route.bulk import bulk_create
+from my_project.auth.route.conditional import conditional_get
+from my_project.auth.route.filtering import get_criteria
+from my_project.auth.route.pagination import get_page, page_into_dto
+from my_project.auth.route.projection import get_fields
 
 payment_status_bp = Blueprint('payment_status', __name__, url_prefix='/payment_status')
 
 @payment_status_bp.get('')
+@conditional_get(payment_status_controller.dto_tables())
 def get_all_payment_statuses() -> Response:
-    statuses = payment_status_controller.find_all()
-    statuses_dto = [status.put_into_dto() for status in statuses]
-    return make_response(jsonify(statuses_dto), HTTPStatus.OK)
+    fields = get_fields(payment_status_controller.parse_fields)
+    criteria = get_criteria(payment_status_controller.parse_criteria)
+    statuses, next_key = get_page(payment_status_controller.find_page, profile=DTO_PROFILE, fields=fields, criteria=criteria)
+    return make_response(jsonify(page_into_dto(statuses, next_key, fields)), HTTPStatus.OK)
 
 @payment_status_bp.post('')
 def create_payment_status() -> Response:
@@ -18,11 +26,16 @@ def create_payment_status() -> Response:
     payment_status_controller.create(status)
     return make_response(jsonify(status.put_into_dto()), HTTPStatus.CREATED)
 
+@payment_status_bp.post('/bulk')
+def create_payment_status_bulk() -> Response:
+    return make_response(jsonify(bulk_create(payment_status_controller.create_all)), HTTPStatus.CREATED)
+
 @payment_status_bp.get('/<int:status_id>')
+@conditional_get(payment_status_controller.dto_tables())
 def get_payment_status(status_id: int) -> Response:
-    status = payment_status_controller.find_by_id(status_id)
+    status = payment_status_controller.find_dto_by_id(status_id, get_fields(payment_status_controller.parse_fields))
     if status:
-        return make_response(jsonify(status.put_into_dto()), HTTPStatus.OK)
+        return make_response(jsonify(status), HTTPStatus.OK)
     return make_response(jsonify({"error": "Payment status not found"}), HTTPStatus.NOT_FOUND)
 
 @payment_status_bp.put('/<int:status_id>')
@@ -32,6 +45,17 @@ def update_payment_status(status_id: int) -> Response:
     payment_status_controller.update(status_id, status)
     return make_response("Payment status updated", HTTPStatus.OK)
 
+@payment_status_bp.patch('/<int:status_id>')
+def patch_payment_status(status_id: int) -> Response:
+    content = request.get_json()
+    try:
+        status = payment_status_controller.patch(status_id, content, DTO_PROFILE)
+    except ValueError as error:
+        return make_response(jsonify({"error": str(error)}), HTTPStatus.UNPROCESSABLE_ENTITY)
+    if not status:
+        return make_response(jsonify({"error": "Payment status not found"}), HTTPStatus.NOT_FOUND)
+    return make_response(jsonify(status.put_into_dto()), HTTPStatus.OK)
+
 @payment_status_bp.delete('/<int:status_id>')
 def delete_payment_status(status_id: int) -> Response:
     payment_status_controller.delete(status_id)
@@ -1,15 +1,23 @@
 from http import HTTPStatus
 from flask import Blueprint, jsonify, Response, request, make_response
+from my_project.auth.dao.general_dao import DTO_PROFILE
 from my_project.auth.controller import pizza_controller
 from my_project.auth.domain.orders.Pizza import Pizza
+from my_project.auth.route.bulk import bulk_create
+from my_project.auth.route.conditional import conditional_get
+from my_project.auth.route.filtering import get_criteria
+from my_project.auth.route.pagination import get_page, page_into_dto
+from my_project.auth.route.projection import get_fields
 
 pizza_bp = Blueprint('pizza', __name__, url_prefix='/pizza')
 
 @pizza_bp.get('')
+@conditional_get(pizza_controller.dto_tables())
 def get_all_pizzas() -> Response:
-    pizzas = pizza_controller.find_all()
-    pizzas_dto = [pizza.put_into_dto() for pizza in pizzas]
-    return make_response(jsonify(pizzas_dto), HTTPStatus.OK)
+    fields = get_fields(pizza_controller.parse_fields)
+    criteria = get_criteria(pizza_controller.parse_criteria)
+    pizzas, next_key = get_page(pizza_controller.find_page, profile=DTO_PROFILE, fields=fields, criteria=criteria)
+    return make_response(jsonify(page_into_dto(pizzas, next_key, fields)), HTTPStatus.OK)
 
 @pizza_bp.post('')
 def create_pizza() -> Response:
@@ -18,11 +26,16 @@ def create_pizza() -> Response:
     pizza_controller.create(pizza)
     return make_response(jsonify(pizza.put_into_dto()), HTTPStatus.CREATED)
 
+@pizza_bp.post('/bulk')
+def create_pizza_bulk() -> Response:
+    return make_response(jsonify(bulk_create(pizza_controller.create_all)), HTTPStatus.CREATED)
+
 @pizza_bp.get('/<int:pizza_id>')
+@conditional_get(pizza_controller.dto_tables())
 def get_pizza(pizza_id: int) -> Response:
-    pizza = pizza_controller.find_by_id(pizza_id)
+    pizza = pizza_controller.find_dto_by_id(pizza_id, get_fields(pizza_controller.parse_fields))
     if pizza:
-        return make_response(jsonify(pizza.put_into_dto()), HTTPStatus.OK)
+        return make_response(jsonify(pizza), HTTPStatus.OK)
     return make_response(jsonify({"error": "Pizza not found"}), HTTPStatus.NOT_FOUND)
 
 @pizza_bp.put('/<int:pizza_id>')
@@ -32,6 +45,17 @@ def update_pizza(pizza_id: int) -> Response:
     pizza_controller.update(pizza_id, pizza)
     return make_response("Pizza updated", HTTPStatus.OK)
 
+@pizza_bp.patch('/<int:pizza_id>')
+def patch_pizza(pizza_id: int) -> Response:
+    content = request.get_json()
+    try:
+        pizza = pizza_controller.patch(pizza_id, content, DTO_PROFILE)
+    except ValueError as error:
+        return make_response(jsonify({"error": str(error)}), HTTPStatus.UNPROCESSABLE_ENTITY)
+    if not pizza:
+        return make_response(jsonify({"error": "Pizza not found"}), HTTPStatus.NOT_FOUND)
+    return make_response(jsonify(pizza.put_into_dto()), HTTPStatus.OK)
+
 @pizza_bp.delete('/<int:pizza_id>')
 def delete_pizza(pizza_id: int) -> Response:
     pizza_controller.delete(pizza_id)
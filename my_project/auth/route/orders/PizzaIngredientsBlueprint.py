@@ -1,26 +1,40 @@
 from http import HTTPStatus
 from flask import Blueprint, jsonify, Response, request, make_response
-from my_project.auth.controller.orders.PizzaIngredietsController import PizzaIngredientsController
+from my_project.auth.dao.general_dao import DTO_PROFILE
+from my_project.auth.controller import pizza_ingredients_controller
 from my_project.auth.domain.orders.PizzaIngredients import PizzaIngredient
+from my_project.auth.route.bulk import bulk_create
+from my_project.auth.route.conditional import conditional_get
+from my_project.auth.route.filtering import get_criteria
+from my_project.auth.route.pagination import encode_cursor, get_page, page_into_dto
+from my_project.auth.route.projection import get_fields
+from my_project.auth.route.streaming import stream_requested, stream_response
 
 pizza_ingredients_bp = Blueprint('pizza_ingredients', __name__, url_prefix='/pizza_ingredients')
 
 @pizza_ingredients_bp.get('')
+@conditional_get(pizza_ingredients_controller.dto_tables())
 def get_all_pizza_ingredients() -> Response:
-    pizza_ingredients = PizzaIngredientsController.find_all()
-    pizza_ingredients_dto = [pizza_ingredient.put_into_dto() for pizza_ingredient in pizza_ingredients]
-    return make_response(jsonify(pizza_ingredients_dto), HTTPStatus.OK)
+    fields = get_fields(pizza_ingredients_controller.parse_fields)
+    criteria = get_criteria(pizza_ingredients_controller.parse_criteria)
+    pizza_ingredients, next_key = get_page(pizza_ingredients_controller.find_page, profile=DTO_PROFILE, fields=fields, criteria=criteria)
+    return make_response(jsonify(page_into_dto(pizza_ingredients, next_key, fields)), HTTPStatus.OK)
 
 @pizza_ingredients_bp.post('')
 def create_pizza_ingredient() -> Response:
     content = request.get_json()
     pizza_ingredient = PizzaIngredient.create_from_dto(content)
-    PizzaIngredientsController.create(pizza_ingredient)
+    pizza_ingredients_controller.create(pizza_ingredient)
     return make_response(jsonify(pizza_ingredient.put_into_dto()), HTTPStatus.CREATED)
 
+@pizza_ingredients_bp.post('/bulk')
+def create_pizza_ingredient_bulk() -> Response:
+    return make_response(jsonify(bulk_create(pizza_ingredients_controller.create_all)), HTTPStatus.CREATED)
+
 @pizza_ingredients_bp.get('/<int:pizza_ingredient_id>')
+@conditional_get(pizza_ingredients_controller.dto_tables())
 def get_pizza_ingredient(pizza_ingredient_id: int) -> Response:
-    pizza_ingredient = PizzaIngredientsController.find_by_id(pizza_ingredient_id)
+    pizza_ingredient = pizza_ingredients_controller.find_by_id(pizza_ingredient_id)
     if pizza_ingredient:
         return make_response(jsonify(pizza_ingredient.put_into_dto()), HTTPStatus.OK)
     return make_response(jsonify({"error": "Pizza ingredient not found"}), HTTPStatus.NOT_FOUND)
@@ -29,19 +43,21 @@ def get_pizza_ingredient(pizza_ingredient_id: int) -> Response:
 def update_pizza_ingredient(pizza_ingredient_id: int) -> Response:
     content = request.get_json()
     pizza_ingredient = PizzaIngredient.create_from_dto(content)
-    PizzaIngredientsController.update(pizza_ingredient_id, pizza_ingredient)
+    pizza_ingredients_controller.update(pizza_ingredient_id, pizza_ingredient)
     return make_response("Pizza ingredient updated", HTTPStatus.OK)
 
 @pizza_ingredients_bp.delete('/<int:pizza_ingredient_id>')
 def delete_pizza_ingredient(pizza_ingredient_id: int) -> Response:
-    PizzaIngredientsController.delete(pizza_ingredient_id)
+    pizza_ingredients_controller.delete(pizza_ingredient_id)
     return make_response("Pizza ingredient deleted", HTTPStatus.NO_CONTENT)
 
 @pizza_ingredients_bp.route('/pizza-ingredients', methods=['GET'])
+@conditional_get(pizza_ingredients_controller.dto_tables())
 def get_pizza_ingredients_with_details():
     """
-    Отримує всі записи PizzaIngredients з деталями про піци та інгредієнти.
+    Отримує записи PizzaIngredients з деталями про піци та інгредієнти посторінково (?limit=&after=), або всі одразу потоком (Accept: application/x-ndjson чи ?stream=1).
     """
-    controller = PizzaIngredientsController()
-    data = controller.find_all_with_details()  # Метод для отримання розширених даних
-    return jsonify(data)
\ No newline at end of file
+    if stream_requested():
+        return stream_response(pizza_ingredients_controller.iter_all_with_details())
+    data, next_key = get_page(pizza_ingredients_controller.find_page_with_details)
+    return jsonify({"items": data, "next_cursor": encode_cursor(next_key)})
\ No newline at end of file
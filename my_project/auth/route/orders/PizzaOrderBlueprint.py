@@ -1,15 +1,27 @@
 from http import HTTPStatus
 from flask import Blueprint, jsonify, Response, request, make_response
+from my_project.auth.dao.general_dao import DTO_PROFILE
 from my_project.auth.controller import pizza_order_controller
 from my_project.auth.domain.orders.PizzaOrder import PizzaOrder
+from my_project.auth.route.bulk import bulk_create
+from my_project.auth.route.conditional import conditional_get
+from my_project.auth.route.filtering import get_criteria
+from my_project.auth.route.pagination import get_page, page_into_dto
+from my_project.auth.route.projection import get_fields, into_dto
+from my_project.auth.route.streaming import stream_requested, stream_response
 
 pizza_order_bp = Blueprint('pizza_order', __name__, url_prefix='/pizza_order')
 
 @pizza_order_bp.get('')
+@conditional_get(pizza_order_controller.dto_tables())
 def get_all_pizza_orders() -> Response:
-    pizza_orders = pizza_order_controller.find_all()
-    pizza_orders_dto = [pizza_order.put_into_dto() for pizza_order in pizza_orders]
-    return make_response(jsonify(pizza_orders_dto), HTTPStatus.OK)
+    fields = get_fields(pizza_order_controller.parse_fields)
+    criteria = get_criteria(pizza_order_controller.parse_criteria)
+    if stream_requested():
+        return stream_response(into_dto(pizza_order, fields)
+                               for pizza_order in pizza_order_controller.iter_all(DTO_PROFILE, fields, criteria))
+    pizza_orders, next_key = get_page(pizza_order_controller.find_page, profile=DTO_PROFILE, fields=fields, criteria=criteria)
+    return make_response(jsonify(page_into_dto(pizza_orders, next_key, fields)), HTTPStatus.OK)
 
 @pizza_order_bp.post('')
 def create_pizza_order() -> Response:
@@ -18,11 +30,16 @@ def create_pizza_order() -> Response:
     pizza_order_controller.create(pizza_order)
     return make_response(jsonify(pizza_order.put_into_dto()), HTTPStatus.CREATED)
 
+@pizza_order_bp.post('/bulk')
+def create_pizza_order_bulk() -> Response:
+    return make_response(jsonify(bulk_create(pizza_order_controller.create_all)), HTTPStatus.CREATED)
+
 @pizza_order_bp.get('/<int:pizza_order_id>')
+@conditional_get(pizza_order_controller.dto_tables())
 def get_pizza_order(pizza_order_id: int) -> Response:
-    pizza_order = pizza_order_controller.find_by_id(pizza_order_id)
+    pizza_order = pizza_order_controller.find_dto_by_id(pizza_order_id, get_fields(pizza_order_controller.parse_fields))
     if pizza_order:
-        return make_response(jsonify(pizza_order.put_into_dto()), HTTPStatus.OK)
+        return make_response(jsonify(pizza_order), HTTPStatus.OK)
     return make_response(jsonify({"error": "Pizza order not found"}), HTTPStatus.NOT_FOUND)
 
 @pizza_order_bp.put('/<int:pizza_order_id>')
@@ -37,6 +54,17 @@ def update_pizza_order(pizza_order_id: int) -> Response:
     pizza_order_controller.update(updated_pizza_order)
     return make_response(jsonify(updated_pizza_order.put_into_dto()), HTTPStatus.OK)
 
+@pizza_order_bp.patch('/<int:pizza_order_id>')
+def patch_pizza_order(pizza_order_id: int) -> Response:
+    content = request.get_json()
+    try:
+        pizza_order = pizza_order_controller.patch(pizza_order_id, content, DTO_PROFILE)
+    except ValueError as error:
+        return make_response(jsonify({"error": str(error)}), HTTPStatus.UNPROCESSABLE_ENTITY)
+    if not pizza_order:
+        return make_response(jsonify({"error": "Pizza order not found"}), HTTPStatus.NOT_FOUND)
+    return make_response(jsonify(pizza_order.put_into_dto()), HTTPStatus.OK)
+
 @pizza_order_bp.delete('/<int:pizza_order_id>')
 def delete_pizza_order(pizza_order_id: int) -> Response:
     pizza_order = pizza_order_controller.find_by_id(pizza_order_id)
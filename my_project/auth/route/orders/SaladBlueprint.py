@@ -1,15 +1,23 @@
 from http import HTTPStatus
 from flask import Blueprint, jsonify, Response, request, make_response
+from my_project.auth.dao.general_dao import DTO_PROFILE
 from my_project.auth.controller import salad_controller
 from my_project.auth.domain.orders.Salad import Salad
+from my_project.auth.route.bulk import bulk_create
+from my_project.auth.route.conditional import conditional_get
+from my_project.auth.route.filtering import get_criteria
+from my_project.auth.route.pagination import get_page, page_into_dto
+from my_project.auth.route.projection import get_fields
 
 salad_bp = Blueprint('salad', __name__, url_prefix='/salad')
 
 @salad_bp.get('')
+@conditional_get(salad_controller.dto_tables())
 def get_all_salads() -> Response:
-    salads = salad_controller.find_all()
-    salads_dto = [salad.put_into_dto() for salad in salads]
-    return make_response(jsonify(salads_dto), HTTPStatus.OK)
+    fields = get_fields(salad_controller.parse_fields)
+    criteria = get_criteria(salad_controller.parse_criteria)
+    salads, next_key = get_page(salad_controller.find_page, profile=DTO_PROFILE, fields=fields, criteria=criteria)
+    return make_response(jsonify(page_into_dto(salads, next_key, fields)), HTTPStatus.OK)
 
 @salad_bp.post('')
 def create_salad() -> Response:
@@ -18,11 +26,16 @@ def create_salad() -> Response:
     salad_controller.create(salad)
     return make_response(jsonify(salad.put_into_dto()), HTTPStatus.CREATED)
 
+@salad_bp.post('/bulk')
+def create_salad_bulk() -> Response:
+    return make_response(jsonify(bulk_create(salad_controller.create_all)), HTTPStatus.CREATED)
+
 @salad_bp.get('/<int:salad_id>')
+@conditional_get(salad_controller.dto_tables())
 def get_salad(salad_id: int) -> Response:
-    salad = salad_controller.find_by_id(salad_id)
+    salad = salad_controller.find_dto_by_id(salad_id, get_fields(salad_controller.parse_fields))
     if salad:
-        return make_response(jsonify(salad.put_into_dto()), HTTPStatus.OK)
+        return make_response(jsonify(salad), HTTPStatus.OK)
     return make_response(jsonify({"error": "Salad not found"}), HTTPStatus.NOT_FOUND)
 
 @salad_bp.put('/<int:salad_id>')
@@ -32,6 +45,17 @@ def update_salad(salad_id: int) -> Response:
     salad_controller.update(salad_id, salad)
     return make_response("Salad updated", HTTPStatus.OK)
 
+@salad_bp.patch('/<int:salad_id>')
+def patch_salad(salad_id: int) -> Response:
+    content = request.get_json()
+    try:
+        salad = salad_controller.patch(salad_id, content, DTO_PROFILE)
+    except ValueError as error:
+        return make_response(jsonify({"error": str(error)}), HTTPStatus.UNPROCESSABLE_ENTITY)
+    if not salad:
+        return make_response(jsonify({"error": "Salad not found"}), HTTPStatus.NOT_FOUND)
+    return make_response(jsonify(salad.put_into_dto()), HTTPStatus.OK)
+
 @salad_bp.delete('/<int:salad_id>')
 def delete_salad(salad_id: int) -> Response:
     salad_controller.delete(salad_id)
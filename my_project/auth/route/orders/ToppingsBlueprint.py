@@ -1,38 +1,62 @@
 from http import HTTPStatus
 from flask import Blueprint, jsonify, Response, request, make_response
-from my_project.auth.controller.orders.ToppingController import ToppingController
+from my_project.auth.dao.general_dao import DTO_PROFILE
+from my_project.auth.controller import toppings_controller
 from my_project.auth.domain.orders.Toppings import Topping
+from my_project.auth.route.bulk import bulk_create
+from my_project.auth.route.conditional import conditional_get
+from my_project.auth.route.filtering import get_criteria
+from my_project.auth.route.pagination import get_page, page_into_dto
+from my_project.auth.route.projection import get_fields
 
 toppings_bp = Blueprint('toppings', __name__, url_prefix='/toppings')
 
 @toppings_bp.get('')
+@conditional_get(toppings_controller.dto_tables())
 def get_all_toppings() -> Response:
-    toppings = ToppingController.find_all()
-    toppings_dto = [topping.put_into_dto() for topping in toppings]
-    return make_response(jsonify(toppings_dto), HTTPStatus.OK)
+    fields = get_fields(toppings_controller.parse_fields)
+    criteria = get_criteria(toppings_controller.parse_criteria)
+    toppings, next_key = get_page(toppings_controller.find_page, profile=DTO_PROFILE, fields=fields, criteria=criteria)
+    return make_response(jsonify(page_into_dto(toppings, next_key, fields)), HTTPStatus.OK)
 
 @toppings_bp.post('')
 def create_topping() -> Response:
     content = request.get_json()
     topping = Topping.create_from_dto(content)
-    ToppingController.create(topping)
+    toppings_controller.create(topping)
     return make_response(jsonify(topping.put_into_dto()), HTTPStatus.CREATED)
 
+@toppings_bp.post('/bulk')
+def create_topping_bulk() -> Response:
+    return make_response(jsonify(bulk_create(toppings_controller.create_all)), HTTPStatus.CREATED)
+
 @toppings_bp.get('/<int:topping_id>')
+@conditional_get(toppings_controller.dto_tables())
 def get_topping(topping_id: int) -> Response:
-    topping = ToppingController.find_by_id(topping_id)
+    topping = toppings_controller.find_dto_by_id(topping_id, get_fields(toppings_controller.parse_fields))
     if topping:
-        return make_response(jsonify(topping.put_into_dto()), HTTPStatus.OK)
+        return make_response(jsonify(topping), HTTPStatus.OK)
     return make_response(jsonify({"error": "Topping not found"}), HTTPStatus.NOT_FOUND)
 
 @toppings_bp.put('/<int:topping_id>')
 def update_topping(topping_id: int) -> Response:
     content = request.get_json()
     topping = Topping.create_from_dto(content)
-    ToppingController.update(topping_id, topping)
+    toppings_controller.update(topping_id, topping)
     return make_response("Topping updated", HTTPStatus.OK)
 
+@toppings_bp.patch('/<int:topping_id>')
+def patch_topping(topping_id: int) -> Response:
+    content = request.get_json()
+    try:
+        topping = toppings_controller.patch(topping_id, content, DTO_PROFILE)
+    except ValueError as error:
+        return make_response(jsonify({"error": str(error)}), HTTPStatus.UNPROCESSABLE_ENTITY)
+    if not topping:
+        return make_response(jsonify({"error": "Topping not found"}), HTTPStatus.NOT_FOUND)
+    return make_response(jsonify(topping.put_into_dto()), HTTPStatus.OK)
+
 @toppings_bp.delete('/<int:topping_id>')
 def delete_topping(topping_id: int) -> Response:
-    ToppingController.delete(topping_id)
+    toppings_controller.delete(topping_id)
     return make_response("Topping deleted", HTTPStatus.NO_CONTENT)
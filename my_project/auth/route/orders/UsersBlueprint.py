@@ -1,38 +1,68 @@
 from http import HTTPStatus
 from flask import Blueprint, jsonify, Response, request, make_response
+from my_project.auth.dao.general_dao import DTO_PROFILE
 from my_project.auth.controller import users_controller
 from my_project.auth.domain.orders.Users import Users
+from my_project.auth.route.authorization import admin_required
+from my_project.auth.route.bulk import bulk_create
+from my_project.auth.route.conditional import conditional_get
+from my_project.auth.route.filtering import get_criteria
+from my_project.auth.route.pagination import get_page, page_into_dto
+from my_project.auth.route.projection import get_fields
 
 users_bp = Blueprint('users', __name__, url_prefix='/users')
 
 @users_bp.get('')
+@conditional_get(users_controller.dto_tables())
 def get_all_users() -> Response:
-    users = users_controller.find_all()
-    users_dto = [user.put_into_dto() for user in users]
-    return make_response(jsonify(users_dto), HTTPStatus.OK)
+    fields = get_fields(users_controller.parse_fields)
+    criteria = get_criteria(users_controller.parse_criteria)
+    users, next_key = get_page(users_controller.find_page, profile=DTO_PROFILE, fields=fields, criteria=criteria)
+    return make_response(jsonify(page_into_dto(users, next_key, fields)), HTTPStatus.OK)
 
 @users_bp.post('')
+@admin_required
 def create_user() -> Response:
     content = request.get_json()
     user = Users.create_from_dto(content)
     users_controller.create(user)
     return make_response(jsonify(user.put_into_dto()), HTTPStatus.CREATED)
 
+@users_bp.post('/bulk')
+@admin_required
+def create_user_bulk() -> Response:
+    return make_response(jsonify(bulk_create(users_controller.create_all)), HTTPStatus.CREATED)
+
 @users_bp.get('/<int:user_id>')
+@conditional_get(users_controller.dto_tables())
 def get_user(user_id: int) -> Response:
-    user = users_controller.find_by_id(user_id)
+    user = users_controller.find_dto_by_id(user_id, get_fields(users_controller.parse_fields))
     if user:
-        return make_response(jsonify(user.put_into_dto()), HTTPStatus.OK)
+        return make_response(jsonify(user), HTTPStatus.OK)
     return make_response(jsonify({"error": "User not found"}), HTTPStatus.NOT_FOUND)
 
 @users_bp.put('/<int:user_id>')
+@admin_required
 def update_user(user_id: int) -> Response:
     content = request.get_json()
     user = Users.create_from_dto(content)
     users_controller.update(user_id, user)
     return make_response("User updated", HTTPStatus.OK)
 
+@users_bp.patch('/<int:user_id>')
+@admin_required
+def patch_user(user_id: int) -> Response:
+    content = request.get_json()
+    try:
+        user = users_controller.patch(user_id, content, DTO_PROFILE)
+    except ValueError as error:
+        return make_response(jsonify({"error": str(error)}), HTTPStatus.UNPROCESSABLE_ENTITY)
+    if not user:
+        return make_response(jsonify({"error": "User not found"}), HTTPStatus.NOT_FOUND)
+    return make_response(jsonify(user.put_into_dto()), HTTPStatus.OK)
+
 @users_bp.delete('/<int:user_id>')
+@admin_required
 def delete_user(user_id: int) -> Response:
     users_controller.delete(user_id)
     return make_response("User deleted", HTTPStatus.NO_CONTENT)
@@ -0,0 +1,89 @@
+"""
+Keyset pagination arguments (?limit=&after=) shared by the collection routes.
+"""
+
+import base64
+import binascii
+import json
+from http import HTTPStatus
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from flask import abort, request
+
+from my_project.auth.route.projection import into_dto
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def get_page_args() -> Tuple[int, Optional[List[object]]]:
+    """
+    Reads pagination arguments of the current request.
+    :return: page size and key values of the last object on the previous page
+    """
+    limit = request.args.get("limit", DEFAULT_PAGE_SIZE)
+    try:
+        limit = int(limit)
+    except ValueError:
+        abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+
+    after = request.args.get("after")
+    return limit, decode_cursor(after) if after else None
+
+
+def get_page(find_page: Callable[..., Tuple[List[Any], Optional[list]]], **kwargs: Any) -> Tuple[List[Any], Optional[list]]:
+    """
+    Loads the page requested by the current request.
+    :param find_page: controller method taking page size and cursor key values
+    :param kwargs: additional arguments of find_page (e.g. loader profile)
+    :return: objects of the page and key values to continue after
+    """
+    limit, after = get_page_args()
+    try:
+        return find_page(limit, after, **kwargs)
+    except ValueError:
+        abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+
+
+def encode_cursor(key: Optional[Sequence[object]]) -> Optional[str]:
+    """
+    Packs key values of the last object on a page into an opaque cursor.
+    :param key: key values or None
+    :return: cursor string or None
+    """
+    if key is None:
+        return None
+    raw = json.dumps(list(key), default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[object]:
+    """
+    Unpacks cursor produced by encode_cursor, aborts with 422 if it is malformed.
+    :param cursor: cursor string
+    :return: key values
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+    if not isinstance(key, list) or not key:
+        abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+    return key
+
+
+def page_into_dto(objects: List[Any], next_key: Optional[Sequence[object]],
+                  fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    Puts one page of domain objects into the response body.
+    :param objects: domain objects of the page
+    :param next_key: key values to continue after
+    :param fields: fields of the projection (?fields=), None renders full DTOs
+    :return: page DTO with items and next_cursor
+    """
+    return {
+        "items": [into_dto(obj, fields) for obj in objects],
+        "next_cursor": encode_cursor(next_key),
+    }
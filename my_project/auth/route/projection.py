@@ -0,0 +1,40 @@
+"""
+Column projection (?fields=id,name) shared by the entity routes.
+
+The fields are validated against the mapper of the domain type and loaded with load_only,
+relationships are loaded only when they are requested.
+"""
+
+from http import HTTPStatus
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from flask import abort, request
+
+from my_project.auth.dao.general_dao import project_dto
+
+FIELDS_ARG = "fields"
+
+
+def get_fields(parse_fields: Callable[[str], Tuple[str, ...]]) -> Optional[Tuple[str, ...]]:
+    """
+    Reads the field list of the current request, aborts with 422 on unknown fields.
+    :param parse_fields: controller method validating the list
+    :return: field names or None if the full DTO is requested
+    """
+    fields = request.args.get(FIELDS_ARG)
+    if fields is None:
+        return None
+    try:
+        return parse_fields(fields)
+    except ValueError:
+        abort(HTTPStatus.UNPROCESSABLE_ENTITY)
+
+
+def into_dto(obj: Any, fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+    """
+    Renders object with put_into_dto(), or only fields of it.
+    :param obj: domain object
+    :param fields: field names or None for the full DTO
+    :return: DTO
+    """
+    return obj.put_into_dto() if fields is None else project_dto(obj, fields)
@@ -0,0 +1,67 @@
+"""
+Streamed collection responses (whole table, no pagination) shared by the large collection routes.
+
+A client asks for one with `Accept: application/x-ndjson` (one JSON object per line) or
+`?stream=1` (a JSON array). Rows are read through a server-side cursor (GeneralDAO.iter_all)
+and written out in chunks while the cursor advances, so neither the rows nor the body are
+held in memory as a whole.
+"""
+
+from typing import Any, Dict, Iterable, Iterator
+
+from flask import Response, current_app, request, stream_with_context
+
+from my_project.auth.route.bulk import NDJSON_MIMETYPE
+from my_project.json_provider import dumps_bytes
+
+JSON_MIMETYPE = "application/json"
+STREAM_ARG = "stream"
+# Rows are buffered until this many bytes before a chunk is written
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def stream_requested() -> bool:
+    """
+    Checks whether the current request asks for the whole collection as a stream.
+    :return: True for `Accept: application/x-ndjson` or `?stream=1`
+    """
+    return _ndjson_accepted() or request.args.get(STREAM_ARG) in ("1", "true")
+
+
+def stream_response(dtos: Iterable[Dict[str, Any]]) -> Response:
+    """
+    Writes DTOs as NDJSON if the client accepts it, as a JSON array otherwise, chunk by chunk.
+    The request context (and the database session) stays open until the last row is sent.
+    :param dtos: lazily produced DTOs, e.g. put_into_dto() over an iter_all() cursor
+    :return: streamed response
+    """
+    sort_keys = current_app.json.sort_keys
+    if _ndjson_accepted():
+        chunks = _chunks((dumps_bytes(dto, sort_keys=sort_keys) + b"\n" for dto in dtos), b"", b"", b"")
+        mimetype = NDJSON_MIMETYPE
+    else:
+        chunks = _chunks((dumps_bytes(dto, sort_keys=sort_keys) for dto in dtos), b"[", b",", b"]\n")
+        mimetype = JSON_MIMETYPE
+    return Response(stream_with_context(chunks), mimetype=mimetype)
+
+
+def _ndjson_accepted() -> bool:
+    return request.accept_mimetypes.best_match([JSON_MIMETYPE, NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def _chunks(rows: Iterator[bytes], start: bytes, separator: bytes, end: bytes) -> Iterator[bytes]:
+    buffer = [start]
+    size = len(start)
+    first = True
+    for row in rows:
+        if not first:
+            buffer.append(separator)
+        first = False
+        buffer.append(row)
+        size += len(row) + len(separator)
+        if size >= STREAM_CHUNK_BYTES:
+            yield b"".join(buffer)
+            buffer = []
+            size = 0
+    buffer.append(end)
+    yield b"".join(buffer)
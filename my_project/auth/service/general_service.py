@@ -1,7 +1,9 @@
 
 
 from abc import ABC
-from typing import List
+from typing import Dict, Iterable, List, Optional
+
+from my_project.auth.dao.general_dao import BULK_CHUNK_SIZE
 
 
 class GeneralService(ABC):
@@ -33,13 +35,16 @@ class GeneralService(ABC):
         """
         return self._dao.create(obj)
 
-    def create_all(self, obj_list: List[object]) -> List[object]:
+    def create_all(self, rows: Iterable[Dict[str, object]], chunk_size: int = BULK_CHUNK_SIZE,
+                   upsert: bool = False) -> List[Dict[str, object]]:
         """
-        Creates objects from object list using Data Access layer.
-        :param obj_list: object list to create in Database
-        :return: list of created object
+        Creates objects from rows in chunks using Data Access layer.
+        :param rows: field names and values of objects to create
+        :param chunk_size: number of rows sent to database at once
+        :param upsert: update existing rows with the same key instead of failing
+        :return: timings of every chunk
         """
-        return self._dao.create_all(obj_list)
+        return self._dao.create_all(rows, chunk_size, upsert)
 
     def update(self, key: int, obj: object) -> None:
         """
@@ -49,14 +54,14 @@ class GeneralService(ABC):
         """
         self._dao.update(key, obj)
 
-    def patch(self, key: int, field_name: str, value: object) -> None:
+    def patch(self, key: int, value_dict: Dict[str, object]) -> Optional[object]:
         """
-        Modifies defined field of object in database table using Data Access layer.
+        Modifies defined fields of object in database table using Data Access layer.
         :param key: integer key (surrogate primary key)
-        :param field_name: field name of object
-        :param value: field value of object
+        :param value_dict: field names and values of object
+        :return: updated object or None if there is no object with such key
         """
-        self._dao.patch(key, field_name, value)
+        return self._dao.patch(key, value_dict)
 
     def delete(self, key: int) -> None:
         """
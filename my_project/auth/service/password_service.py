@@ -0,0 +1,143 @@
+"""
+Password hashing off the request threads.
+
+scrypt/pbkdf2 are CPU-bound and hold the GIL, so hashing inline stalls every other
+waitress thread. Hashes are computed in a small process pool instead; a request thread
+only waits on the result. A semaphore bounds the number of queued hashes, requests over
+the limit wait at most PASSWORD_HASH_TIMEOUT seconds and then fail with PasswordHashingBusy.
+"""
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+PASSWORD_HASH_METHOD = "PASSWORD_HASH_METHOD"
+PASSWORD_HASH_WORKERS = "PASSWORD_HASH_WORKERS"
+PASSWORD_HASH_MAX_PENDING = "PASSWORD_HASH_MAX_PENDING"
+PASSWORD_HASH_TIMEOUT = "PASSWORD_HASH_TIMEOUT"
+DEFAULT_HASH_METHOD = "scrypt"
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_PENDING = 32
+DEFAULT_TIMEOUT = 10.0
+
+
+class PasswordHashingBusy(Exception):
+    """
+    Too many passwords are being hashed, the caller should retry later.
+    """
+
+
+class PasswordService:
+    """
+    Bounded process pool for generate_password_hash/check_password_hash with queue metrics.
+    """
+
+    def __init__(self) -> None:
+        self.method = DEFAULT_HASH_METHOD
+        self.workers = DEFAULT_WORKERS
+        self.max_pending = DEFAULT_MAX_PENDING
+        self.timeout = DEFAULT_TIMEOUT
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.max_pending_seen = 0
+        self.completed = 0
+        self.rejected = 0
+        self.hash_seconds = 0.0
+
+    def init_app(self, app) -> None:
+        """
+        Reads PASSWORD_HASH_METHOD (werkzeug method, e.g. "scrypt" or "pbkdf2:sha256:600000"),
+        PASSWORD_HASH_WORKERS (processes, 0 hashes in the calling thread), PASSWORD_HASH_MAX_PENDING
+        and PASSWORD_HASH_TIMEOUT from the app config. Processes are started on first use.
+        :param app: Flask application object
+        """
+        self.shutdown()
+        config = app.config
+        self.method = config.get(PASSWORD_HASH_METHOD, DEFAULT_HASH_METHOD)
+        self.workers = int(config.get(PASSWORD_HASH_WORKERS, DEFAULT_WORKERS))
+        self.max_pending = int(config.get(PASSWORD_HASH_MAX_PENDING, DEFAULT_MAX_PENDING))
+        self.timeout = float(config.get(PASSWORD_HASH_TIMEOUT, DEFAULT_TIMEOUT))
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+
+    def hash(self, password: str) -> str:
+        """
+        Hashes password with the configured method.
+        :param password: plain text password
+        :return: werkzeug password hash
+        :raise PasswordHashingBusy: the queue stayed full for the whole timeout
+        """
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        """
+        Checks password against hash (of any method werkzeug knows).
+        :param password_hash: stored hash
+        :param password: plain text password
+        :return: True if the password matches
+        :raise PasswordHashingBusy: the queue stayed full for the whole timeout
+        """
+        return self._run(check_password_hash, password_hash, password)
+
+    def shutdown(self) -> None:
+        """
+        Stops the worker processes.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Gets queue depth and timing counters.
+        :return: statistics DTO
+        """
+        with self._lock:
+            return {
+                "method": self.method.split("$")[0],
+                "workers": self.workers,
+                "pending": self.pending,
+                "max_pending": self.max_pending,
+                "max_pending_seen": self.max_pending_seen,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_seconds": round(self.hash_seconds / self.completed, 6) if self.completed else None,
+            }
+
+    def _run(self, function: Callable[..., Any], *args) -> Any:
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHashingBusy()
+        started = time.perf_counter()
+        with self._lock:
+            self.pending += 1
+            self.max_pending_seen = max(self.max_pending_seen, self.pending)
+        try:
+            if self.workers <= 0:
+                return function(*args)
+            future: Future = self._get_executor().submit(function, *args)
+            return future.result()
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+                self.hash_seconds += time.perf_counter() - started
+            self._slots.release()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that runs server threads can copy held locks
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+
+password_service = PasswordService()
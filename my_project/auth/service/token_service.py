@@ -0,0 +1,166 @@
+"""
+Signing and verification of the /api/v1 JWT access tokens.
+
+Tokens are signed with HS256 by the active key of a keyset shared by all worker processes,
+the key id is put into the "kid" header. Old keys stay in the keyset until the tokens
+they signed expire, so keys can be rotated without logging everyone out.
+Verified claims are cached by token hash until the token expires.
+"""
+
+import hashlib
+import logging
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import jwt
+
+JWT_SIGNING_KEYS = "JWT_SIGNING_KEYS"
+JWT_ACTIVE_KID = "JWT_ACTIVE_KID"
+JWT_SECRET_KEY = "JWT_SECRET_KEY"
+JWT_CACHE_SIZE = "JWT_CACHE_SIZE"
+DEFAULT_KID = "default"
+ALGORITHM = "HS256"
+CLAIMS_CACHE_SIZE = 10000
+# Claims of a token without "exp" are re-verified after this many seconds
+CLAIMS_CACHE_TTL = 3600
+
+logger = logging.getLogger(__name__)
+
+
+class TokenService:
+    """
+    JWT keyset with an LRU cache of verified claims.
+    """
+
+    def __init__(self) -> None:
+        self._keys: Dict[str, str] = {}
+        self._active_kid: Optional[str] = None
+        self._claims: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_size = CLAIMS_CACHE_SIZE
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+
+    def init_app(self, app) -> None:
+        """
+        Reads the keyset from the app config or the environment:
+        JWT_SIGNING_KEYS (mapping or "kid=secret,kid=secret") with JWT_ACTIVE_KID (the first key by default),
+        or a single JWT_SECRET_KEY / SECRET_KEY. Without any of them a random key is generated,
+        which makes tokens valid in this process only.
+        :param app: Flask application object
+        """
+        keys = _parse_keys(app.config.get(JWT_SIGNING_KEYS) or os.getenv(JWT_SIGNING_KEYS))
+        if not keys:
+            secret = app.config.get(JWT_SECRET_KEY) or os.getenv(JWT_SECRET_KEY) or os.getenv("SECRET_KEY")
+            if not secret:
+                logger.warning("No %s or %s configured, tokens are valid in this process only",
+                               JWT_SIGNING_KEYS, JWT_SECRET_KEY)
+                secret = secrets.token_hex(32)
+            keys = {DEFAULT_KID: secret}
+        active_kid = str(app.config.get(JWT_ACTIVE_KID) or os.getenv(JWT_ACTIVE_KID) or next(iter(keys)))
+        if active_kid not in keys:
+            raise ValueError(f"{JWT_ACTIVE_KID} '{active_kid}' is not in {JWT_SIGNING_KEYS}")
+        self.configure(keys, active_kid, app.config.get(JWT_CACHE_SIZE))
+
+    def configure(self, keys: Mapping[str, str], active_kid: str, max_size: Optional[int] = None) -> None:
+        """
+        Replaces the keyset, drops cached claims.
+        :param keys: secrets by key id
+        :param active_kid: id of the key signing new tokens
+        :param max_size: maximal number of cached claims
+        """
+        with self._lock:
+            self._keys = dict(keys)
+            self._active_kid = active_kid
+            if max_size is not None:
+                self.max_size = int(max_size)
+            self._claims.clear()
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        """
+        Signs claims with the active key.
+        :param claims: token payload
+        :return: encoded token
+        """
+        return jwt.encode(claims, self._keys[self._active_kid], algorithm=ALGORITHM,
+                          headers={"kid": self._active_kid})
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """
+        Gets claims of a valid token, verifying the signature only when the token is not cached.
+        Tokens without "kid" are verified with the active key.
+        :param token: encoded token
+        :return: claims
+        :raise jwt.InvalidTokenError: the token is malformed, expired or signed by an unknown key
+        """
+        digest = hashlib.sha256(token.encode()).hexdigest()
+        now = time.time()
+        with self._lock:
+            entry = self._claims.get(digest)
+            if entry is not None and entry[0] > now:
+                self._claims.move_to_end(digest)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._claims[digest]
+            self.misses += 1
+
+        try:
+            kid = jwt.get_unverified_header(token).get("kid", self._active_kid)
+            key = self._keys.get(kid)
+            if key is None:
+                raise jwt.InvalidTokenError(f"Unknown key id '{kid}'")
+            claims = jwt.decode(token, key, algorithms=[ALGORITHM])
+        except jwt.InvalidTokenError:
+            self.failures += 1
+            raise
+
+        expires = claims.get("exp", now + CLAIMS_CACHE_TTL)
+        with self._lock:
+            self._claims[digest] = (min(expires, now + CLAIMS_CACHE_TTL), claims)
+            while len(self._claims) > self.max_size:
+                self._claims.popitem(last=False)
+        return claims
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Gets counters of the claims cache.
+        :return: statistics DTO
+        """
+        with self._lock:
+            return {
+                "active_kid": self._active_kid,
+                "kids": sorted(self._keys),
+                "size": len(self._claims),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "failures": self.failures,
+            }
+
+
+def _parse_keys(value: Any) -> Dict[str, str]:
+    """
+    Reads keyset given as a mapping or as "kid=secret,kid=secret".
+    :param value: config or environment value
+    :return: secrets by key id
+    """
+    if not value:
+        return {}
+    if isinstance(value, Mapping):
+        return {str(kid): str(secret) for kid, secret in value.items()}
+    keys = {}
+    for item in str(value).split(","):
+        kid, separator, secret = item.strip().partition("=")
+        if not separator or not kid or not secret:
+            raise ValueError(f"{JWT_SIGNING_KEYS} must look like 'kid=secret,kid=secret'")
+        keys[kid] = secret
+    return keys
+
+
+token_service = TokenService()
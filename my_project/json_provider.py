@@ -0,0 +1,96 @@
+"""
+JSON provider of the app: orjson when it is installed, the standard json module otherwise.
+
+datetime/date/time values are written in ISO 8601 and Decimal values as numbers,
+so put_into_dto() returns column values as they are instead of converting them on every call.
+Responses are equal as JSON to those of Flask's DefaultJSONProvider but not byte for byte:
+non-ASCII text is written as UTF-8 instead of \\u escapes (orjson has no ensure_ascii, the
+json fallback writes the same), and orjson writes large floats without "+" (1e16, not 1e+16).
+"""
+
+import dataclasses
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # standard json is used
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """
+    Converts values the encoders do not know.
+    :param obj: value
+    :return: JSON compatible value
+    """
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj: Any, sort_keys: bool = False, indent: bool = False) -> bytes:
+    """
+    Serializes obj to UTF-8 JSON.
+    :param obj: value
+    :param sort_keys: write object keys in sorted order
+    :param indent: pretty print with 2 spaces
+    :return: JSON bytes
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+    return json.dumps(obj, default=_default, sort_keys=sort_keys, ensure_ascii=False,
+                      indent=2 if indent else None, separators=None if indent else (",", ":")).encode()
+
+
+def loads(data: Any) -> Any:
+    """
+    Parses JSON text or bytes.
+    :param data: JSON document
+    :return: value
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider using dumps_bytes for jsonify() and the app.json API.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            kwargs.setdefault("default", _default)
+            kwargs.setdefault("sort_keys", self.sort_keys)
+            return json.dumps(obj, **kwargs)
+        return dumps_bytes(obj, sort_keys=self.sort_keys).decode()
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        body = dumps_bytes(obj, sort_keys=self.sort_keys, indent=indent)
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
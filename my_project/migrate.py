@@ -0,0 +1,126 @@
+"""
+Database schema migration, run explicitly with `python app.py migrate` instead of on every worker start.
+
+Workers only read Schema_Version (one query) and refuse to start when it differs from
+SCHEMA_VERSION, unless AUTO_MIGRATE is enabled (development).
+Bump SCHEMA_VERSION whenever a model gets a new table, column or index, or the maintained
+statistics (Order_Stats, Pizza_Stats) are counted differently: migrating recomputes them.
+"""
+
+import logging
+import sqlite3
+from typing import List, Optional
+
+from flask import Flask
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.schema import CreateColumn
+
+from my_project import db
+
+SCHEMA_VERSION = 5
+# Errors meaning the schema was never migrated: unknown database or table (MySQL, PostgreSQL codes)
+MISSING_SCHEMA_CODES = {1049, 1146, "3D000", "42P01"}
+
+schema_version_table = db.Table(
+    "Schema_Version",
+    db.Column("version", db.Integer, nullable=False),
+)
+
+logger = logging.getLogger(__name__)
+
+
+def schema_version() -> Optional[int]:
+    """
+    Reads the schema version of the database (needs an app context).
+    :return: version or None if the database or the version table does not exist yet
+    :raise DBAPIError: the database is not reachable, the login is refused etc.
+    """
+    try:
+        with db.engine.connect() as connection:
+            return connection.execute(schema_version_table.select()).scalar()
+    except DBAPIError as error:
+        if _is_missing_schema(error):
+            return None
+        raise
+
+
+def _is_missing_schema(error: DBAPIError) -> bool:
+    orig = error.orig
+    if isinstance(orig, sqlite3.Error):
+        return str(orig).startswith("no such table")
+    code = getattr(orig, "pgcode", None) or (orig.args[0] if getattr(orig, "args", None) else None)
+    return code in MISSING_SCHEMA_CODES
+
+
+def migrate_schema(app: Flask) -> List[str]:
+    """
+    Creates the database, missing tables, columns and indexes. Existing objects are left as they are.
+    :param app: Flask application object with the database configured
+    :return: descriptions of the executed changes
+    """
+    from sqlalchemy_utils import database_exists, create_database
+
+    uri = app.config["SQLALCHEMY_DATABASE_URI"]
+    changes = []
+    if not database_exists(uri):
+        create_database(uri)
+        changes.append("created database")
+
+    import my_project.auth.domain
+    with app.app_context(), db.engine.begin() as connection:
+        existing = set(inspect(connection).get_table_names())
+        db.metadata.create_all(connection)
+        changes += [f"created table {table.name}" for table in db.metadata.sorted_tables
+                    if table.name not in existing]
+        for table in db.metadata.sorted_tables:
+            if table.name in existing:
+                changes += _add_missing_columns(connection, table)
+        for table in db.metadata.sorted_tables:
+            changes += _create_missing_indexes(connection, table)
+    return changes
+
+
+def set_schema_version(version: int = SCHEMA_VERSION) -> None:
+    """
+    Stores the schema version (needs an app context).
+    :param version: version the database is migrated to
+    """
+    with db.engine.begin() as connection:
+        connection.execute(schema_version_table.delete())
+        connection.execute(schema_version_table.insert().values(version=version))
+
+
+def _add_missing_columns(connection: Connection, table: db.Table) -> List[str]:
+    """
+    Adds columns of table missing in the database (new columns must be nullable or have a server default).
+    """
+    preparer = connection.dialect.identifier_preparer
+    existing = {column["name"] for column in inspect(connection).get_columns(table.name)}
+    changes = []
+    for column in table.columns:
+        if column.name in existing:
+            continue
+        column_ddl = CreateColumn(column).compile(dialect=connection.dialect)
+        connection.execute(text(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {column_ddl}"))
+        changes.append(f"added column {table.name}.{column.name}")
+        if column.unique:
+            name = f"uq_{table.name}_{column.name}"
+            connection.execute(text(f"CREATE UNIQUE INDEX {preparer.quote(name)} "
+                                    f"ON {preparer.format_table(table)} ({preparer.format_column(column)})"))
+            changes.append(f"created unique index {name}")
+    return changes
+
+
+def _create_missing_indexes(connection: Connection, table: db.Table) -> List[str]:
+    """
+    Creates indexes of table missing in the database.
+    """
+    existing = {index["name"] for index in inspect(connection).get_indexes(table.name)}
+    changes = []
+    for index in table.indexes:
+        if index.name not in existing:
+            index.create(connection)
+            changes.append(f"created index {index.name}")
+    return changes
@@ -0,0 +1,152 @@
+"""
+Benchmark of the active users ranking (GET /api/v1/users/active).
+
+    python -m scripts.benchmark_active_users [--users 100000] [--orders 1000000] [--limit 100] [--uri URI]
+
+Fills the database with users users and orders orders (a few users order much more than the
+rest, some orders are cancelled) and times UsersDAO.find_active with and without since, best
+of repeat runs. The ranking is checked against a single pass over all orders in Python with
+heapq, the order count and total spent of every ranked user must match. Exits with 1 if they
+differ. Without --uri the database is a temporary SQLite file; on MySQL use a scratch database.
+--orders 10000000 is the production volume, filling it takes about ten minutes on SQLite.
+"""
+
+import argparse
+import heapq
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, insert, select
+
+from my_project import db
+
+CHUNK_SIZE = 10000
+START = datetime(2024, 1, 1)
+DAYS = 365
+CANCELLED_SHARE = 0.05
+
+
+def fill(users: int, orders: int, seed: int) -> None:
+    """
+    Inserts users and orders in chunks, bypassing the ORM.
+    :param users: number of users
+    :param orders: number of orders
+    :param seed: seed of the random data
+    """
+    from my_project.auth.domain import DeliveryStatus, Order, PaymentStatus, Users
+    from my_project.auth.domain.orders.DeliveryStatus import CANCELLED_ORDER_STATUS
+
+    rng = random.Random(seed)
+    session = db.session
+    first_user = (session.scalar(select(func.max(Users.id))) or 0) + 1
+    for start in range(0, users, CHUNK_SIZE):
+        session.execute(insert(Users), [
+            {"id": first_user + i, "U_Name": f"Name{i}", "U_Surname": f"Surname{i}",
+             "email": f"bench{first_user + i}@example.com", "username": f"bench{first_user + i}"}
+            for i in range(start, min(start + CHUNK_SIZE, users))
+        ])
+    payment_ids = session.scalars(select(PaymentStatus.id)).all()
+    delivery_ids = session.scalars(select(DeliveryStatus.id)
+                                   .where(DeliveryStatus.status != CANCELLED_ORDER_STATUS)).all()
+    cancelled_id = session.scalar(select(DeliveryStatus.id).where(DeliveryStatus.status == CANCELLED_ORDER_STATUS))
+    first_order = (session.scalar(select(func.max(Order.id))) or 0) + 1
+    for start in range(0, orders, CHUNK_SIZE):
+        session.execute(insert(Order), [
+            {"id": first_order + i,
+             # skewed towards the first users: a few users order much more than the rest
+             "userid": first_user + int(users * rng.random() ** 3),
+             "Payment_Statusid": rng.choice(payment_ids),
+             "Delivery_Statusid": cancelled_id if rng.random() < CANCELLED_SHARE else rng.choice(delivery_ids),
+             "Total_Price": Decimal(rng.randrange(500, 10000)) / 100,
+             "Created_AT": START + timedelta(seconds=rng.randrange(DAYS * 86400))}
+            for i in range(start, min(start + CHUNK_SIZE, orders))
+        ])
+        session.commit()
+
+
+def reference_ranking(limit: int, since: Optional[datetime]) -> List[Tuple[int, int, Decimal]]:
+    """
+    Ranks users in one pass over all orders with a top-K heap.
+    :param limit: number of users
+    :param since: count only orders created at or after this time
+    :return: list of (user id, order count, total spent), the most active first
+    """
+    from my_project.auth.domain import DeliveryStatus, Order
+    from my_project.auth.domain.orders.DeliveryStatus import CANCELLED_ORDER_STATUS
+
+    cancelled_id = db.session.scalar(select(DeliveryStatus.id).where(DeliveryStatus.status == CANCELLED_ORDER_STATUS))
+    counts: Dict[int, int] = {}
+    spent: Dict[int, Decimal] = {}
+    rows = db.session.execute(select(Order.userid, Order.Created_AT, Order.Total_Price, Order.Delivery_Statusid)
+                              .execution_options(yield_per=CHUNK_SIZE))
+    for userid, created_at, price, status_id in rows:
+        if since is not None and created_at < since:
+            continue
+        counts[userid] = counts.get(userid, 0) + 1
+        revenue = 0 if status_id == cancelled_id else price or 0
+        spent[userid] = spent.get(userid, 0) + revenue
+    top = heapq.nsmallest(limit, counts.items(), key=lambda item: (-item[1], item[0]))
+    return [(userid, count, spent[userid]) for userid, count in top]
+
+
+def best_time(function: Callable[[], object], repeat: int) -> Tuple[float, object]:
+    """
+    Runs function repeat times.
+    :param function: function to time
+    :param repeat: number of runs
+    :return: (best time in seconds, result of the last run)
+    """
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks the active users ranking")
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--orders", type=int, default=1000000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--uri", help="SQLAlchemy database URI, a temporary SQLite file by default")
+    args = parser.parse_args(argv)
+
+    from my_project import create_app
+    from my_project.auth.dao import users_dao
+
+    directory = tempfile.TemporaryDirectory()
+    uri = args.uri or f"sqlite:///{os.path.join(directory.name, 'active_users.db')}"
+    os.environ.pop("SQLALCHEMY_DATABASE_URI", None)
+    app = create_app({"SQLALCHEMY_DATABASE_URI": uri, "AUTO_MIGRATE": True}, {})
+
+    failures = 0
+    with app.app_context():
+        started = time.perf_counter()
+        fill(args.users, args.orders, args.seed)
+        print(f"filled {args.users} users and {args.orders} orders in {time.perf_counter() - started:.1f} s")
+
+        for label, since in (("all orders", None), ("last 30 days", START + timedelta(days=DAYS - 30))):
+            elapsed, ranking = best_time(lambda: users_dao.find_active(args.limit, since), args.repeat)
+            reference_elapsed, reference = best_time(lambda: reference_ranking(args.limit, since), 1)
+            ranked = [(user.id, count, Decimal(total_spent).quantize(Decimal("0.01")))
+                      for user, count, total_spent in ranking]
+            expected = [(userid, count, Decimal(total).quantize(Decimal("0.01"))) for userid, count, total in reference]
+            matches = ranked == expected
+            failures += not matches
+            print(f"{'ok  ' if matches else 'FAIL'} {label:13} find_active {elapsed * 1000:9.1f} ms   "
+                  f"python one pass + heap {reference_elapsed * 1000:9.1f} ms   top {len(ranked)} users")
+    directory.cleanup()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Serialization benchmark of a GET /orders response.
+
+    python -m scripts.benchmark_json [--rows 10000] [--repeat 5]
+
+Builds the DTOs of rows orders (with user, payment and delivery status) in memory and
+times the response body with the previous pipeline (DTOs converting datetime/Decimal
+themselves + Flask's DefaultJSONProvider) against FastJSONProvider with the standard
+json module and with orjson. Reports the best of repeat runs; no database is needed.
+The bodies are equal as JSON, not byte for byte: non-ASCII text is written as UTF-8 instead
+of \\u escapes (see my_project.json_provider).
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from my_project import json_provider
+from my_project.json_provider import FastJSONProvider
+
+
+def build_orders(rows: int) -> List[object]:
+    """
+    Creates transient orders with their relationships.
+    :param rows: number of orders
+    :return: list of Order
+    """
+    from my_project.auth.domain import DeliveryStatus, Order, PaymentStatus, Users
+
+    users = [Users(id=i, U_Name=f"Name{i}", U_Surname=f"Surname{i}", address=f"Street {i}",
+                   email=f"user{i}@example.com", phone_number=f"+38050{i:07d}", username=f"user{i}")
+             for i in range(1, 101)]
+    payment = [PaymentStatus(id=1, status="Paid"), PaymentStatus(id=2, status="Pending")]
+    delivery = [DeliveryStatus(id=1, status="Delivered"), DeliveryStatus(id=2, status="In progress")]
+    created = datetime(2024, 1, 1, 12, 0, 0)
+    return [Order(id=i, user=users[i % len(users)], payment_status=payment[i % 2],
+                  delivery_status=delivery[i % 2],
+                  Expected_delivery_time=created + timedelta(minutes=i, seconds=45),
+                  Actual_delivery_time=created + timedelta(minutes=i, seconds=50) if i % 2 else None,
+                  Total_Price=Decimal(f"{i % 500}.{i % 100:02d}"), Created_AT=created + timedelta(minutes=i),
+                  delivery_address=f"Street {i}, {i % 50}")
+            for i in range(1, rows + 1)]
+
+
+def _legacy_value(value: Any) -> Any:
+    # what put_into_dto() used to do with every column value
+    if isinstance(value, dict):
+        return {key: _legacy_value(item) for key, item in value.items()}
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value) if value else None
+    return value
+
+
+def _best(run: Callable[[], bytes], repeat: int) -> Dict[str, float]:
+    best = None
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = len(run())
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return {"seconds": best, "bytes": size}
+
+
+def benchmark(rows: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Times DTO building and serialization of rows orders per pipeline.
+    :param rows: number of orders
+    :param repeat: runs per pipeline, the fastest counts
+    :return: seconds and body size per pipeline
+    """
+    orders = build_orders(rows)
+    app = Flask(__name__)
+    default_provider = DefaultJSONProvider(app)
+    fast_provider = FastJSONProvider(app)
+
+    def legacy() -> bytes:
+        body = [_legacy_value(order.put_into_dto()) for order in orders]
+        return default_provider.response(body).get_data()
+
+    def fast() -> bytes:
+        return fast_provider.response([order.put_into_dto() for order in orders]).get_data()
+
+    results = {"DefaultJSONProvider": _best(legacy, repeat)}
+    orjson = json_provider.orjson
+    try:
+        json_provider.orjson = None
+        results["FastJSONProvider (json)"] = _best(fast, repeat)
+    finally:
+        json_provider.orjson = orjson
+    if orjson is not None:
+        results["FastJSONProvider (orjson)"] = _best(fast, repeat)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Times serialization of a GET /orders response")
+    parser.add_argument("--rows", type=int, default=10000, help="orders in the response")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per pipeline")
+    args = parser.parse_args(argv)
+
+    results = benchmark(args.rows, args.repeat)
+    baseline = results["DefaultJSONProvider"]["seconds"]
+    print(f"GET /orders, {args.rows} rows, best of {args.repeat}:")
+    for name, result in results.items():
+        seconds = result["seconds"]
+        print(f"  {name:28} {seconds * 1000:8.1f} ms  {args.rows / seconds:10.0f} rows/s  "
+              f"{result['bytes'] / 1024:8.0f} KiB  x{baseline / seconds:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Startup profile of the application.
+
+    python -m scripts.profile_startup [--env production] [--database-uri URI] [--top 20]
+
+Reports the slowest imports of `import my_project` (measured with -X importtime in a fresh
+interpreter) and the time of every create_app phase (config, db, cache, auth, routes,
+swagger) with the environment config of config/app.yml.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import List, Optional, Tuple
+
+import yaml
+
+CONFIG_PATH = os.path.join("config", "app.yml")
+ADDITIONAL_CONFIG = "ADDITIONAL_CONFIG"
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def import_times(module: str = "my_project") -> List[Tuple[str, int, int, int]]:
+    """
+    Imports module in a new interpreter with -X importtime.
+    :param module: module to import
+    :return: list of (module, self microseconds, cumulative microseconds, nesting level)
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True)
+    times = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            own, cumulative, indent, name = match.groups()
+            times.append((name, int(own), int(cumulative), len(indent) // 2))
+    return times
+
+
+def print_import_report(times: List[Tuple[str, int, int, int]], top: int) -> None:
+    """
+    Prints total import time, the slowest top-level packages and the slowest modules by own time.
+    :param times: output of import_times
+    :param top: number of rows per table
+    """
+    total = max((cumulative for _, _, cumulative, _ in times), default=0)
+    print(f"import my_project: {total / 1000:.1f} ms, {len(times)} modules")
+
+    # level 1: packages imported directly by my_project or by its own modules
+    packages = {}
+    for name, _, cumulative, level in times:
+        if level == 1 and not name.startswith("my_project"):
+            packages[name] = packages.get(name, 0) + cumulative
+    print("\nslowest third-party packages (cumulative):")
+    for name, cumulative in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    print("\nslowest modules (self):")
+    for name, own, _, _ in sorted(times, key=lambda item: -item[1])[:top]:
+        print(f"  {own / 1000:8.1f} ms  {name}")
+
+
+def profile_create_app(env: str, database_uri: Optional[str]) -> None:
+    """
+    Runs create_app in this process, prints the time of every phase.
+    :param env: section of config/app.yml
+    :param database_uri: overrides SQLALCHEMY_DATABASE_URI of the section
+    """
+    with open(CONFIG_PATH, "r", encoding="utf-8") as yaml_file:
+        config_data = yaml.load(yaml_file, Loader=yaml.FullLoader)
+    app_config = dict(config_data[env])
+    if database_uri:
+        app_config["SQLALCHEMY_DATABASE_URI"] = database_uri
+        os.environ.pop("SQLALCHEMY_DATABASE_URI", None)
+
+    # imported outside the timed phases, the import report covers it
+    from my_project import STARTUP_TIMINGS, create_app
+
+    started = time.perf_counter()
+    app = create_app(app_config, config_data[ADDITIONAL_CONFIG])
+    finished = time.perf_counter()
+
+    print(f"\ncreate_app ({env}):")
+    for phase, seconds in app.extensions[STARTUP_TIMINGS].items():
+        print(f"  {seconds * 1000:8.1f} ms  {phase}")
+    print(f"  {(finished - started) * 1000:8.1f} ms  total")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Reports import and create_app timings")
+    parser.add_argument("--env", default=os.environ.get("FLASK_ENV", "development").lower(),
+                        help="section of config/app.yml (default: FLASK_ENV or development)")
+    parser.add_argument("--database-uri", help="database to start against, e.g. sqlite:////tmp/profile.db")
+    parser.add_argument("--top", type=int, default=15, help="rows per table")
+    parser.add_argument("--imports-only", action="store_true", help="do not run create_app")
+    args = parser.parse_args(argv)
+
+    print_import_report(import_times(), args.top)
+    if not args.imports_only:
+        profile_create_app(args.env, args.database_uri)
+
+
+if __name__ == "__main__":
+    main()
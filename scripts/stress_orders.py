@@ -0,0 +1,147 @@
+"""
+Concurrency stress test of order creation in the /api/v1 API.
+
+    python -m scripts.stress_orders [--requests 2000] [--clients 32] [--threads 16] [--uri URI]
+
+Serves the application with waitress (as app.py does in production) and sends requests
+parallel POST /api/v1/orders/ calls of two pizzas each from clients threads. Checks that every
+call returns 201 with a new order id and that every order has both of its Pizza_Order lines,
+then reports throughput and latency. Exits with 1 if any check fails. Without --uri the
+database is a temporary SQLite file; on MySQL use a scratch database, orders are added to it.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from waitress import create_server
+
+PIZZA_IDS = [1, 2]
+USERNAME = "user"
+PASSWORD = "user123"
+
+
+def call(url: str, body: Dict[str, Any], token: Optional[str] = None) -> Tuple[int, Dict[str, Any]]:
+    """
+    Sends a JSON POST request.
+    :param url: absolute URL
+    :param body: JSON body
+    :param token: Bearer token or None
+    :return: (status code, JSON body of the response)
+    """
+    headers = {"Content-Type": "application/json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    request = Request(url, data=json.dumps(body).encode(), headers=headers, method="POST")
+    try:
+        with urlopen(request, timeout=60) as response:
+            return response.status, json.loads(response.read() or b"{}")
+    except HTTPError as error:
+        return error.code, json.loads(error.read() or b"{}")
+
+
+def percentile(values: List[float], share: float) -> float:
+    """
+    Gets a percentile of sorted values.
+    :param values: sorted values
+    :param share: percentile from 0 to 1
+    :return: value
+    """
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+def order_lines(app, order_ids: List[int]) -> Dict[int, int]:
+    """
+    Counts Pizza_Order lines of orders in the database.
+    :param app: Flask application
+    :param order_ids: order ids
+    :return: number of lines per order id
+    """
+    from sqlalchemy import func, select
+
+    from my_project import db
+    from my_project.auth.domain import PizzaOrder
+
+    with app.app_context():
+        rows = db.session.execute(select(PizzaOrder.order_id, func.count(PizzaOrder.id))
+                                  .where(PizzaOrder.order_id.in_(order_ids))
+                                  .group_by(PizzaOrder.order_id))
+        return dict(rows.all())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Stress test of parallel POST /api/v1/orders/")
+    parser.add_argument("--requests", type=int, default=2000, help="number of orders to create")
+    parser.add_argument("--clients", type=int, default=32, help="parallel client threads")
+    parser.add_argument("--threads", type=int, default=16, help="waitress worker threads")
+    parser.add_argument("--uri", help="SQLAlchemy database URI, a temporary SQLite file by default")
+    args = parser.parse_args(argv)
+
+    from my_project import create_app
+
+    directory = tempfile.TemporaryDirectory()
+    uri = args.uri or f"sqlite:///{os.path.join(directory.name, 'stress.db')}"
+    os.environ.pop("SQLALCHEMY_DATABASE_URI", None)
+    app_config = {"SQLALCHEMY_DATABASE_URI": uri, "AUTO_MIGRATE": True}
+    if uri.startswith("sqlite"):
+        # writers wait for the database lock instead of failing with "database is locked"
+        app_config["SQLALCHEMY_ENGINE_OPTIONS"] = {"connect_args": {"timeout": 60}}
+    app = create_app(app_config, {})
+
+    # the clients keep the task queue of waitress full on purpose
+    logging.getLogger("waitress.queue").setLevel(logging.ERROR)
+    server = create_server(app, host="127.0.0.1", port=0, threads=args.threads)
+    threading.Thread(target=server.run, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.effective_port}/api/v1"
+    try:
+        status, body = call(f"{base_url}/auth/login", {"username": USERNAME, "password": PASSWORD})
+        if status != 200:
+            print(f"FAIL login returned {status}: {body}")
+            return 1
+        token = body["token"]
+
+        def create_order(_: int) -> Tuple[int, Optional[int], float]:
+            started = time.perf_counter()
+            status, body = call(f"{base_url}/orders/", {"pizza_ids": PIZZA_IDS}, token)
+            return status, body.get("id"), time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(args.clients) as executor:
+            results = list(executor.map(create_order, range(args.requests)))
+        elapsed = time.perf_counter() - started
+    finally:
+        server.task_dispatcher.shutdown()
+        server.close()
+
+    statuses: Dict[int, int] = {}
+    for status, _, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    order_ids = [order_id for status, order_id, _ in results if status == 201]
+    lines = order_lines(app, order_ids)
+    latencies = sorted(latency for _, _, latency in results)
+    checks = [
+        (f"all calls return 201 {statuses}", statuses == {201: args.requests}),
+        (f"order ids are unique ({len(set(order_ids))} of {len(order_ids)})", len(set(order_ids)) == len(order_ids)),
+        (f"every order has its {len(PIZZA_IDS)} pizza lines",
+         all(lines.get(order_id) == len(PIZZA_IDS) for order_id in order_ids)),
+    ]
+    for name, passed in checks:
+        print(f"{'ok  ' if passed else 'FAIL'} {name}")
+    print(f"{args.requests} orders in {elapsed:.2f} s: {args.requests / elapsed:.1f} orders/s, "
+          f"latency p50 {percentile(latencies, 0.5) * 1000:.1f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.1f} ms")
+    directory.cleanup()
+    return 0 if all(passed for _, passed in checks) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Cross-process invalidation of the shared Redis DTO cache.
+
+Two DtoCache instances stand for two worker processes sharing one fakeredis server: a DTO loaded
+by one worker is served to the other, a write in one worker makes the DTOs of its table and of the
+tables reading from it stale in the other one through pub/sub and drops the catalog caches of the
+table there, a lost message is caught up after VERSION_TTL, and a Redis going down falls back to
+the database.
+"""
+
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import fakeredis
+import pytest
+
+from my_project.auth.dao import redis_cache
+from my_project.auth.dao.cache import CatalogCache
+from my_project.auth.dao.redis_cache import DtoCache
+
+USERS = "Users"
+ORDERS = "Orders"
+# Seconds to wait for a pub/sub message to reach the other worker
+DELIVERY_TIMEOUT = 3.0
+
+
+class Database:
+    """
+    Counts loads of DTOs, stands for the queries of GeneralDAO.find_dto_by_id.
+    """
+
+    def __init__(self) -> None:
+        self.loads = 0
+        self.rows: Dict[str, Dict[str, Any]] = {
+            USERS: {"id": 1, "U_Name": "Ann"},
+            ORDERS: {"id": 1, "user": {"id": 1, "U_Name": "Ann"}},
+        }
+
+    def rename_user(self, name: str) -> None:
+        self.rows[USERS] = {"id": 1, "U_Name": name}
+        self.rows[ORDERS] = {"id": 1, "user": {"id": 1, "U_Name": name}}
+
+    def read(self, worker: DtoCache, table: str) -> Optional[Dict[str, Any]]:
+        """
+        Reads the DTO of row 1 of table through the cache of worker, an order is read with its user.
+        """
+        def load() -> Optional[Dict[str, Any]]:
+            self.loads += 1
+            return self.rows[table]
+        tables = (ORDERS, USERS) if table == ORDERS else (USERS,)
+        return worker.get_or_load(table, 1, tables, load)
+
+
+def _wait(condition: Callable[[], bool], timeout: float = DELIVERY_TIMEOUT) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+
+@pytest.fixture
+def database() -> Database:
+    return Database()
+
+
+@pytest.fixture
+def workers():
+    server = fakeredis.FakeServer()
+    worker_a, worker_b = DtoCache(), DtoCache()
+    worker_a.init_client(fakeredis.FakeRedis(server=server))
+    worker_b.init_client(fakeredis.FakeRedis(server=server))
+    yield worker_a, worker_b
+    worker_a.init_client(None)
+    worker_b.init_client(None)
+
+
+def _write(worker: DtoCache, other: DtoCache, table: str) -> None:
+    worker.invalidate(table)
+    assert _wait(lambda: other.version(table) == worker.version(table)), "invalidation was not delivered"
+
+
+def test_dto_loaded_by_one_worker_is_served_to_the_other(workers: Tuple[DtoCache, DtoCache], database: Database):
+    worker_a, worker_b = workers
+    database.read(worker_a, USERS)
+
+    assert database.read(worker_b, USERS)["U_Name"] == "Ann"
+    assert database.loads == 1
+
+
+def test_write_in_one_worker_makes_dtos_stale_in_the_other(workers: Tuple[DtoCache, DtoCache], database: Database):
+    worker_a, worker_b = workers
+    database.read(worker_a, USERS)
+    database.read(worker_a, ORDERS)
+
+    database.rename_user("Bob")
+    _write(worker_b, worker_a, USERS)
+
+    assert database.read(worker_a, USERS)["U_Name"] == "Bob"
+    assert database.read(worker_a, ORDERS)["user"]["U_Name"] == "Bob"
+
+
+def test_write_in_one_worker_drops_catalog_caches_of_the_table(workers: Tuple[DtoCache, DtoCache]):
+    worker_a, worker_b = workers
+    catalog = CatalogCache("test_dto_cache", [USERS])
+    catalog.get_or_load("all", lambda: ["Ann"])
+
+    # the writing worker drops its own catalog caches itself (GeneralDAO._after_write), the message does the rest
+    worker_b.invalidate(USERS)
+
+    assert _wait(lambda: catalog.stats()["size"] == 0)
+
+
+def test_workers_share_the_entry_after_a_write(workers: Tuple[DtoCache, DtoCache], database: Database):
+    worker_a, worker_b = workers
+    _write(worker_b, worker_a, ORDERS)
+    _write(worker_b, worker_a, ORDERS)
+
+    database.read(worker_b, ORDERS)
+    database.read(worker_a, ORDERS)
+
+    assert database.loads == 1
+
+
+def test_lost_message_is_caught_up_after_version_ttl(workers: Tuple[DtoCache, DtoCache], database: Database,
+                                                     monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(redis_cache, "VERSION_TTL", 0.2)
+    worker_a, worker_b = workers
+    database.read(worker_a, USERS)
+
+    # version changed without a message (lost, or Redis restarted)
+    worker_b._client.incr(f"dto:version:{USERS}")
+    database.rename_user("Cid")
+
+    assert _wait(lambda: database.read(worker_a, USERS)["U_Name"] == "Cid", timeout=1.0)
+
+
+def test_redis_going_down_falls_back_to_the_database(database: Database):
+    server = fakeredis.FakeServer()
+    worker = DtoCache()
+    worker.init_client(fakeredis.FakeRedis(server=server))
+    try:
+        server.connected = False
+
+        assert database.read(worker, USERS)["U_Name"] == "Ann"
+        assert database.loads == 1
+        assert worker.stats()["errors"] == 1
+    finally:
+        worker.init_client(None)